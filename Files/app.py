@@ -2,15 +2,70 @@
 
 import os
 
+import click
 from flask import Flask, jsonify
 from flask import request as flask_request
 
 from config import Config
 from extensions import db, jwt, limiter, socketio
-
-# In-memory blocklist for revoked JWT tokens (jti values).
-# For a multi-process / production deployment, replace with Redis or a DB table.
-BLOCKLIST: set[str] = set()
+from services.passwords import PasswordHasherBusy
+
+def _warm_caches(app):
+    """Pre-load the shared in-process caches so the first request is fast."""
+    from services.career_catalog import get_career_catalog
+    from services.career_mappings import warm_career_mappings
+    from services.question_bank import aptitude_index, get_answer_key, text_index
+    from services.report_content import get_report_content
+
+    try:
+        warm_career_mappings()
+        get_career_catalog()
+        aptitude_index.get()
+        text_index.get()
+        get_answer_key()
+        get_report_content()
+    except Exception:
+        app.logger.exception("Cache warm-up failed; caches will load lazily")
+
+
+def _may_join(room):
+    """Return True if the requester's JWT cookie entitles them to ``room``.
+
+    ``student_<id>``: that student, an admin, or the student's firm admin.
+    ``firm_<id>``: an admin of that firm.
+    """
+    from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+
+    from models.consultancy import FirmAdmin
+    from models.student import StudentDetails
+
+    kind, _, room_id = str(room).partition("_")
+    if kind not in ("student", "firm") or not room_id.isdigit():
+        return False
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    identity = get_jwt_identity()
+    if identity is None:
+        return False
+
+    role = get_jwt().get("role")
+    room_id = int(room_id)
+    if kind == "student":
+        if role == "admin" or (role == "student" and int(identity) == room_id):
+            return True
+        if role != "firm_admin":
+            return False
+        student = db.session.get(StudentDetails, room_id)
+        firm_id = student.firm_id if student else None
+    else:
+        if role != "firm_admin":
+            return False
+        firm_id = room_id
+
+    admin = db.session.get(FirmAdmin, int(identity))
+    return admin is not None and firm_id is not None and admin.firm_id == firm_id
 
 
 def create_app(config_class=Config):
@@ -33,7 +88,9 @@ def create_app(config_class=Config):
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(_jwt_header, jwt_payload):
         """Return True if the token has been revoked (logged out)."""
-        return jwt_payload["jti"] in BLOCKLIST
+        from services.revocation import is_token_revoked
+
+        return is_token_revoked(jwt_payload)
 
     @jwt.expired_token_loader
     def expired_token_callback(_jwt_header, _jwt_payload):
@@ -47,29 +104,63 @@ def create_app(config_class=Config):
     def missing_token_callback(error):
         return jsonify({"message": "Authentication required", "error": "authorization_required"}), 401
 
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(_error):
+        response = jsonify({"success": False, "message": "Too many sign-ins at once, please try again shortly"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+
     # Register blueprints
     from routes.auth import auth_bp
     from routes.student import student_bp
     from routes.assessment import assessment_bp
     from routes.admin import admin_bp
     from routes.firm import firm_bp
+    from routes.reports import reports_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(student_bp)
     app.register_blueprint(assessment_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(firm_bp)
+    app.register_blueprint(reports_bp)
+
+    # ---- CLI commands -------------------------------------------------
+    @app.cli.command('backfill-aptitude-summary')
+    def backfill_aptitude_summary_command():
+        """Rebuild student_aptitude_summary from the stored aptitude responses."""
+        from services.aptitude_summary import backfill_aptitude_summary
+
+        written = backfill_aptitude_summary()
+        click.echo(f"Wrote {written} aptitude summary rows.")
+
+    @app.cli.command('prune-revoked-tokens')
+    def prune_revoked_tokens_command():
+        """Delete revoked_tokens rows whose tokens have expired."""
+        from services.revocation import prune_revoked_tokens
+
+        deleted = prune_revoked_tokens()
+        click.echo(f"Deleted {deleted} expired revoked tokens.")
 
     # Create database tables
     with app.app_context():
         # Import models so SQLAlchemy knows about them
         import models  # noqa: F401
         db.create_all()
+
+        if app.config.get('WARM_CACHES_ON_STARTUP'):
+            _warm_caches(app)
+
         from flask_socketio import join_room
 
         @socketio.on('join')
         def on_join(data):
-            join_room(data['room'])
+            room = data.get('room') if isinstance(data, dict) else None
+            if not _may_join(room):
+                app.logger.info("Refused Socket.IO join of room %r", room)
+                return False
+            join_room(room)
+            return True
 
     @app.after_request
     def add_cache_control(response):
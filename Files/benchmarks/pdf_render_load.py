@@ -0,0 +1,109 @@
+"""Load test ``POST /generate-pdf`` on the Node PDF server.
+
+Mints a signed PDF token per request with ``services.pdf.generate_pdf_token``
+(the same helper the Flask app uses) and fires them at the PDF server from
+a thread pool, then reports throughput, latency percentiles and how many
+requests were turned away by the browser pool's backpressure (503).
+
+The PDF server must be running with the same ``PDF_TOKEN_SECRET`` as this
+process, e.g. from ``Files/``:
+
+    export PDF_TOKEN_SECRET=$(python -c "import secrets; print(secrets.token_hex(32))")
+    (cd ../node_server && node server.js) &
+    python benchmarks/pdf_render_load.py --requests 40 --concurrency 8 \\
+        --url "http://127.0.0.1:5000/download_career/{student_id}"
+
+``--url`` is the page Chromium renders; ``{student_id}`` is filled in per
+request.  Poll ``/health`` on the PDF server to watch the pool meanwhile.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from services.pdf import generate_pdf_token  # noqa: E402
+
+
+def _make_app():
+    # Only the token helper is used: no database access.
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite://"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        WARM_CACHES_ON_STARTUP = False
+
+    return create_app(BenchConfig)
+
+
+def _render(server_url, url, token, timeout):
+    request = Request(
+        f"{server_url}/generate-pdf",
+        data=json.dumps(dict(token, url=url)).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    started = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            status, size = response.status, len(response.read())
+    except HTTPError as exc:
+        status, size = exc.code, 0
+    except (URLError, OSError) as exc:
+        status, size = type(exc).__name__, 0
+    return status, size, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server-url", default=None,
+                        help="PDF server (default: PDF_SERVER_URL from the config)")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/download_career/{student_id}")
+    parser.add_argument("--student-ids", default="1",
+                        help="comma-separated ids to cycle through")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    app = _make_app()
+    student_ids = [int(s) for s in args.student_ids.split(",")]
+    server_url = (args.server_url or app.config["PDF_SERVER_URL"]).rstrip("/")
+
+    # Tokens expire after PDF_TOKEN_TIMEOUT seconds, so mint them just
+    # before each request rather than all up front.
+    def one(i):
+        student_id = student_ids[i % len(student_ids)]
+        with app.app_context():
+            token = generate_pdf_token(student_id)
+        return _render(server_url, args.url.format(student_id=student_id), token, args.timeout)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for status, _size, _ms in results)
+    ok = sorted(ms for status, _size, ms in results if status == 200)
+    print(f"requests:           {args.requests} at concurrency {args.concurrency}")
+    print(f"wall time s:        {elapsed:.2f}")
+    print(f"statuses:           {dict(statuses)}")
+    if ok:
+        sizes = [size for status, size, _ms in results if status == 200]
+        print(f"throughput pdf/s:   {len(ok) / elapsed:.2f}")
+        print(f"pdf size KiB:       {statistics.median(sizes) / 1024:.0f}")
+        print(f"latency median ms:  {statistics.median(ok):.0f}")
+        print(f"latency p95 ms:     {ok[max(int(len(ok) * 0.95) - 1, 0)]:.0f}")
+        print(f"latency max ms:     {ok[-1]:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark ``POST /submit_category_responses`` (per-category submit latency).
+
+Seeds a scratch database with an aptitude bank and one student, then submits
+full 30-question categories through the Flask test client and reports the
+latency and number of SQL statements per submission.  Run it from ``Files/``
+on two checkouts to compare before and after a change:
+
+    python benchmarks/submit_category_responses.py
+    python benchmarks/submit_category_responses.py --database-url mysql+pymysql://u:p@localhost/exam_bench
+
+The database given with ``--database-url`` is written to: never point it at
+a real deployment.  The default is an in-memory SQLite database.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import db  # noqa: E402
+from models.assessment import AptitudeAllQuestions  # noqa: E402
+from models.student import StudentDetails  # noqa: E402
+
+CATEGORIES = ("ABSTRACT", "NUMEBERS", "Verbal", "SPATIAL")
+QUESTIONS_PER_CATEGORY = 30
+
+
+def _make_app(database_url):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        JWT_COOKIE_CSRF_PROTECT = False
+        RATELIMIT_ENABLED = False
+        WARM_CACHES_ON_STARTUP = False
+
+    return create_app(BenchConfig)
+
+
+def _seed(bank_size):
+    rnd = random.Random(0)
+    for category in CATEGORIES:
+        for i in range(bank_size):
+            db.session.add(AptitudeAllQuestions(
+                category=category,
+                question_text=f"{category} {i}",
+                question_image=f"bench/{category}_{i}.png",
+                correct_option=rnd.choice("ABCD"),
+            ))
+    student = StudentDetails(
+        first_name="Bench", last_name="Student", email="bench@example.com",
+        mobile_number="0000000000", country="UK", curriculum="IB",
+        school_name="Bench", grade="10", referral_source="bench", password="x",
+    )
+    db.session.add(student)
+    db.session.commit()
+    return student
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--bank-size", type=int, default=200)
+    args = parser.parse_args()
+
+    app = _make_app(args.database_url)
+    statements = []
+
+    with app.app_context():
+        student = _seed(args.bank_size)
+        token = create_access_token(
+            identity=str(student.id),
+            additional_claims={
+                "role": "student",
+                "email": student.email,
+                "first_name": student.first_name,
+            },
+        )
+        question_ids = {
+            category: [
+                q.id for q in AptitudeAllQuestions.query.filter_by(category=category)
+                .limit(QUESTIONS_PER_CATEGORY)
+            ]
+            for category in CATEGORIES
+        }
+        event.listen(
+            db.engine, "before_cursor_execute",
+            lambda *_args: statements.append(1),
+        )
+
+    client = app.test_client()
+    client.set_cookie("access_token_cookie", token)
+    rnd = random.Random(1)
+
+    latencies = []
+    counts = []
+    for round_no in range(args.rounds):
+        category = CATEGORIES[round_no % len(CATEGORIES)]
+        payload = {
+            "category": category,
+            "responses": {str(qid): rnd.choice("ABCD") for qid in question_ids[category]},
+        }
+        statements.clear()
+        started = time.perf_counter()
+        response = client.post("/submit_category_responses", json=payload)
+        latencies.append((time.perf_counter() - started) * 1000)
+        counts.append(len(statements))
+        if not response.get_json().get("success"):
+            raise SystemExit(f"submit failed: {response.get_json()}")
+
+    latencies.sort()
+    print(f"submissions:        {args.rounds} x {QUESTIONS_PER_CATEGORY} answers")
+    print(f"statements/submit:  {statistics.median(counts):.0f}")
+    print(f"latency median ms:  {statistics.median(latencies):.2f}")
+    print(f"latency p95 ms:     {latencies[int(len(latencies) * 0.95) - 1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,15 +35,63 @@ class Config:
     JWT_COOKIE_CSRF_PROTECT = True
     JWT_ACCESS_CSRF_HEADER_NAME = 'X-CSRF-TOKEN'
     JWT_REFRESH_CSRF_HEADER_NAME = 'X-CSRF-TOKEN'
+    # Password hashing pool (services/passwords.py); werkzeug method string,
+    # e.g. pbkdf2:sha256:1000000. Older hashes are upgraded on login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+    PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', 64))
+    # Revoked tokens (services/revocation.py)
+    TOKEN_REVOCATION_SYNC_SECONDS = int(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', 5))
+    TOKEN_REVOCATION_PRUNE_SECONDS = int(os.environ.get('TOKEN_REVOCATION_PRUNE_SECONDS', 3600))
 
     # PDF server configuration
     PDF_SERVER_URL = os.environ.get('PDF_SERVER_URL', 'http://localhost:3000')
     PDF_TOKEN_SECRET = os.environ.get('PDF_TOKEN_SECRET', os.urandom(32).hex())
     PDF_TOKEN_TIMEOUT = int(os.environ.get('PDF_TOKEN_TIMEOUT', 60))  # seconds
+    PDF_RENDER_TIMEOUT = int(os.environ.get('PDF_RENDER_TIMEOUT', 120))  # seconds
+    # Base URL the PDF server uses to load report pages (default: request host)
+    PDF_RENDER_BASE_URL = os.environ.get('PDF_RENDER_BASE_URL', '')
+    # Rendered report cache (default: <instance path>/pdf_cache)
+    PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR', '')
+    # Asynchronous PDF jobs (per process)
+    PDF_JOB_WORKERS = int(os.environ.get('PDF_JOB_WORKERS', 4))
+    PDF_JOB_MAX_PENDING = int(os.environ.get('PDF_JOB_MAX_PENDING', 100))
+    PDF_JOB_MAX_ATTEMPTS = int(os.environ.get('PDF_JOB_MAX_ATTEMPTS', 3))
+    PDF_JOB_RETRY_DELAY = int(os.environ.get('PDF_JOB_RETRY_DELAY', 5))  # seconds, doubled per retry
+    PDF_JOB_STALE_SECONDS = int(os.environ.get('PDF_JOB_STALE_SECONDS', 300))
+    # Bulk firm report export
+    PDF_EXPORT_WORKERS = int(os.environ.get('PDF_EXPORT_WORKERS', 4))
+    PDF_EXPORT_MAX_STUDENTS = int(os.environ.get('PDF_EXPORT_MAX_STUDENTS', 500))
 
     # Flask origin for CORS on Node server
     FLASK_ORIGIN = os.environ.get('FLASK_ORIGIN', 'http://localhost:5000')
 
+    # In-process caches
+    WARM_CACHES_ON_STARTUP = os.environ.get(
+        'WARM_CACHES_ON_STARTUP', 'True'
+    ).lower() == 'true'
+    CAREER_CATALOG_CHECK_SECONDS = int(
+        os.environ.get('CAREER_CATALOG_CHECK_SECONDS', 300)
+    )
+    CAREER_MAPPINGS_CHECK_SECONDS = int(
+        os.environ.get('CAREER_MAPPINGS_CHECK_SECONDS', 30)
+    )
+    CAREER_REPORT_CACHE_SIZE = int(os.environ.get('CAREER_REPORT_CACHE_SIZE', 2000))
+    CAREER_REPORT_PERSIST = os.environ.get(
+        'CAREER_REPORT_PERSIST', 'False'
+    ).lower() == 'true'
+    QUESTION_BANK_CHECK_SECONDS = int(
+        os.environ.get('QUESTION_BANK_CHECK_SECONDS', 300)
+    )
+    APTITUDE_FORM_POOL_SIZE = int(os.environ.get('APTITUDE_FORM_POOL_SIZE', 16))
+
+    # Bulk cohort scoring
+    BULK_SCORES_MAX_STUDENTS = int(os.environ.get('BULK_SCORES_MAX_STUDENTS', 5000))
+
+    # Admin dashboard filter facets
+    STUDENT_FACETS_TTL_SECONDS = int(os.environ.get('STUDENT_FACETS_TTL_SECONDS', 60))
+    STUDENT_FACETS_CACHE_SIZE = int(os.environ.get('STUDENT_FACETS_CACHE_SIZE', 256))
+
     # Rate limiting
     RATELIMIT_DEFAULT = os.environ.get('RATELIMIT_DEFAULT', '200 per day')
     RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
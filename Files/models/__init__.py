@@ -1,4 +1,5 @@
 from models.admin import Admin
+from models.auth import RevokedToken
 from models.student import StudentDetails, ExamProcess, TestStatus, Trackaptitude
 from models.consultancy import ConsultancyFirm, FirmAdmin, CreditTransaction
 from models.assessment import (
@@ -6,6 +7,7 @@ from models.assessment import (
     AptitudeImgQuestions,
     AptitudeImgResponse,
     StudentCareerResponse,
+    StudentAptitudeSummary,
     AptitudeTextQuestions,
     AptitudeAllQuestions,
     QuestionSubject,
@@ -13,9 +15,11 @@ from models.assessment import (
     Subject,
     SupportingSubject,
 )
+from models.report import PdfJob, StoredCareerReport
 
 __all__ = [
     'Admin',
+    'RevokedToken',
     'StudentDetails',
     'ExamProcess',
     'TestStatus',
@@ -27,10 +31,13 @@ __all__ = [
     'AptitudeImgQuestions',
     'AptitudeImgResponse',
     'StudentCareerResponse',
+    'StudentAptitudeSummary',
     'AptitudeTextQuestions',
     'AptitudeAllQuestions',
     'QuestionSubject',
     'QuestionSupportingSubject',
     'Subject',
     'SupportingSubject',
+    'StoredCareerReport',
+    'PdfJob',
 ]
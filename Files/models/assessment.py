@@ -22,6 +22,12 @@ class AptitudeImgQuestions(db.Model):
 
 class AptitudeImgResponse(db.Model):
     __tablename__ = 'aptitudeimgresponse'
+    __table_args__ = (
+        db.UniqueConstraint(
+            'student_id', 'question_id',
+            name='uq_aptitudeimgresponse_student_question',
+        ),
+    )
 
     response_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     student_id = db.Column(
@@ -45,6 +51,13 @@ class AptitudeImgResponse(db.Model):
 
 
 class StudentCareerResponse(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint(
+            'student_id', 'question_id',
+            name='uq_student_career_response_student_question',
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, nullable=False)
     first_name = db.Column(db.String(100), nullable=False)
@@ -53,6 +66,26 @@ class StudentCareerResponse(db.Model):
     response_weight = db.Column(db.Integer, nullable=False)
 
 
+class StudentAptitudeSummary(db.Model):
+    """Per-student, per-category aptitude totals (see services/aptitude_summary.py)."""
+
+    __tablename__ = 'student_aptitude_summary'
+
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey('student_details.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    category = db.Column(db.String(50), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+
 class AptitudeTextQuestions(db.Model):
     __tablename__ = 'aptitude_questions'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -0,0 +1,17 @@
+from extensions import db
+
+
+class RevokedToken(db.Model):
+    """Revoked (logged out) JWT; see services/revocation.py."""
+
+    __tablename__ = 'revoked_tokens'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    token_type = db.Column(db.String(10), nullable=False)   # "access" | "refresh"
+    # The token's ``exp``; the row can be pruned once it has passed
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken jti={self.jti} expires_at={self.expires_at}>"
@@ -0,0 +1,61 @@
+from extensions import db
+
+
+class StoredCareerReport(db.Model):
+    """Computed career report payload, persisted so it survives restarts.
+
+    Only written when ``CAREER_REPORT_PERSIST`` is enabled; see
+    services/report_cache.py.
+    """
+
+    __tablename__ = 'stored_career_reports'
+
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey('student_details.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    kind = db.Column(db.String(32), primary_key=True)   # "career_report" | "career_scores"
+    version = db.Column(db.String(40), nullable=False)
+    payload = db.Column(db.Text(16777215), nullable=False)  # MEDIUMTEXT on MySQL
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f"<StoredCareerReport student_id={self.student_id} kind={self.kind}>"
+
+
+class PdfJob(db.Model):
+    """Asynchronous PDF render request; see services/pdf_jobs.py."""
+
+    __tablename__ = 'pdf_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)     # uuid4 hex
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey('student_details.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+    kind = db.Column(db.String(16), nullable=False)     # "aptitude" | "career"
+    # Firm whose branding the report shows; NULL for the unbranded report
+    firm_id = db.Column(
+        db.Integer,
+        db.ForeignKey('consultancy_firms.id', ondelete='CASCADE'),
+        nullable=True,
+    )
+    requester_role = db.Column(db.String(20), nullable=False)
+    requester_id = db.Column(db.Integer, nullable=False)
+    page_url = db.Column(db.String(500), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='queued')  # queued | running | done | failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    etag = db.Column(db.String(40), nullable=True)      # pdf_cache key once done
+    error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, nullable=False)  # UTC, set on every state change
+
+    __table_args__ = (
+        db.Index('ix_pdf_jobs_student_kind_status', 'student_id', 'kind', 'status'),
+    )
+
+    def __repr__(self):
+        return f"<PdfJob id={self.id} student_id={self.student_id} kind={self.kind} status={self.status}>"
@@ -2,6 +2,16 @@ from extensions import db
 
 
 class StudentDetails(db.Model):
+    # FULLTEXT index for dashboard search (services/student_search.py).
+    # MySQL only; other databases fall back to ILIKE and get no index.
+    __table_args__ = (
+        db.Index(
+            'ft_student_search',
+            'first_name', 'last_name', 'email', 'mobile_number',
+            mysql_prefix='FULLTEXT',
+        ).ddl_if(dialect='mysql'),
+    )
+
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
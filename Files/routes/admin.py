@@ -1,24 +1,44 @@
 """Admin routes: admin dashboard, career scores, career report, toggle access."""
 
-import json
 import re
 import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-from flask import Blueprint, current_app, jsonify, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
-from werkzeug.security import generate_password_hash
+from werkzeug.datastructures import MultiDict
 
 from extensions import db, socketio
-from models.assessment import CareerQuestion, StudentCareerResponse, AptitudeImgResponse
+from models.assessment import StudentCareerResponse, AptitudeImgResponse
 from models.consultancy import ConsultancyFirm, CreditTransaction, FirmAdmin
 from models.student import ExamProcess, StudentDetails, TestStatus, Trackaptitude
 from sqlalchemy.orm import joinedload
 from schemas.validation import validate_firm_creation
-from services.scoring import get_career_scores, load_mappings
+from services.aptitude_summary import clear_student_summary
+from services.cache import all_cache_stats
+from services.cohort import cohort_scores_response, parse_cohort_request
+from services.passwords import hash_password, password_hasher_stats
+from services.pdf_cache import invalidate_branded_pdfs, invalidate_student_pdfs
+from services.report_cache import cached_result, invalidate_student_reports
+from services.scoring import get_career_report, get_career_scores
+from services.student_facets import cached_facets
+from services.student_progress import (
+    InvalidCursor,
+    keyset_page_with_progress,
+    paginate_with_progress,
+)
+from services.student_search import apply_search
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -39,6 +59,39 @@ def _is_admin_or_owner(student_id):
     return role == "student" and identity is not None and int(identity) == student_id
 
 
+def _apply_student_filters(query, params):
+    """Apply the admin student-list filters in ``params`` to ``query``.
+
+    ``params`` is ``request.args`` or a MultiDict built from a JSON body.
+    """
+    firm_id = params.get('firm_id', type=int)
+    country = params.get('country', '', type=str).strip()
+    is_independent = params.get('is_independent', '', type=str).strip().lower()
+    curriculum = params.get('curriculum', '', type=str).strip()
+    school_name = params.get('school_name', '', type=str).strip()
+    referral_source = params.get('referral_source', '', type=str).strip()
+    search = params.get('search', '', type=str).strip()
+
+    if firm_id is not None:
+        query = query.filter(StudentDetails.firm_id == firm_id)
+    if is_independent == 'true':
+        query = query.filter(StudentDetails.firm_id.is_(None))
+    elif is_independent == 'false':
+        query = query.filter(StudentDetails.firm_id.isnot(None))
+    if country:
+        query = query.filter(StudentDetails.country == country)
+    if curriculum:
+        query = query.filter(StudentDetails.curriculum == curriculum)
+    if school_name:
+        query = query.filter(StudentDetails.school_name == school_name)
+    if referral_source:
+        query = query.filter(StudentDetails.referral_source == referral_source)
+    if search:
+        query = apply_search(query, search)
+
+    return query
+
+
 @admin_bp.route('/admin_dashboard')
 @jwt_required(optional=True)
 def admin_dashboard():
@@ -59,7 +112,12 @@ def admin_dashboard():
 @admin_bp.route('/api/v1/admin/students', methods=['GET'])
 @jwt_required()
 def admin_students_list():
-    """Return a paginated, filterable list of all students for the admin."""
+    """Return a paginated, filterable list of all students for the admin.
+
+    Uses page/per_page by default; pass ``after`` (empty for the first page,
+    then the previous ``next_cursor``) for keyset pagination, and
+    ``include_total=true`` to also count matching students in that mode.
+    """
     if not _is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
@@ -67,77 +125,30 @@ def admin_students_list():
     per_page = request.args.get('per_page', 50, type=int)
     per_page = max(1, min(per_page, 100))
 
-    # Optional filters
-    firm_id = request.args.get('firm_id', type=int)
-    country = request.args.get('country', '', type=str).strip()
-    is_independent = request.args.get('is_independent', '', type=str).strip().lower()
-    curriculum = request.args.get('curriculum', '', type=str).strip()
-    school_name = request.args.get('school_name', '', type=str).strip()
-    referral_source = request.args.get('referral_source', '', type=str).strip()
-    search = request.args.get('search', '', type=str).strip()
-
-    query = StudentDetails.query.options(joinedload(StudentDetails.firm))
-
-    if firm_id is not None:
-        query = query.filter(StudentDetails.firm_id == firm_id)
-    if is_independent == 'true':
-        query = query.filter(StudentDetails.firm_id.is_(None))
-    elif is_independent == 'false':
-        query = query.filter(StudentDetails.firm_id.isnot(None))
-    if country:
-        query = query.filter(StudentDetails.country == country)
-    if curriculum:
-        query = query.filter(StudentDetails.curriculum == curriculum)
-    if school_name:
-        query = query.filter(StudentDetails.school_name == school_name)
-    if referral_source:
-        query = query.filter(StudentDetails.referral_source == referral_source)
-    if search:
-        like_term = f"%{search}%"
-        query = query.filter(
-            db.or_(
-                StudentDetails.first_name.ilike(like_term),
-                StudentDetails.last_name.ilike(like_term),
-                StudentDetails.email.ilike(like_term),
-                StudentDetails.mobile_number.ilike(like_term),
-            )
-        )
-
-    pagination = query.order_by(StudentDetails.id).paginate(
-        page=page, per_page=per_page, error_out=False
+    query = _apply_student_filters(
+        StudentDetails.query.options(joinedload(StudentDetails.firm)), request.args
     )
 
-    total_career_questions = CareerQuestion.query.count()
+    # Keyset mode (?after=<cursor>, empty for the first page) avoids OFFSET
+    # scans on deep pages and only counts the total when asked to.
+    cursor_mode = 'after' in request.args
+    if cursor_mode:
+        include_total = request.args.get('include_total', '', type=str).lower() == 'true'
+        try:
+            rows, next_cursor, total = keyset_page_with_progress(
+                query, request.args.get('after', '', type=str), per_page, include_total
+            )
+        except InvalidCursor:
+            return jsonify({"success": False, "message": "Invalid cursor"}), 400
+    else:
+        pagination, rows = paginate_with_progress(query, page, per_page)
 
     students = []
-    for s in pagination.items:
-        test_status = TestStatus.query.filter_by(user_id=s.id).first()
-        exam_progress = ExamProcess.query.filter_by(student_id=s.id).first()
-
-        career_test_completed = False
-        aptitude_test_completed = False
-
-        if exam_progress and exam_progress.last_attempted_question_id >= total_career_questions:
-            career_test_completed = True
-        elif test_status and test_status.career_test_completed:
-            career_test_completed = True
-
-        if test_status and test_status.aptitude_test_completed:
-            aptitude_test_completed = True
-
+    for s, progress in rows:
         firm_name = "Independent"
         if s.firm is not None:
             firm_name = s.firm.firm_name
 
-        # Last attempted aptitude category
-        track_apt = Trackaptitude.query.filter_by(student_id=s.id).first()
-        last_aptitude_category = track_apt.last_category if track_apt else None
-
-        # Last attempted career question number
-        last_career_question = None
-        if exam_progress:
-            last_career_question = exam_progress.last_attempted_question_id
-
         students.append({
             "id": s.id,
             "first_name": s.first_name,
@@ -152,10 +163,16 @@ def admin_students_list():
             "firm_id": s.firm_id,
             "firm_name": firm_name,
             "can_view_career_result": s.can_view_career_result,
-            "career_test_completed": career_test_completed,
-            "aptitude_test_completed": aptitude_test_completed,
-            "last_aptitude_category": last_aptitude_category,
-            "last_career_question": last_career_question,
+            **progress,
+        })
+
+    if cursor_mode:
+        return jsonify({
+            "success": True,
+            "total": total,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "students": students,
         })
 
     return jsonify({
@@ -167,6 +184,119 @@ def admin_students_list():
     })
 
 
+# Dropdown facets: name -> (StudentDetails column, filter param it ignores)
+_STUDENT_FACETS = {
+    "country": (StudentDetails.country, "country"),
+    "curriculum": (StudentDetails.curriculum, "curriculum"),
+    "referral_source": (StudentDetails.referral_source, "referral_source"),
+    "school_name": (StudentDetails.school_name, "school_name"),
+}
+
+_STUDENT_FILTER_PARAMS = (
+    "firm_id", "country", "is_independent", "curriculum", "school_name", "referral_source", "search",
+)
+
+
+def _student_facets(filters):
+    """Count students per filter value, one GROUP BY per facet.
+
+    Each facet applies every filter but its own, so a dropdown keeps
+    offering the alternatives to its current selection.
+    """
+    def without(param):
+        return MultiDict({k: v for k, v in filters.items() if k != param})
+
+    facets = {}
+    for name, (column, param) in _STUDENT_FACETS.items():
+        rows = (
+            _apply_student_filters(
+                db.session.query(column, db.func.count(StudentDetails.id)), without(param)
+            )
+            .filter(column.isnot(None), column != '')
+            .order_by(None)
+            .group_by(column)
+            .order_by(column)
+        )
+        facets[name] = [{"value": value, "count": count} for value, count in rows]
+
+    rows = (
+        _apply_student_filters(
+            db.session.query(
+                ConsultancyFirm.id, ConsultancyFirm.firm_name, db.func.count(StudentDetails.id)
+            ).join(ConsultancyFirm, StudentDetails.firm_id == ConsultancyFirm.id),
+            without("firm_id"),
+        )
+        .order_by(None)
+        .group_by(ConsultancyFirm.id, ConsultancyFirm.firm_name)
+        .order_by(ConsultancyFirm.firm_name)
+    )
+    facets["firm"] = [{"id": firm_id, "name": name, "count": count} for firm_id, name, count in rows]
+    return facets
+
+
+@admin_bp.route('/api/v1/admin/students/facets', methods=['GET'])
+@jwt_required()
+def admin_students_facets():
+    """Return the distinct filter values, with student counts, for the dashboard dropdowns.
+
+    Takes the same filters as ``/api/v1/admin/students``.
+    """
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    filters = {
+        param: request.args.get(param, '', type=str).strip()
+        for param in _STUDENT_FILTER_PARAMS
+    }
+    filters = {param: value for param, value in filters.items() if value}
+    facets = cached_facets(filters, lambda: _student_facets(filters))
+    return jsonify({"success": True, "facets": facets})
+
+
+@admin_bp.route('/api/v1/admin/students/scores', methods=['POST'])
+@jwt_required()
+def admin_cohort_scores():
+    """Score many students in one request and stream the results as NDJSON.
+
+    Accepts JSON with either ``student_ids`` (list of ints) or ``filters``
+    (the same keys as the student list query string), plus an optional
+    ``include`` list of 'career' / 'aptitude'.
+    """
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    data = request.get_json(silent=True) or {}
+    student_ids, include, error = parse_cohort_request(data)
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    if student_ids is None:
+        filters = data.get("filters") or {}
+        if not isinstance(filters, dict):
+            return jsonify({"success": False, "message": "filters must be an object"}), 400
+        query = _apply_student_filters(
+            db.session.query(StudentDetails.id), MultiDict(filters)
+        )
+        student_ids = [row.id for row in query.order_by(None).order_by(StudentDetails.id)]
+
+    return cohort_scores_response(student_ids, include)
+
+
+@admin_bp.route('/api/v1/admin/cache-stats', methods=['GET'])
+@jwt_required()
+def admin_cache_stats():
+    """Return hit/miss counters for the in-process caches of this worker,
+    and the password hashing pool's queue depth."""
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    return jsonify({
+        "success": True,
+        "caches": all_cache_stats(),
+        "password_hashing": password_hasher_stats(),
+    })
+
+
 @admin_bp.route('/get_career_scores/<int:student_id>')
 @jwt_required()
 def get_career_scores_route(student_id):
@@ -174,7 +304,9 @@ def get_career_scores_route(student_id):
     if not _is_admin_or_owner(student_id):
         return jsonify({'error': 'Forbidden'}), 403
 
-    result = get_career_scores(student_id)
+    result = cached_result(
+        "career_scores", student_id, lambda: get_career_scores(student_id)
+    )
     if result is None:
         return jsonify({"error": "Student ID not found or no responses recorded"}), 404
     return jsonify(result)
@@ -187,130 +319,12 @@ def career_report(student_id):
     if not _is_admin_or_owner(student_id):
         return jsonify({'error': 'Forbidden'}), 403
 
-    (
-        question_subject_dict,
-        question_supporting_subject_dict,
-        subject_names_dict,
-        subject_question_count,
-        subject_question_numbers,
-        supporting_subject_question_count,
-        supporting_subject_question_numbers,
-        supporting_subject_names_dict,
-    ) = load_mappings()
-
-    # Fetch student responses
-    student_responses = StudentCareerResponse.query.filter_by(
-        student_id=student_id
-    ).all()
-    if not student_responses:
+    report = cached_result(
+        "career_report", student_id, lambda: get_career_report(student_id)
+    )
+    if report is None:
         return jsonify({"error": "Student not found or no responses"}), 404
-
-    # Calculate main subject scores
-    subject_scores = {}
-    for response in student_responses:
-        q_id = response.question_id
-        weight = response.response_weight
-        if q_id in question_subject_dict:
-            for sub_id in question_subject_dict[q_id]:
-                subject_scores[sub_id] = subject_scores.get(sub_id, 0) + weight
-
-    subject_scores = {
-        sub_id: min((score / (subject_question_count[sub_id] * 2)) * 100, 100)
-        if subject_question_count.get(sub_id, 0) > 0
-        else 0
-        for sub_id, score in subject_scores.items()
-    }
-
-    # Get top 9 subjects
-    top_subjects = sorted(
-        [
-            {
-                "subject_id": sub_id,
-                "field": subject_names_dict.get(sub_id, "Unknown"),
-                "score": round(subject_scores[sub_id]),
-            }
-            for sub_id in subject_scores
-            if sub_id in subject_names_dict
-        ],
-        key=lambda x: x["score"],
-        reverse=True,
-    )[:9]
-
-    # Load external JSON files
-    with open('career_fields.json') as f:
-        career_fields = json.load(f)["career_fields"]
-
-    with open('career_field_checklists.json') as f:
-        career_checklists = json.load(f)["career_field_checklists"]
-
-    with open('career_supporting.json') as f:
-        career_supporting = json.load(f)
-
-    with open('D_A_level.json') as f:
-        a_level_data = json.load(f)
-
-    with open('D_IB_level.json') as f:
-        ib_level_data = json.load(f)
-
-    # Calculate supporting subject scores
-    supporting_scores = {}
-    for response in student_responses:
-        q_id = response.question_id
-        weight = response.response_weight
-        if q_id in question_supporting_subject_dict:
-            for sup_id in question_supporting_subject_dict[q_id]:
-                supporting_scores[sup_id] = supporting_scores.get(sup_id, 0) + weight
-
-    supporting_scores = {
-        sup_id: min((score / (supporting_subject_question_count[sup_id] * 2)) * 100, 100)
-        if supporting_subject_question_count.get(sup_id, 0) > 0
-        else 0
-        for sup_id, score in supporting_scores.items()
-    }
-
-    # Build final data per top field
-    for subject in top_subjects:
-        field_name = subject["field"]
-        subject["description"] = ""
-        subject["careers"] = []
-        subject["checklist"] = []
-        subject["supporting_subjects"] = []
-        subject["a_level_subjects"] = {}
-        subject["ib_level_subjects"] = {}
-
-        if field_name in career_fields:
-            subject["careers"] = career_fields[field_name]
-            subject["description"] = career_fields[field_name][0].get("description", "")
-
-        if field_name in career_checklists:
-            subject["checklist"] = career_checklists[field_name]
-
-        if field_name in career_supporting:
-            for sub_name, description in career_supporting[field_name].items():
-                sup_id = None
-                for sid, name in supporting_subject_names_dict.items():
-                    if name.lower() == sub_name.lower():
-                        sup_id = sid
-                        break
-                score = round(supporting_scores.get(sup_id, 0)) if sup_id else 0
-                subject["supporting_subjects"].append({
-                    "subject_id": sup_id,
-                    "name": sub_name,
-                    "score": score,
-                    "description": description,
-                })
-
-        for entry in a_level_data:
-            if entry["Career Area"].lower() == field_name.lower():
-                subject["a_level_subjects"] = entry
-                break
-
-        for entry in ib_level_data:
-            if entry["Career Area"].lower() == field_name.lower():
-                subject["ib_level_subjects"] = entry
-                break
-
-    return jsonify({"student_id": student_id, "top_fields": top_subjects})
+    return jsonify(report)
 
 
 # ---------------------------------------------------------------------------
@@ -400,7 +414,7 @@ def create_firm():
     db.session.flush()  # get firm.id before committing
 
     # Create firm admin with hashed password
-    hashed_password = generate_password_hash(admin_password, method='pbkdf2:sha256')
+    hashed_password = hash_password(admin_password)
     firm_admin = FirmAdmin(
         firm_id=firm.id,
         username=admin_username,
@@ -555,6 +569,7 @@ def update_firm_branding(firm_id):
         firm.secondary_color = secondary_color or None
 
     db.session.commit()
+    invalidate_branded_pdfs(firm.id)
 
     return jsonify({
         "success": True,
@@ -632,6 +647,8 @@ def admin_reset_student_test(student_id):
 
     if test_type in ("career", "both"):
         StudentCareerResponse.query.filter_by(student_id=student_id).delete()
+        invalidate_student_reports(student_id)
+        invalidate_student_pdfs(student_id, "career")
         exam = ExamProcess.query.filter_by(student_id=student_id).first()
         if exam:
             db.session.delete(exam)
@@ -642,6 +659,8 @@ def admin_reset_student_test(student_id):
 
     if test_type in ("aptitude", "both"):
         AptitudeImgResponse.query.filter_by(student_id=student_id).delete()
+        clear_student_summary(student_id)
+        invalidate_student_pdfs(student_id, "aptitude")
         track = Trackaptitude.query.filter_by(student_id=student_id).first()
         if track:
             db.session.delete(track)
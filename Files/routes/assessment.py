@@ -2,18 +2,28 @@
 
 import logging
 
-from flask import Blueprint, jsonify, redirect, render_template, request, url_for
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from flask import Blueprint, Response, jsonify, redirect, render_template, request, url_for
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required, verify_jwt_in_request
 
 from extensions import db
-from models.assessment import (
-    AptitudeAllQuestions,
-    AptitudeImgResponse,
-    AptitudeTextQuestions,
-    CareerQuestion,
-    StudentCareerResponse,
-)
+from models.assessment import StudentCareerResponse
 from models.student import ExamProcess, StudentDetails, TestStatus, Trackaptitude
+from services.aptitude_grading import grade_responses, upsert_responses
+from services.aptitude_summary import refresh_student_summary
+from services.career_catalog import get_career_catalog
+from services.career_responses import (
+    parse_answers,
+    record_career_responses,
+    remaining_questions,
+)
+from services.pdf_cache import invalidate_student_pdfs
+from services.question_bank import (
+    assign_form,
+    get_answer_key,
+    get_aptitude_form,
+    sample_text_questions,
+)
+from services.report_cache import invalidate_student_reports
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +64,18 @@ def _mark_assessment_complete(student_id: int, assessment_type: str) -> None:
         )
 
 
+def _optional_student_id():
+    """Return the student id from a valid JWT, or None for anyone else."""
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return None
+    identity = get_jwt_identity()
+    if identity is None or get_jwt().get("role") != "student":
+        return None
+    return int(identity)
+
+
 @assessment_bp.route('/career_assessment')
 @jwt_required(optional=True)
 def career_assessment():
@@ -111,19 +133,18 @@ def career_questions():
     else:
         next_question_id = 1
 
-    # Fetch the next question
-    question = CareerQuestion.query.filter_by(question_number=next_question_id).first()
+    # Fetch the next question from the cached catalog
+    catalog = get_career_catalog()
+    question = catalog.get(next_question_id)
 
     if not question:
         return jsonify({'success': False, 'message': 'No more questions available'}), 404
 
-    total_questions = CareerQuestion.query.count()
-
     return jsonify({
         'success': True,
         'question_number': question.question_number,
         'question_text': question.question,
-        'total_questions': total_questions,
+        'total_questions': catalog.total,
     })
 
 
@@ -141,10 +162,8 @@ def submit_response():
 
     question_id = data.get('question_id')
 
-    question = CareerQuestion.query.filter_by(
-        question_number=question_id
-    ).first()
-    if not question:
+    catalog = get_career_catalog()
+    if not catalog.get(question_id):
         return jsonify({'success': False, 'message': 'Invalid question ID'}), 400
 
     # Deduplication: prevent duplicate responses for the same question
@@ -164,6 +183,8 @@ def submit_response():
         response_weight=data['response_weight'],
     )
     db.session.add(new_response)
+    invalidate_student_reports(student_id)
+    invalidate_student_pdfs(student_id, 'career')
 
     # Update last attempted question in ExamProcess table
     exam_progress = ExamProcess.query.filter_by(student_id=student_id).first()
@@ -182,73 +203,85 @@ def submit_response():
     db.session.commit()
 
     # Check if the career test is now complete (all questions answered)
-    total_career_questions = CareerQuestion.query.count()
-    if exam_progress.last_attempted_question_id >= total_career_questions:
+    if exam_progress.last_attempted_question_id >= catalog.total:
         _mark_assessment_complete(student_id, "career")
 
     return jsonify({'success': True, 'message': 'Response saved!'})
 
 
+@assessment_bp.route('/career_questions/remaining', methods=['GET'])
+@jwt_required()
+def career_questions_remaining():
+    """Return every unanswered career question so the client can batch answers."""
+    claims = get_jwt()
+    if claims.get("role") != "student":
+        return jsonify({'success': False, 'message': 'User not logged in'}), 401
+
+    student_id = int(get_jwt_identity())
+    last_attempted, questions, total_questions = remaining_questions(student_id)
+
+    return jsonify({
+        'success': True,
+        'last_attempted_question_id': last_attempted,
+        'questions': questions,
+        'total_questions': total_questions,
+    })
+
+
+@assessment_bp.route('/submit_responses', methods=['POST'])
+@jwt_required()
+def submit_responses():
+    """Record a chunk of career answers in one transaction.
+
+    Body: ``{"responses": [{"question_id": 3, "response_weight": 2}, ...]}``.
+    Re-sending a chunk is harmless: stored answers are kept as they are.
+    """
+    claims = get_jwt()
+    if claims.get("role") != "student":
+        return jsonify({'success': False, 'message': 'User not logged in'}), 401
+
+    student_id = int(get_jwt_identity())
+    try:
+        answers = parse_answers(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    try:
+        result = record_career_responses(
+            student_id,
+            claims.get("email", ""),
+            claims.get("first_name", ""),
+            answers,
+        )
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Batch career submission failed for student %s", student_id)
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    if result.pop('newly_completed'):
+        _mark_assessment_complete(student_id, "career")
+
+    return jsonify({'success': True, **result})
+
+
 @assessment_bp.route('/aptitudegetquestion', methods=['GET'])
 def aptitudegetquestion():
-    try:
-        # Fetch all unique categories dynamically
-        categories = db.session.query(AptitudeAllQuestions.category).distinct().all()
-        categories_list = [c[0] for c in categories]
-
-        all_questions = {}
-
-        for category in categories_list:
-            questions = (
-                AptitudeAllQuestions.query.filter_by(category=category)
-                .order_by(db.func.rand())
-                .limit(30)
-                .all()
-            )
-
-            all_questions[category] = [
-                {
-                    'id': q.id,
-                    'question_text': q.question_text,
-                    'question_image_url': (
-                        url_for('static', filename=q.question_image, _external=True)
-                        if q.question_image
-                        else None
-                    ),
-                    'option_a_text': q.option_a_text,
-                    'option_a_image_url': (
-                        url_for('static', filename=q.option_a_image, _external=True)
-                        if q.option_a_image
-                        else None
-                    ),
-                    'option_b_text': q.option_b_text,
-                    'option_b_image_url': (
-                        url_for('static', filename=q.option_b_image, _external=True)
-                        if q.option_b_image
-                        else None
-                    ),
-                    'option_c_text': q.option_c_text,
-                    'option_c_image_url': (
-                        url_for('static', filename=q.option_c_image, _external=True)
-                        if q.option_c_image
-                        else None
-                    ),
-                    'option_d_text': q.option_d_text,
-                    'option_d_image_url': (
-                        url_for('static', filename=q.option_d_image, _external=True)
-                        if q.option_d_image
-                        else None
-                    ),
-                    'category': q.category,
-                }
-                for q in questions
-            ]
-
-        return jsonify({'questions_by_category': all_questions})
+    """Serve the student's pre-generated aptitude test form.
 
+    Forms come from an in-memory pool (see services.question_bank); the
+    JSON body is built once per form and revalidated with an ETag.
+    """
+    try:
+        form_id = assign_form(_optional_student_id())
+        body, etag = get_aptitude_form(form_id)
     except Exception as e:
         return jsonify({'error': 'Database error', 'message': str(e)}), 500
 
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
 
 @assessment_bp.route('/submit_category_responses', methods=['POST'])
 @jwt_required()
@@ -263,40 +296,24 @@ def submit_category_responses():
     responses = data.get('responses')
 
     try:
-        # Count expected questions for this category from the DB
-        expected_count = AptitudeAllQuestions.query.filter_by(
-            category=category
-        ).count()
-
-        answered_count = 0
-        for question_id_str, selected_option in responses.items():
-            question_id = int(question_id_str)
-            question = AptitudeAllQuestions.query.filter_by(id=question_id).first()
-            if not question:
-                continue
-
-            if selected_option is None or selected_option == "0":
-                is_correct = 0
-            else:
-                is_correct = 1 if selected_option == question.correct_option else 0
-                answered_count += 1
-
-            existing_response = AptitudeImgResponse.query.filter_by(
-                student_id=student_id, question_id=question_id
-            ).first()
-
-            if existing_response:
-                existing_response.selected_option = selected_option
-                existing_response.is_correct = is_correct
-            else:
-                new_response = AptitudeImgResponse(
-                    student_id=student_id,
-                    question_id=question_id,
-                    selected_option=selected_option,
-                    is_correct=is_correct,
-                    category=category,
-                )
-                db.session.add(new_response)
+        # Expected count and answer keys come from the cached answer key
+        answer_key = get_answer_key()
+        expected_count = answer_key.expected_count(category)
+
+        # Grade in memory, then one multi-row upsert for the answers
+        graded, answered_count = grade_responses(responses, answer_key)
+        upsert_responses(
+            student_id,
+            claims.get("email"),
+            claims.get("first_name"),
+            category,
+            graded,
+        )
+        refresh_student_summary(
+            student_id,
+            (answer_key.questions[question_id][1] for question_id, _, _ in graded),
+        )
+        invalidate_student_pdfs(student_id, 'aptitude')
 
         # Determine if category is complete (all expected questions answered)
         is_complete = answered_count >= expected_count
@@ -347,21 +364,8 @@ def aptitudetextgetquestion():
 
         student_id = int(get_jwt_identity())
 
-        categories = db.session.query(
-            AptitudeTextQuestions.aptitudecategory
-        ).distinct().all()
-        categories_list = [c[0] for c in categories]
-
-        all_text_questions = {}
-
-        for category in categories_list:
-            questions = (
-                AptitudeTextQuestions.query.filter_by(aptitudecategory=category)
-                .order_by(db.func.rand())
-                .limit(30)
-                .all()
-            )
-            all_text_questions[category] = [q.to_dict() for q in questions]
+        # Seeded per student: the same form comes back on every reload.
+        all_text_questions = sample_text_questions(student_id)
 
         # Fetch last attempted category
         track = Trackaptitude.query.filter_by(student_id=student_id).first()
@@ -18,13 +18,14 @@ from flask_jwt_extended import (
     unset_jwt_cookies,
 )
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from extensions import db, limiter
 from models.admin import Admin
 from models.consultancy import ConsultancyFirm
 from models.student import StudentDetails
 from schemas.validation import validate_admin_login, validate_login, validate_registration
+from services.passwords import hash_password, verify_password
+from services.revocation import revoke_token
 
 auth_bp = Blueprint('auth', __name__)
 logger = logging.getLogger(__name__)
@@ -95,7 +96,7 @@ def register():
             return jsonify({'success': False, 'message': 'Firm is not active'}), 400
 
     # Hash password
-    hashed_password = generate_password_hash(data['password'], method='pbkdf2:sha256')
+    hashed_password = hash_password(data['password'])
 
     # Create new user
     new_user = StudentDetails(
@@ -150,7 +151,7 @@ def login():
         return jsonify({'success': False, 'message': '; '.join(errors)}), 400
 
     user = StudentDetails.query.filter_by(email=data['email']).first()
-    if user and check_password_hash(user.password, data['password']):
+    if user and verify_password(user, data['password']):
         additional_claims = {
             "role": "student",
             "email": user.email,
@@ -183,7 +184,7 @@ def admin_login():
     password = data.get('password', '').strip()
 
     admin = Admin.query.filter_by(username=username).first()
-    if admin and check_password_hash(admin.password, password):
+    if admin and verify_password(admin, password):
         additional_claims = {
             "role": "admin",
         }
@@ -217,8 +218,7 @@ def logout():
     """Revoke the current access token and clear JWT cookies."""
     token = get_jwt()
     if token:
-        from app import BLOCKLIST
-        BLOCKLIST.add(token["jti"])
+        revoke_token(token)
     response = jsonify({"message": "Logged out"})
     unset_jwt_cookies(response)
     return response
@@ -230,8 +230,7 @@ def admin_logout():
     """Revoke the current access token and clear JWT cookies."""
     token = get_jwt()
     if token:
-        from app import BLOCKLIST
-        BLOCKLIST.add(token["jti"])
+        revoke_token(token)
     response = jsonify({"message": "Logged out"})
     unset_jwt_cookies(response)
     return response
@@ -349,7 +348,7 @@ def reset_password(token):
     if user is None:
         return jsonify({"success": False, "message": "Account not found."}), 404
 
-    user.password = generate_password_hash(new_password, method='pbkdf2:sha256')
+    user.password = hash_password(new_password)
     db.session.commit()
 
     return jsonify({"success": True, "message": "Password reset successful. You can now log in."})
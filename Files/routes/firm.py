@@ -8,7 +8,17 @@ import uuid
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-from flask import Blueprint, current_app, jsonify, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from PIL import Image
 from werkzeug.utils import secure_filename
 from flask_jwt_extended import (
@@ -22,12 +32,29 @@ from flask_jwt_extended import (
     unset_jwt_cookies,
 )
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from extensions import db, limiter, socketio
-from models.assessment import CareerQuestion, StudentCareerResponse, AptitudeImgResponse
+from models.assessment import StudentCareerResponse, AptitudeImgResponse
 from models.consultancy import ConsultancyFirm, CreditTransaction, FirmAdmin
 from models.student import ExamProcess, StudentDetails, TestStatus, Trackaptitude
+from services.aptitude_summary import clear_student_summary
+from services.cohort import cohort_scores_response, parse_cohort_request
+from services.passwords import hash_password, verify_password
+from services.pdf_cache import (
+    invalidate_branded_pdfs,
+    invalidate_student_pdfs,
+    report_page_url,
+)
+from services.report_bundle import embedded_bundle
+from services.report_cache import invalidate_student_reports
+from services.report_export import stream_report_zip
+from services.revocation import revoke_token
+from services.student_progress import (
+    InvalidCursor,
+    keyset_page_with_progress,
+    paginate_with_progress,
+)
+from services.student_search import apply_search
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +129,7 @@ def firm_login():
         return jsonify({"success": False, "message": "Email and password are required"}), 400
 
     admin = FirmAdmin.query.filter_by(email=email).first()
-    if admin is None or not check_password_hash(admin.password, password):
+    if admin is None or not verify_password(admin, password):
         return jsonify({"success": False, "message": "Invalid email or password"}), 401
 
     # Build JWT with firm-specific claims
@@ -134,8 +161,7 @@ def firm_logout():
     """Clear session / JWT cookies for the firm admin."""
     token = get_jwt()
     if token:
-        from app import BLOCKLIST
-        BLOCKLIST.add(token["jti"])
+        revoke_token(token)
     response = jsonify({"message": "Logged out"})
     unset_jwt_cookies(response)
     return response
@@ -166,6 +192,7 @@ def firm_dashboard_data():
 
     return jsonify({
         "success": True,
+        "firm_id": firm.id,
         "firm_name": firm.firm_name,
         "credit_balance": firm.credit_balance,
         "total_students": total_students,
@@ -217,7 +244,11 @@ def firm_credit_transactions():
 @firm_bp.route("/api/v1/firm/students", methods=["GET"])
 @jwt_required()
 def firm_students_list():
-    """Return a paginated list of students belonging to the authenticated firm."""
+    """Return a paginated list of students belonging to the authenticated firm.
+
+    Supports the same ``after`` / ``include_total`` keyset mode as the admin
+    student list.
+    """
     admin = _get_firm_admin()
     if admin is None:
         return jsonify({"success": False, "message": "Unauthorized"}), 403
@@ -232,46 +263,23 @@ def firm_students_list():
     query = StudentDetails.query.filter_by(firm_id=admin.firm_id)
 
     if search:
-        like_term = f"%{search}%"
-        query = query.filter(
-            db.or_(
-                StudentDetails.first_name.ilike(like_term),
-                StudentDetails.last_name.ilike(like_term),
-                StudentDetails.email.ilike(like_term),
+        query = apply_search(query, search)
+
+    # Keyset mode: ?after=<cursor> (empty for the first page)
+    cursor_mode = "after" in request.args
+    if cursor_mode:
+        include_total = request.args.get("include_total", "", type=str).lower() == "true"
+        try:
+            rows, next_cursor, total = keyset_page_with_progress(
+                query, request.args.get("after", "", type=str), per_page, include_total
             )
-        )
-
-    pagination = query.order_by(StudentDetails.id).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-
-    total_career_questions = CareerQuestion.query.count()
+        except InvalidCursor:
+            return jsonify({"success": False, "message": "Invalid cursor"}), 400
+    else:
+        pagination, rows = paginate_with_progress(query, page, per_page)
 
     students = []
-    for s in pagination.items:
-        test_status = TestStatus.query.filter_by(user_id=s.id).first()
-        exam_progress = ExamProcess.query.filter_by(student_id=s.id).first()
-
-        career_test_completed = False
-        aptitude_test_completed = False
-
-        if exam_progress and exam_progress.last_attempted_question_id >= total_career_questions:
-            career_test_completed = True
-        elif test_status and test_status.career_test_completed:
-            career_test_completed = True
-
-        if test_status and test_status.aptitude_test_completed:
-            aptitude_test_completed = True
-
-        # Last attempted aptitude category
-        track_apt = Trackaptitude.query.filter_by(student_id=s.id).first()
-        last_aptitude_category = track_apt.last_category if track_apt else None
-
-        # Last attempted career question number
-        last_career_question = None
-        if exam_progress:
-            last_career_question = exam_progress.last_attempted_question_id
-
+    for s, progress in rows:
         students.append({
             "id": s.id,
             "first_name": s.first_name,
@@ -281,10 +289,16 @@ def firm_students_list():
             "grade": s.grade,
             "school_name": s.school_name,
             "can_view_career_result": s.can_view_career_result,
-            "career_test_completed": career_test_completed,
-            "aptitude_test_completed": aptitude_test_completed,
-            "last_aptitude_category": last_aptitude_category,
-            "last_career_question": last_career_question,
+            **progress,
+        })
+
+    if cursor_mode:
+        return jsonify({
+            "success": True,
+            "students": students,
+            "total": total,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
         })
 
     return jsonify({
@@ -296,6 +310,39 @@ def firm_students_list():
     })
 
 
+@firm_bp.route("/api/v1/firm/students/scores", methods=["POST"])
+@jwt_required()
+def firm_cohort_scores():
+    """Score many of the firm's students at once, streamed as NDJSON.
+
+    Accepts JSON with either ``student_ids`` (list of ints) or an optional
+    ``search`` term (all firm students when omitted), plus an optional
+    ``include`` list of 'career' / 'aptitude'.  Ids outside the firm are
+    silently dropped.
+    """
+    admin = _get_firm_admin()
+    if admin is None:
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    data = request.get_json(silent=True) or {}
+    student_ids, include, error = parse_cohort_request(data)
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    query = db.session.query(StudentDetails.id).filter(
+        StudentDetails.firm_id == admin.firm_id
+    )
+    if student_ids is not None:
+        query = query.filter(StudentDetails.id.in_(student_ids))
+    else:
+        search = str(data.get("search") or "").strip()
+        if search:
+            query = apply_search(query, search).order_by(None)
+    firm_student_ids = [row.id for row in query.order_by(StudentDetails.id)]
+
+    return cohort_scores_response(firm_student_ids, include)
+
+
 # ---------------------------------------------------------------------------
 # Phase 7 – Toggle Result Access (Intern 4)
 # ---------------------------------------------------------------------------
@@ -368,6 +415,8 @@ def firm_reset_student_test(student_id):
     if test_type in ("career", "both"):
         # Delete career responses
         StudentCareerResponse.query.filter_by(student_id=student_id).delete()
+        invalidate_student_reports(student_id)
+        invalidate_student_pdfs(student_id, "career")
         # Reset exam process (career progress tracker)
         exam = ExamProcess.query.filter_by(student_id=student_id).first()
         if exam:
@@ -381,6 +430,8 @@ def firm_reset_student_test(student_id):
     if test_type in ("aptitude", "both"):
         # Delete aptitude responses
         AptitudeImgResponse.query.filter_by(student_id=student_id).delete()
+        clear_student_summary(student_id)
+        invalidate_student_pdfs(student_id, "aptitude")
         # Reset aptitude tracker
         track = Trackaptitude.query.filter_by(student_id=student_id).first()
         if track:
@@ -425,6 +476,7 @@ def firm_download_aptitude(student_id):
         student_id=student_id,
         firm_logo_url=firm.logo_url if firm else None,
         firm_name=firm.firm_name if firm else None,
+        report_bundle=embedded_bundle(student_id, "aptitude"),
     )
 
 
@@ -450,6 +502,94 @@ def firm_download_career(student_id):
         student_id=student_id,
         firm_logo_url=firm.logo_url if firm else None,
         firm_name=firm.firm_name if firm else None,
+        report_bundle=embedded_bundle(student_id, "career"),
+    )
+
+
+_EXPORT_PAGES = {
+    "aptitude": "firm.firm_download_aptitude",
+    "career": "firm.firm_download_career",
+}
+
+_EXPORT_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
+@firm_bp.route("/api/v1/firm/students/reports/export", methods=["POST"])
+@jwt_required()
+def firm_export_reports():
+    """Stream a ZIP of report PDFs for many of the firm's students.
+
+    Accepts JSON with either ``student_ids`` (list of ints) or an optional
+    ``search`` term (all firm students when omitted), an optional
+    ``include`` list of 'career' / 'aptitude', and an optional ``export_id``
+    echoed in the ``report_export_progress`` Socket.IO events sent to the
+    ``firm_<firm_id>`` room.  Only reports of completed tests are rendered;
+    the rest are listed in the archive's ``errors.json``.
+    """
+    admin = _get_firm_admin()
+    if admin is None:
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    data = request.get_json(silent=True) or {}
+    student_ids, include, error = parse_cohort_request(data)
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    query = (
+        db.session.query(StudentDetails, TestStatus)
+        .outerjoin(TestStatus, TestStatus.user_id == StudentDetails.id)
+        .filter(StudentDetails.firm_id == admin.firm_id)
+    )
+    if student_ids is not None:
+        query = query.filter(StudentDetails.id.in_(student_ids))
+    else:
+        search = str(data.get("search") or "").strip()
+        if search:
+            query = apply_search(query, search).order_by(None)
+    rows = query.order_by(StudentDetails.id).all()
+
+    limit = current_app.config["PDF_EXPORT_MAX_STUDENTS"]
+    if len(rows) > limit:
+        return jsonify({
+            "success": False,
+            "message": f"At most {limit} students can be exported per request",
+        }), 400
+
+    reports, skipped = [], []
+    for student, status in rows:
+        completed = {
+            "career": bool(status and status.career_test_completed),
+            "aptitude": bool(status and status.aptitude_test_completed),
+        }
+        name = f"{student.first_name} {student.last_name}"
+        for kind in include:
+            if not completed[kind]:
+                skipped.append({"student_id": student.id, "type": kind, "error": "Test not completed"})
+                continue
+            page_url = report_page_url(_EXPORT_PAGES[kind], student_id=student.id)
+            reports.append((student.id, name, kind, page_url))
+
+    # Echoed into headers and progress events, so only our own format is kept.
+    export_id = str(data.get("export_id") or "")
+    if not _EXPORT_ID_RE.fullmatch(export_id):
+        export_id = uuid.uuid4().hex
+    stream = stream_report_zip(
+        current_app._get_current_object(),
+        reports,
+        admin.firm_id,
+        admin.id,
+        export_id,
+        room=f"firm_{admin.firm_id}",
+        skipped=skipped,
+    )
+    return Response(
+        stream_with_context(stream),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="reports_{export_id}.zip"',
+            "Cache-Control": "no-store",
+            "X-Export-Id": export_id,
+        },
     )
 
 
@@ -534,7 +674,7 @@ def firm_reset_password(token):
     if admin is None:
         return jsonify({"success": False, "message": "Account not found."}), 404
 
-    admin.password = generate_password_hash(new_password, method='pbkdf2:sha256')
+    admin.password = hash_password(new_password)
     db.session.commit()
 
     return jsonify({"success": True, "message": "Password reset successful. You can now log in."})
@@ -646,6 +786,7 @@ def firm_update_branding():
         return jsonify({"success": False, "message": "No changes provided"}), 400
 
     db.session.commit()
+    invalidate_branded_pdfs(firm.id)
 
     return jsonify({
         "success": True,
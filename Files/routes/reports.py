@@ -0,0 +1,167 @@
+"""Report routes for students, admins and firms.
+
+Report data bundles for the report pages (see :mod:`services.report_bundle`)
+and asynchronous PDF jobs.
+"""
+
+import os
+
+from flask import Blueprint, jsonify, url_for
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+
+from extensions import db
+from models.consultancy import ConsultancyFirm, FirmAdmin
+from models.report import PdfJob
+from models.student import StudentDetails
+from services.pdf_cache import report_page_url, report_path, send_pdf_file
+from services.pdf_jobs import JobQueueFull, create_job, job_payload, refresh_job
+from services.report_bundle import get_report_bundle
+
+reports_bp = Blueprint("reports", __name__)
+
+# Report page the renderer loads, per report type and requester role
+REPORT_PAGES = {
+    "aptitude": {"student": "student.download_aptitude", "firm_admin": "firm.firm_download_aptitude"},
+    "career": {"student": "student.download_career", "firm_admin": "firm.firm_download_career"},
+}
+
+
+def _requester():
+    """Return ``(role, id)`` from the current JWT."""
+    return get_jwt().get("role"), int(get_jwt_identity())
+
+
+def _report_access(student_id):
+    """Return ``(student, firm, None)`` if the requester may see the reports, else ``(None, None, error)``.
+
+    ``firm`` is the firm whose branding a firm admin's reports show.
+    """
+    role, requester_id = _requester()
+    if role not in ("student", "admin", "firm_admin") or (
+        role == "student" and requester_id != student_id
+    ):
+        return None, None, (jsonify({"success": False, "message": "Forbidden"}), 403)
+
+    student = db.session.get(StudentDetails, student_id)
+    if student is None:
+        return None, None, (jsonify({"success": False, "message": "Student not found"}), 404)
+
+    if role != "firm_admin":
+        return student, None, None
+
+    admin = db.session.get(FirmAdmin, requester_id)
+    if admin is None or student.firm_id != admin.firm_id:
+        return None, None, (jsonify({"success": False, "message": "Student does not belong to your firm"}), 403)
+    return student, db.session.get(ConsultancyFirm, admin.firm_id), None
+
+
+def _bundle_response(bundle):
+    if "error" in bundle:
+        return jsonify(bundle), 404
+    response = jsonify(bundle)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@reports_bp.route("/api/v1/reports/career/<int:student_id>", methods=["GET"])
+@jwt_required()
+def career_report_bundle(student_id):
+    """Return everything the career report page shows, from one scoring pass.
+
+    ``scores`` is the ``/get_career_scores`` payload and ``report`` the
+    ``/career_report`` one (top fields with their supporting subjects and
+    curriculum tables).
+    """
+    _student, _firm, error = _report_access(student_id)
+    if error:
+        return error
+    return _bundle_response(get_report_bundle(student_id, "career"))
+
+
+@reports_bp.route("/api/v1/reports/aptitude/<int:student_id>", methods=["GET"])
+@jwt_required()
+def aptitude_report_bundle(student_id):
+    """Return the aptitude report page's scores and per-category results."""
+    _student, _firm, error = _report_access(student_id)
+    if error:
+        return error
+    return _bundle_response(get_report_bundle(student_id, "aptitude"))
+
+
+def _get_job(student_id, kind, job_id):
+    """Return the job if the requester created it (or is an admin), else None."""
+    job = db.session.get(PdfJob, job_id)
+    if job is None or job.student_id != student_id or job.kind != kind:
+        return None
+    role, requester_id = _requester()
+    if role != "admin" and (job.requester_role, job.requester_id) != (role, requester_id):
+        return None
+    return job
+
+
+def _job_response(job, status=200):
+    status_url = url_for("reports.get_report_job", student_id=job.student_id, kind=job.kind, job_id=job.id)
+    download_url = url_for("reports.download_report_job", student_id=job.student_id, kind=job.kind, job_id=job.id)
+    response = jsonify({"success": True, "status_url": status_url, **job_payload(job, download_url)})
+    response.headers["Cache-Control"] = "no-store"
+    if status == 202:
+        response.headers["Location"] = status_url
+    return response, status
+
+
+@reports_bp.route("/api/v1/reports/<int:student_id>/<kind>/jobs", methods=["POST"])
+@jwt_required()
+def create_report_job(student_id, kind):
+    """Queue a PDF render of a student's aptitude or career report."""
+    if kind not in REPORT_PAGES:
+        return jsonify({"success": False, "message": "Unknown report type"}), 404
+
+    student, firm, error = _report_access(student_id)
+    if error:
+        return error
+
+    role, requester_id = _requester()
+    page_endpoint = REPORT_PAGES[kind]["firm_admin" if role == "firm_admin" else "student"]
+    try:
+        job = create_job(
+            student,
+            kind,
+            report_page_url(page_endpoint, student_id=student_id),
+            firm,
+            role,
+            requester_id,
+        )
+    except JobQueueFull:
+        response = jsonify({"success": False, "message": "Too many reports are being generated, try again shortly"})
+        response.headers["Retry-After"] = "10"
+        return response, 503
+
+    return _job_response(job, 202)
+
+
+@reports_bp.route("/api/v1/reports/<int:student_id>/<kind>/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def get_report_job(student_id, kind, job_id):
+    """Return the status of a PDF job, with a download URL once it is done."""
+    job = _get_job(student_id, kind, job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    return _job_response(refresh_job(job))
+
+
+@reports_bp.route("/api/v1/reports/<int:student_id>/<kind>/jobs/<job_id>/pdf", methods=["GET"])
+@jwt_required()
+def download_report_job(student_id, kind, job_id):
+    """Download the PDF a finished job produced."""
+    job = _get_job(student_id, kind, job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    if job.status != "done":
+        return jsonify({"success": False, "message": f"Job is {job.status}"}), 409
+
+    path = report_path(job.student_id, job.kind, job.firm_id, job.etag)
+    if not os.path.exists(path):
+        # Dropped since the job ran (new answers, a reset or a branding change).
+        return jsonify({"success": False, "message": "Report is out of date, create a new job"}), 410
+    student = db.session.get(StudentDetails, student_id)
+    return send_pdf_file(student, job.kind, path, job.etag)
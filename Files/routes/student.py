@@ -4,8 +4,9 @@ from flask import Blueprint, jsonify, redirect, render_template, request, url_fo
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required, verify_jwt_in_request
 
 from extensions import db
-from models.assessment import CareerQuestion
 from models.student import ExamProcess, StudentDetails, TestStatus
+from services.career_catalog import get_career_catalog
+from services.report_bundle import embedded_bundle
 from services.scoring import CATEGORY_MAPPING, get_aptitude_results, get_aptitude_scores
 
 student_bp = Blueprint('student', __name__)
@@ -78,7 +79,7 @@ def programmes():
     exam_progress = ExamProcess.query.filter_by(student_id=user_id).first()
     career_test_completed = False
 
-    total_career_questions = CareerQuestion.query.count()
+    total_career_questions = get_career_catalog().total
     if exam_progress and exam_progress.last_attempted_question_id >= total_career_questions:
         career_test_completed = True
     elif test_status:
@@ -110,7 +111,11 @@ def download_aptitude(student_id):
     # Authorization check: only the student themselves or admin can access
     if not _check_ownership(student_id):
         return jsonify({'error': 'Forbidden'}), 403
-    return render_template('aptitudefirst.html', student_id=student_id)
+    return render_template(
+        'aptitudefirst.html',
+        student_id=student_id,
+        report_bundle=embedded_bundle(student_id, 'aptitude'),
+    )
 
 
 @student_bp.route('/download_career/<int:student_id>')
@@ -119,7 +124,11 @@ def download_career(student_id):
     # Authorization check: only the student themselves or admin can access
     if not _check_ownership(student_id):
         return jsonify({'error': 'Forbidden'}), 403
-    return render_template('download_career.html', student_id=student_id)
+    return render_template(
+        'download_career.html',
+        student_id=student_id,
+        report_bundle=embedded_bundle(student_id, 'career'),
+    )
 
 
 @student_bp.route('/get_student_data/<int:student_id>', methods=['GET'])
@@ -0,0 +1,94 @@
+"""Grading and storage of aptitude category submissions.
+
+A category submission used to cost two queries per answered question (load
+the question, look for an existing response) before the rows were written
+one by one.  Here answers are graded in memory against the cached answer
+key (:func:`services.question_bank.get_answer_key`) and written back with
+a single multi-row upsert keyed on ``(student_id, question_id)`` (the
+``uq_aptitudeimgresponse_student_question`` key, see
+``migrations/006_add_unique_answer_to_aptitudeimgresponse.sql``).
+"""
+
+from extensions import db
+from models.assessment import AptitudeImgResponse
+from services.question_bank import get_answer_key
+from services.upserts import insert_or_update
+
+# Columns refreshed when a student answers the same question again.
+_UPDATED_COLUMNS = ("selected_option", "is_correct")
+
+
+def grade_responses(responses, answer_key=None):
+    """Grade ``{question_id: selected_option}`` against the answer key.
+
+    Unknown question ids are skipped.  A missing answer (``None`` or
+    ``"0"``) is stored as incorrect and does not count as answered.
+
+    Returns:
+        ``(graded, answered_count)`` where ``graded`` is a list of
+        ``(question_id, selected_option, is_correct)`` tuples.
+    """
+    questions = (answer_key or get_answer_key()).questions
+    selected = {int(question_id): option for question_id, option in responses.items()}
+
+    graded = []
+    answered_count = 0
+    for question_id, selected_option in selected.items():
+        if question_id not in questions:
+            continue
+        correct_option, _category = questions[question_id]
+        if selected_option is None or selected_option == "0":
+            is_correct = 0
+        else:
+            is_correct = 1 if selected_option == correct_option else 0
+            answered_count += 1
+        graded.append((question_id, selected_option, is_correct))
+    return graded, answered_count
+
+
+def upsert_responses(student_id, email, first_name, category, graded):
+    """Write graded answers in one statement, replacing earlier answers.
+
+    Does not commit; the caller owns the transaction.
+    """
+    if not graded:
+        return
+
+    rows = [
+        {
+            "student_id": student_id,
+            "email": email,
+            "first_name": first_name,
+            "question_id": question_id,
+            "selected_option": selected_option,
+            "is_correct": is_correct,
+            "category": category,
+        }
+        for question_id, selected_option, is_correct in graded
+    ]
+
+    if not insert_or_update(
+        AptitudeImgResponse.__table__,
+        rows,
+        key_columns=("student_id", "question_id"),
+        update_columns=_UPDATED_COLUMNS,
+    ):
+        _upsert_rows_one_by_one(rows)
+
+
+def _upsert_rows_one_by_one(rows):
+    """Fallback for databases without an upsert statement."""
+    existing = {
+        response.question_id: response
+        for response in AptitudeImgResponse.query.filter(
+            AptitudeImgResponse.student_id == rows[0]["student_id"],
+            AptitudeImgResponse.question_id.in_([row["question_id"] for row in rows]),
+        )
+    }
+    for row in rows:
+        response = existing.get(row["question_id"])
+        if response is None:
+            db.session.add(AptitudeImgResponse(**row))
+        else:
+            for column in _UPDATED_COLUMNS:
+                setattr(response, column, row[column])
@@ -0,0 +1,133 @@
+"""Materialised aptitude totals per student and category.
+
+Reading a student's aptitude scores used to join ``aptitudeimgresponse``
+with ``aptitudeallquestions_new`` and aggregate per category on every
+call.  ``student_aptitude_summary`` keeps those ``(total, correct)``
+figures, so reads become a primary-key lookup.
+
+The summary is refreshed for the submitted categories inside the
+``submit_category_responses`` transaction (re-aggregating just that
+student's rows, which also repairs any drift), cleared by the reset-test
+endpoints, and can be rebuilt from scratch with::
+
+    flask --app app backfill-aptitude-summary
+
+Categories are those of the questions (not of the submitted payload),
+exactly as the join-based aggregation grouped them.
+"""
+
+from extensions import db
+from models.assessment import (
+    AptitudeAllQuestions,
+    AptitudeImgResponse,
+    StudentAptitudeSummary,
+)
+from services.upserts import insert_or_update
+
+SUMMARY_COLUMNS = ("student_id", "category", "total", "correct")
+
+
+def aggregate_responses_query():
+    """``SELECT student_id, category, total, correct`` over the raw responses."""
+    return (
+        db.select(
+            AptitudeImgResponse.student_id,
+            AptitudeAllQuestions.category,
+            db.func.count(AptitudeImgResponse.question_id),
+            db.func.coalesce(
+                db.func.sum(db.case((AptitudeImgResponse.is_correct == 1, 1), else_=0)), 0
+            ),
+        )
+        .join(
+            AptitudeAllQuestions,
+            AptitudeAllQuestions.id == AptitudeImgResponse.question_id,
+        )
+        .group_by(AptitudeImgResponse.student_id, AptitudeAllQuestions.category)
+    )
+
+
+def get_summary_totals(student_ids):
+    """Return ``[(student_id, category, total, correct), ...]`` from the summary."""
+    return db.session.execute(
+        db.select(
+            StudentAptitudeSummary.student_id,
+            StudentAptitudeSummary.category,
+            StudentAptitudeSummary.total,
+            StudentAptitudeSummary.correct,
+        )
+        .where(StudentAptitudeSummary.student_id.in_(student_ids))
+        .order_by(StudentAptitudeSummary.student_id, StudentAptitudeSummary.category)
+    ).all()
+
+
+def refresh_student_summary(student_id, categories):
+    """Recompute the summary rows of one student for ``categories``.
+
+    Run after the student's responses were written, in the same
+    transaction; does not commit.
+    """
+    categories = list(set(categories))
+    if not categories:
+        return
+    rows = [
+        dict(zip(SUMMARY_COLUMNS, row))
+        for row in db.session.execute(
+            aggregate_responses_query().where(
+                AptitudeImgResponse.student_id == student_id,
+                AptitudeAllQuestions.category.in_(categories),
+            )
+        )
+    ]
+    if not rows:
+        return
+    if not insert_or_update(
+        StudentAptitudeSummary.__table__,
+        rows,
+        key_columns=("student_id", "category"),
+        update_columns=("total", "correct"),
+    ):
+        for row in rows:
+            db.session.merge(StudentAptitudeSummary(**row))
+
+
+def clear_student_summary(student_id):
+    """Delete a student's summary rows (caller commits)."""
+    StudentAptitudeSummary.query.filter_by(student_id=student_id).delete()
+
+
+def backfill_aptitude_summary(batch_size=500):
+    """Rebuild the whole summary from the raw responses, in student-id batches.
+
+    Returns the number of summary rows written.
+    """
+    student_ids = db.session.scalars(
+        db.select(AptitudeImgResponse.student_id).distinct()
+        .order_by(AptitudeImgResponse.student_id)
+    ).all()
+
+    written = 0
+    for start in range(0, len(student_ids), batch_size):
+        batch = student_ids[start:start + batch_size]
+        db.session.execute(
+            db.delete(StudentAptitudeSummary)
+            .where(StudentAptitudeSummary.student_id.in_(batch))
+        )
+        result = db.session.execute(
+            db.insert(StudentAptitudeSummary).from_select(
+                list(SUMMARY_COLUMNS),
+                aggregate_responses_query().where(AptitudeImgResponse.student_id.in_(batch)),
+            )
+        )
+        written += result.rowcount
+        db.session.commit()
+
+    # Students whose responses were all deleted keep no summary rows.
+    db.session.execute(
+        db.delete(StudentAptitudeSummary).where(
+            StudentAptitudeSummary.student_id.not_in(
+                db.select(AptitudeImgResponse.student_id).distinct()
+            )
+        )
+    )
+    db.session.commit()
+    return written
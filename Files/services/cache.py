@@ -0,0 +1,161 @@
+"""Shared bookkeeping for the in-process caches used by the services layer.
+
+Each cache owns a :class:`CacheStats` instance and registers it by name so
+the admin API can report hit/miss counters for every cache in one place.
+:func:`content_checksum` builds the version queries caches compare to
+notice edits made directly in the database, and
+:func:`invalidate_on_commit` drops a cache when its rows change through
+the ORM.
+"""
+
+import sqlite3
+import threading
+import zlib
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, object_session
+
+from extensions import db
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class CacheStats:
+    """Thread-safe hit/miss/load/invalidation counters for one cache."""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def loaded(self):
+        with self._lock:
+            self.loads += 1
+
+    def invalidated(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "invalidations": self.invalidations,
+            }
+
+
+def register_cache(name, extra=None):
+    """Create and register a CacheStats for ``name``.
+
+    Args:
+        name: Unique cache name shown in the stats report.
+        extra: Optional zero-argument callable returning a dict of additional
+            fields (size, version, ...) merged into the report.
+
+    Returns:
+        The CacheStats instance the cache should update.
+    """
+    stats = CacheStats(name)
+    with _REGISTRY_LOCK:
+        _REGISTRY[name] = (stats, extra)
+    return stats
+
+
+def all_cache_stats():
+    """Return a ``{name: counters}`` dict for every registered cache."""
+    with _REGISTRY_LOCK:
+        entries = list(_REGISTRY.items())
+    report = {}
+    for name, (stats, extra) in entries:
+        data = stats.as_dict()
+        if extra is not None:
+            data.update(extra())
+        report[name] = data
+    return report
+
+
+def invalidate_on_commit(models, callback, watched_attributes=None):
+    """Call ``callback()`` once a session that changed ``models`` commits.
+
+    Mapper events fire during flush, before other connections can see the
+    change, so they only flag the session; ``callback`` runs after the
+    commit, and a rollback discards the flag.
+
+    Args:
+        models: Mapped classes whose inserts, updates and deletes count.
+        callback: Zero-argument callable that drops the cache.
+        watched_attributes: Optional attribute names; when given, an update
+            only counts if one of them changed.
+    """
+    flag = object()
+
+    def flag_change(_mapper, _connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info[flag] = True
+
+    def flag_update(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[name].history.has_changes() for name in watched_attributes):
+            flag_change(mapper, connection, target)
+
+    for model in models:
+        event.listen(model, "after_insert", flag_change)
+        event.listen(model, "after_update", flag_change if watched_attributes is None else flag_update)
+        event.listen(model, "after_delete", flag_change)
+
+    @event.listens_for(Session, "after_commit")
+    def run_after_commit(session):
+        if session.info.pop(flag, False):
+            callback()
+
+    @event.listens_for(Session, "after_rollback")
+    def discard_after_rollback(session):
+        session.info.pop(flag, None)
+
+
+def content_checksum(*columns):
+    """Return ``SUM(CRC32(CONCAT_WS('|', *columns)))`` over a table (0 if empty).
+
+    The sum of per-row hashes changes whenever any value in ``columns``
+    changes, including edits that keep counts and lengths (two rows
+    swapping a value, a same-length rename).  Select it from the table:
+    ``db.select(content_checksum(Model.a, Model.b))``.
+    """
+    return db.func.coalesce(
+        db.func.sum(db.func.crc32(db.func.concat_ws("|", *columns))), 0
+    )
+
+
+def _crc32(value):
+    if value is None:
+        return None
+    return zlib.crc32(str(value).encode())
+
+
+def _concat_ws(separator, *values):
+    return separator.join(str(value) for value in values if value is not None)
+
+
+@event.listens_for(Engine, "connect")
+def _add_sqlite_functions(dbapi_connection, _connection_record):
+    # MySQL has CRC32 and CONCAT_WS built in; SQLite (development and
+    # tests) gets Python versions.
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("crc32", 1, _crc32, deterministic=True)
+        dbapi_connection.create_function("concat_ws", -1, _concat_ws, deterministic=True)
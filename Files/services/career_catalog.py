@@ -0,0 +1,124 @@
+"""Process-wide cache of the career question catalog.
+
+The career flow, the student dashboard and the admin/firm student lists
+all need the career questions or their count, and used to run
+``CareerQuestion.query.count()`` (plus a primary-key lookup for the next
+question) on every request.  The catalog is loaded once, in question
+order, and shared; :class:`CareerCatalog` answers counts and next-question
+lookups from memory.
+
+A version query (``COUNT``/``MAX`` plus a checksum of every row's number
+and text) runs at most every ``CAREER_CATALOG_CHECK_SECONDS``, so wording
+fixed directly in the database reaches every worker.  Questions inserted,
+updated or deleted through the ORM drop the cache once the session
+commits; :func:`invalidate_career_catalog` drops it explicitly.
+"""
+
+import bisect
+import threading
+import time
+from types import MappingProxyType
+from typing import NamedTuple
+
+from flask import current_app
+
+from extensions import db
+from models.assessment import CareerQuestion
+from services.cache import content_checksum, invalidate_on_commit, register_cache
+
+
+class CatalogQuestion(NamedTuple):
+    question_number: int
+    question: str
+
+
+class CareerCatalog:
+    """Immutable, ordered view of the career questions."""
+
+    def __init__(self, questions):
+        self.questions = tuple(questions)
+        self.numbers = tuple(q.question_number for q in self.questions)
+        self.by_number = MappingProxyType({q.question_number: q for q in self.questions})
+
+    @property
+    def total(self):
+        return len(self.questions)
+
+    def get(self, question_number):
+        """Return the question with ``question_number``, or None."""
+        return self.by_number.get(question_number)
+
+    def after(self, question_number):
+        """Return every question numbered above ``question_number``, in order."""
+        return self.questions[bisect.bisect_right(self.numbers, question_number):]
+
+
+_lock = threading.Lock()
+_catalog = None
+_version = None
+_checked_at = 0.0
+
+_stats = register_cache(
+    "career_catalog",
+    extra=lambda: {"size": _catalog.total if _catalog else 0, "version": _version},
+)
+
+
+def _fetch_version():
+    row = db.session.execute(
+        db.select(
+            db.func.count(CareerQuestion.question_number),
+            db.func.max(CareerQuestion.question_number),
+            content_checksum(CareerQuestion.question_number, CareerQuestion.question),
+        )
+    ).one()
+    return tuple(int(value or 0) for value in row)
+
+
+def _load_catalog():
+    rows = db.session.execute(
+        db.select(CareerQuestion.question_number, CareerQuestion.question)
+        .order_by(CareerQuestion.question_number)
+    )
+    return CareerCatalog(CatalogQuestion(*row) for row in rows)
+
+
+def get_career_catalog():
+    """Return the shared CareerCatalog, reloading it if stale."""
+    global _catalog, _version, _checked_at
+
+    interval = current_app.config.get("CAREER_CATALOG_CHECK_SECONDS", 300)
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _checked_at < interval:
+        _stats.hit()
+        return catalog
+
+    with _lock:
+        if _catalog is not None and time.monotonic() - _checked_at < interval:
+            _stats.hit()
+            return _catalog
+
+        version = _fetch_version()
+        _checked_at = time.monotonic()
+        if _catalog is not None and version == _version:
+            _stats.hit()
+            return _catalog
+
+        _stats.miss()
+        _catalog = _load_catalog()
+        _version = version
+        _stats.loaded()
+        return _catalog
+
+
+def invalidate_career_catalog():
+    """Drop the catalog so the next call reloads it from the database."""
+    global _catalog, _version, _checked_at
+    with _lock:
+        _catalog = None
+        _version = None
+        _checked_at = 0.0
+    _stats.invalidated()
+
+
+invalidate_on_commit([CareerQuestion], invalidate_career_catalog)
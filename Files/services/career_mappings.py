@@ -0,0 +1,194 @@
+"""Process-wide snapshot of the career question -> subject mappings.
+
+The four mapping tables (``question_subject``, ``question_supporting_subject``,
+``subjects``, ``supporting_subjects``) change only when the question bank is
+edited, so they are loaded once per process and shared by every request.
+The snapshot is immutable: lists are stored as tuples and dicts are wrapped
+in read-only proxies so no caller can corrupt the shared copy.
+
+Freshness is guarded by a checksum query (row counts and a per-row content
+hash of each of the four tables, in one statement) that runs at most once every
+``CAREER_MAPPINGS_CHECK_SECONDS``.  Call :func:`invalidate_career_mappings`
+after editing the tables to force an immediate reload.
+"""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import NamedTuple
+
+from flask import current_app
+
+from extensions import db
+from models.assessment import (
+    QuestionSubject,
+    QuestionSupportingSubject,
+    Subject,
+    SupportingSubject,
+)
+from services.cache import content_checksum, register_cache
+
+
+class CareerMappings(NamedTuple):
+    """Immutable mapping snapshot, unpackable like the old 8-tuple."""
+
+    question_subject_dict: MappingProxyType
+    question_supporting_subject_dict: MappingProxyType
+    subject_names_dict: MappingProxyType
+    subject_question_count: MappingProxyType
+    subject_question_numbers: MappingProxyType
+    supporting_subject_question_count: MappingProxyType
+    supporting_subject_question_numbers: MappingProxyType
+    supporting_subject_names_dict: MappingProxyType
+
+
+_lock = threading.Lock()
+_snapshot = None
+_version = None
+_checked_at = 0.0
+
+_stats = register_cache(
+    "career_mappings",
+    extra=lambda: {"loaded": _snapshot is not None, "version": _version},
+)
+
+
+def _count(model):
+    return db.select(db.func.count()).select_from(model).scalar_subquery()
+
+
+def _checksum(model, *columns):
+    return db.select(content_checksum(*columns)).select_from(model).scalar_subquery()
+
+
+def _fetch_version():
+    """Return a checksum tuple for the four mapping tables in one query."""
+    qs, qss = QuestionSubject, QuestionSupportingSubject
+    row = db.session.execute(
+        db.select(
+            _count(qs),
+            _checksum(qs, qs.question_number, qs.subject_id),
+            _count(qss),
+            _checksum(qss, qss.question_number, qss.supporting_id),
+            _count(Subject),
+            _checksum(Subject, Subject.subject_id, Subject.subject_name),
+            _count(SupportingSubject),
+            _checksum(
+                SupportingSubject,
+                SupportingSubject.supporting_id,
+                SupportingSubject.supporting_subject_name,
+            ),
+        )
+    ).one()
+    return tuple(int(value) for value in row)
+
+
+def _freeze(mapping):
+    """Return a read-only view of ``mapping`` with list values as tuples."""
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in mapping.items()
+    })
+
+
+def _build_snapshot():
+    """Run the four full-table loads and return a frozen CareerMappings."""
+    question_subject_dict = {}
+    subject_question_count = {}
+    subject_question_numbers = {}
+
+    entries = QuestionSubject.query.order_by(
+        QuestionSubject.question_number, QuestionSubject.subject_id
+    ).all()
+    for entry in entries:
+        q_num = entry.question_number
+        sub_id = entry.subject_id
+        question_subject_dict.setdefault(q_num, []).append(sub_id)
+        subject_question_count[sub_id] = subject_question_count.get(sub_id, 0) + 1
+        subject_question_numbers.setdefault(sub_id, []).append(q_num)
+
+    question_supporting_subject_dict = {}
+    supporting_subject_question_count = {}
+    supporting_subject_question_numbers = {}
+
+    entries = QuestionSupportingSubject.query.order_by(
+        QuestionSupportingSubject.question_number,
+        QuestionSupportingSubject.supporting_id,
+    ).all()
+    for entry in entries:
+        q_num = entry.question_number
+        sup_id = entry.supporting_id
+        question_supporting_subject_dict.setdefault(q_num, []).append(sup_id)
+        supporting_subject_question_count[sup_id] = (
+            supporting_subject_question_count.get(sup_id, 0) + 1
+        )
+        supporting_subject_question_numbers.setdefault(sup_id, []).append(q_num)
+
+    subject_names_dict = {
+        sub.subject_id: sub.subject_name for sub in Subject.query.all()
+    }
+    supporting_subject_names_dict = {
+        sup.supporting_id: sup.supporting_subject_name
+        for sup in SupportingSubject.query.all()
+    }
+
+    return CareerMappings(
+        _freeze(question_subject_dict),
+        _freeze(question_supporting_subject_dict),
+        _freeze(subject_names_dict),
+        _freeze(subject_question_count),
+        _freeze(subject_question_numbers),
+        _freeze(supporting_subject_question_count),
+        _freeze(supporting_subject_question_numbers),
+        _freeze(supporting_subject_names_dict),
+    )
+
+
+def get_career_mappings():
+    """Return the shared CareerMappings snapshot, reloading it if stale."""
+    global _snapshot, _version, _checked_at
+
+    interval = current_app.config.get("CAREER_MAPPINGS_CHECK_SECONDS", 30)
+    now = time.monotonic()
+    snapshot = _snapshot
+    if snapshot is not None and now - _checked_at < interval:
+        _stats.hit()
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and now - _checked_at < interval:
+            _stats.hit()
+            return _snapshot
+
+        version = _fetch_version()
+        _checked_at = time.monotonic()
+        if _snapshot is not None and version == _version:
+            _stats.hit()
+            return _snapshot
+
+        _stats.miss()
+        _snapshot = _build_snapshot()
+        _version = version
+        _stats.loaded()
+        return _snapshot
+
+
+def career_mappings_version():
+    """Return the checksum tuple of the current snapshot (loading it if needed)."""
+    get_career_mappings()
+    return _version
+
+
+def invalidate_career_mappings():
+    """Drop the snapshot so the next call reloads it from the database."""
+    global _snapshot, _version, _checked_at
+    with _lock:
+        _snapshot = None
+        _version = None
+        _checked_at = 0.0
+    _stats.invalidated()
+
+
+def warm_career_mappings():
+    """Load the snapshot eagerly (called from ``create_app``)."""
+    return get_career_mappings()
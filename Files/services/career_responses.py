@@ -0,0 +1,155 @@
+"""Batched recording of career test answers.
+
+The career page used to make one round trip per question, each costing a
+question lookup, a duplicate check, an ``ExamProcess`` lookup, a commit and
+a question count.  In batch mode the client loads every remaining question
+with :func:`remaining_questions` and posts answers in chunks;
+:func:`record_career_responses` stores a chunk in one transaction.
+
+Retries are safe: an answer that is already stored is left untouched (the
+first answer wins, as with ``/submit_response``), the unique
+``(student_id, question_id)`` key backs this up against concurrent
+requests (see ``migrations/007_add_unique_answer_to_student_career_response.sql``),
+and ``ExamProcess`` only ever moves forward.
+"""
+
+from extensions import db
+from models.assessment import StudentCareerResponse
+from models.student import ExamProcess
+from services.career_catalog import get_career_catalog
+from services.pdf_cache import invalidate_student_pdfs
+from services.report_cache import invalidate_student_reports
+from services.upserts import insert_ignoring_duplicates
+
+RESPONSE_WEIGHTS = (0, 1, 2)  # NO, MAYBE, YES
+
+
+def remaining_questions(student_id):
+    """Return ``(last_attempted, questions, total)`` for a student.
+
+    ``questions`` lists ``{"question_number", "question_text"}`` dicts for
+    every question after the last attempted one, in order.
+    """
+    exam_progress = db.session.get(ExamProcess, student_id)
+    last_attempted = exam_progress.last_attempted_question_id if exam_progress else 0
+
+    catalog = get_career_catalog()
+    questions = [
+        {"question_number": q.question_number, "question_text": q.question}
+        for q in catalog.after(last_attempted)
+    ]
+    return last_attempted, questions, catalog.total
+
+
+def parse_answers(payload):
+    """Validate a batch payload into ``[(question_id, weight), ...]``.
+
+    Later duplicates of a question in the same batch are dropped.
+
+    Raises:
+        ValueError: If the payload is malformed or names an unknown question.
+    """
+    answers = payload.get("responses") if isinstance(payload, dict) else None
+    if not isinstance(answers, list) or not answers:
+        raise ValueError("responses must be a non-empty list")
+
+    parsed = {}
+    for answer in answers:
+        if not isinstance(answer, dict):
+            raise ValueError("Each response must be an object")
+        question_id = answer.get("question_id")
+        weight = answer.get("response_weight")
+        if not isinstance(question_id, int) or isinstance(question_id, bool):
+            raise ValueError("question_id must be an integer")
+        if weight not in RESPONSE_WEIGHTS or isinstance(weight, bool):
+            raise ValueError("response_weight must be 0, 1 or 2")
+        parsed.setdefault(question_id, weight)
+
+    catalog = get_career_catalog()
+    unknown = sorted(q for q in parsed if catalog.get(q) is None)
+    if unknown:
+        raise ValueError(f"Invalid question ID(s): {', '.join(map(str, unknown))}")
+    return list(parsed.items())
+
+
+def _advance_exam_process(student_id, email, first_name, last_question, total):
+    """Move ``ExamProcess`` forward to ``last_question``; never backwards.
+
+    Returns True if this call is the one that completed the test.
+    """
+    column = ExamProcess.last_attempted_question_id
+    stmt = (
+        db.update(ExamProcess)
+        .where(ExamProcess.student_id == student_id, column < last_question)
+        .values(last_attempted_question_id=last_question)
+    )
+    completes = last_question >= total
+    if completes:
+        # Only the request that crosses the finish line reports completion.
+        stmt = stmt.where(column < total)
+    if db.session.execute(stmt).rowcount:
+        return completes
+
+    if db.session.get(ExamProcess, student_id) is not None:
+        return False
+    db.session.add(ExamProcess(
+        student_id=student_id,
+        email=email,
+        firstname=first_name,
+        last_attempted_question_id=last_question,
+    ))
+    return completes
+
+
+def record_career_responses(student_id, email, first_name, answers):
+    """Store a validated batch of answers and advance progress, in one commit.
+
+    Returns a summary dict: ``recorded`` and ``duplicates`` counts, the new
+    ``last_attempted_question_id``, ``total_questions``, ``complete`` and
+    ``newly_completed`` (True only for the batch that finished the test).
+    """
+    question_ids = [question_id for question_id, _weight in answers]
+    already = set(
+        db.session.scalars(
+            db.select(StudentCareerResponse.question_id).where(
+                StudentCareerResponse.student_id == student_id,
+                StudentCareerResponse.question_id.in_(question_ids),
+            )
+        )
+    )
+    rows = [
+        {
+            "student_id": student_id,
+            "first_name": first_name,
+            "email": email,
+            "question_id": question_id,
+            "response_weight": weight,
+        }
+        for question_id, weight in answers
+        if question_id not in already
+    ]
+
+    if rows and not insert_ignoring_duplicates(
+        StudentCareerResponse.__table__, rows, key_columns=("student_id", "question_id")
+    ):
+        db.session.add_all(StudentCareerResponse(**row) for row in rows)
+
+    if rows:
+        invalidate_student_reports(student_id)
+        invalidate_student_pdfs(student_id, "career")
+
+    total = get_career_catalog().total
+    newly_completed = _advance_exam_process(
+        student_id, email, first_name, max(question_ids), total
+    )
+    db.session.commit()
+
+    last_attempted = db.session.get(ExamProcess, student_id).last_attempted_question_id
+    return {
+        "recorded": len(rows),
+        "duplicates": len(answers) - len(rows),
+        "last_attempted_question_id": last_attempted,
+        "total_questions": total,
+        "complete": last_attempted >= total,
+        "newly_completed": newly_completed,
+    }
@@ -0,0 +1,54 @@
+"""Bulk cohort scoring requests, shared by the admin and firm blueprints.
+
+Both ``/api/v1/admin/students/scores`` and ``/api/v1/firm/students/scores``
+accept the same JSON body and stream the same NDJSON lines; the firm
+report export reuses the body validation.
+"""
+
+import json
+
+from flask import Response, current_app, jsonify, stream_with_context
+
+from services.scoring import iter_cohort_scores
+
+COHORT_SECTIONS = ("career", "aptitude")
+
+
+def parse_cohort_request(data):
+    """Validate a bulk scoring body.
+
+    Returns ``(student_ids or None, include, error)``; ``student_ids`` is
+    None when the caller asked for a filter instead of explicit ids.
+    """
+    include = data.get("include") or list(COHORT_SECTIONS)
+    if not isinstance(include, list) or not set(include) <= set(COHORT_SECTIONS):
+        return None, None, "include must be a list of 'career' and/or 'aptitude'"
+
+    student_ids = data.get("student_ids")
+    if student_ids is None:
+        return None, tuple(include), None
+    if not isinstance(student_ids, list) or not all(
+        isinstance(sid, int) and not isinstance(sid, bool) for sid in student_ids
+    ):
+        return None, None, "student_ids must be a list of integers"
+    return list(dict.fromkeys(student_ids)), tuple(include), None
+
+
+def cohort_scores_response(student_ids, include):
+    """Stream per-student cohort scores as NDJSON (one JSON object per line)."""
+    limit = current_app.config.get('BULK_SCORES_MAX_STUDENTS', 5000)
+    if len(student_ids) > limit:
+        return jsonify({
+            "success": False,
+            "message": f"At most {limit} students can be scored per request",
+        }), 400
+
+    def generate():
+        for result in iter_cohort_scores(student_ids, include=include):
+            yield json.dumps(result) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={"Cache-Control": "no-store"},
+    )
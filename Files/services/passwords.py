@@ -0,0 +1,154 @@
+"""Password hashing off the request thread.
+
+``generate_password_hash`` / ``check_password_hash`` (PBKDF2) take
+hundreds of milliseconds of CPU.  Called inline under the eventlet
+Socket.IO server they blocked the event loop, stalling every connected
+client during login bursts.  They now run on a bounded pool: eventlet's
+native thread pool (``eventlet.tpool``) when serving under eventlet, a
+``PASSWORD_HASH_WORKERS`` thread pool otherwise.  hashlib releases the
+GIL while hashing, so hashes also run in parallel.
+
+At most ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE`` hashes may be
+pending; beyond that :class:`PasswordHasherBusy` is raised (answered with
+503 by the app).  :func:`password_hasher_stats` reports the queue depth.
+
+``PASSWORD_HASH_METHOD`` sets the algorithm and cost (werkzeug's method
+string, e.g. ``pbkdf2:sha256:1000000``).  Hashes made with other
+parameters are upgraded on the next successful login.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+from extensions import db, socketio
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes are already pending in this process."""
+
+
+_lock = threading.Lock()
+_executor = None
+_pending = 0
+_running = 0
+_completed = 0
+_rejected = 0
+_busy_seconds = 0.0
+
+
+def _executor_for(app):
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config["PASSWORD_HASH_WORKERS"],
+                thread_name_prefix="password-hash",
+            )
+        return _executor
+
+
+def _timed(fn, *args):
+    global _running, _completed, _busy_seconds
+    with _lock:
+        _running += 1
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        with _lock:
+            _running -= 1
+            _completed += 1
+            _busy_seconds += time.perf_counter() - started
+
+
+def _run(fn, *args):
+    """Run ``fn(*args)`` on the hashing pool and wait for the result."""
+    global _pending, _rejected
+    app = current_app._get_current_object()
+    limit = app.config["PASSWORD_HASH_WORKERS"] + app.config["PASSWORD_HASH_MAX_QUEUE"]
+    with _lock:
+        if _pending >= limit:
+            _rejected += 1
+            raise PasswordHasherBusy()
+        _pending += 1
+
+    try:
+        if socketio.async_mode == "eventlet":
+            from eventlet import tpool
+
+            return tpool.execute(_timed, fn, *args)
+        return _executor_for(app).submit(_timed, fn, *args).result()
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def _normalized_method(method):
+    """Return ``method`` with werkzeug's default parameters filled in."""
+    parts = method.split(":")
+    if parts[0] == "pbkdf2":
+        hash_name = parts[1] if len(parts) > 1 else "sha256"
+        iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if method == "scrypt":
+        return "scrypt:32768:8:1"
+    return method
+
+
+def hash_password(password):
+    """Hash ``password`` with ``PASSWORD_HASH_METHOD`` on the pool.
+
+    Raises:
+        PasswordHasherBusy: If the pool's queue is full.
+    """
+    method = current_app.config["PASSWORD_HASH_METHOD"]
+    return _run(generate_password_hash, password, method)
+
+
+def verify_password(account, password):
+    """Return True if ``password`` matches ``account.password``.
+
+    A matching hash made with other parameters than ``PASSWORD_HASH_METHOD``
+    is replaced (and committed).
+
+    Raises:
+        PasswordHasherBusy: If the pool's queue is full.
+    """
+    stored = account.password or ""
+    if not _run(check_password_hash, stored, password):
+        return False
+
+    method = _normalized_method(current_app.config["PASSWORD_HASH_METHOD"])
+    if stored.split("$", 1)[0] != method:
+        try:
+            account.password = hash_password(password)
+            db.session.commit()
+        except Exception:
+            # The login still succeeds; the upgrade is retried next time.
+            db.session.rollback()
+            logger.exception("Could not upgrade password hash for %r", account)
+    return True
+
+
+def password_hasher_stats():
+    """Return queue-depth and throughput counters for this process."""
+    with _lock:
+        return {
+            "pending": _pending,
+            "running": _running,
+            "queued": _pending - _running,
+            "completed": _completed,
+            "rejected": _rejected,
+            "avg_ms": round(1000 * _busy_seconds / _completed, 1) if _completed else None,
+        }
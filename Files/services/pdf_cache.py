@@ -0,0 +1,261 @@
+"""Rendered PDF reports, cached on local disk.
+
+Every PDF download used to re-render the whole report page in headless
+Chromium.  Rendered files are now stored under ``PDF_CACHE_DIR`` and
+content-addressed by ``(student id, report kind, branding version, score
+version)``: as soon as any of them changes the key changes, so a stale
+PDF is never served even if an invalidation is missed.  The key doubles
+as the file's ETag.
+
+On a miss the report page is rendered by the Node PDF server with a
+short-lived access token minted for the requester (:func:`render_cookies`),
+so it sees exactly what the requester would.
+Files are written atomically and concurrent misses for the same key in
+one process render once.
+
+Invalidation only frees disk space: :func:`invalidate_student_pdfs` is
+called on new responses and test resets, :func:`invalidate_branded_pdfs`
+when a firm's branding changes.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from urllib.request import Request, urlopen
+
+from flask import current_app, request, send_file, url_for
+from flask_jwt_extended import create_access_token, get_csrf_token
+from werkzeug.utils import secure_filename
+
+from services.cache import register_cache
+from services.pdf import generate_pdf_token
+from services.report_bundle import EMBED_ARG
+from services.report_cache import response_version
+from services.scoring import get_aptitude_totals
+
+logger = logging.getLogger(__name__)
+
+_TEMPLATES = {
+    "aptitude": "aptitudefirst.html",
+    "career": "download_career.html",
+}
+
+# Download names the report pages used to give their client-side PDFs
+_DOWNLOAD_SUFFIXES = {
+    "aptitude": "_Report.pdf",
+    "career": "_CareerReport.pdf",
+}
+
+_stats = register_cache("pdf_reports")
+
+# Striped locks: misses for the same key wait for one render.
+_render_locks = [threading.Lock() for _ in range(64)]
+
+
+class PdfRenderError(Exception):
+    """The PDF server could not render a report."""
+
+
+def _digest(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _variant(firm_id):
+    return f"firm{firm_id}" if firm_id else "default"
+
+
+def branding_version(firm):
+    """Return ``(variant, version)`` for the branding a report is shown with.
+
+    ``firm`` is None for the unbranded student/admin report.
+    """
+    if firm is None:
+        return _variant(None), "default"
+    return _variant(firm.id), _digest(
+        firm.firm_name, firm.logo_url, firm.primary_color, firm.secondary_color
+    )
+
+
+def score_version(student, kind):
+    """Return a version string for everything the ``kind`` report shows."""
+    if kind == "career":
+        scores = response_version(student.id)
+    else:
+        scores = get_aptitude_totals([student.id]).get(student.id)
+    template = os.path.join(current_app.root_path, "templates", _TEMPLATES[kind])
+    return _digest(
+        scores,
+        student.first_name,
+        student.last_name,
+        os.stat(template).st_mtime_ns,
+    )
+
+
+def cache_dir():
+    return current_app.config.get("PDF_CACHE_DIR") or os.path.join(
+        current_app.instance_path, "pdf_cache"
+    )
+
+
+def _student_dir(student_id):
+    return os.path.join(cache_dir(), str(student_id))
+
+
+def _jwt_cookie_names():
+    config = current_app.config
+    return config["JWT_ACCESS_COOKIE_NAME"], config["JWT_ACCESS_CSRF_COOKIE_NAME"]
+
+
+def render_cookies(role, identity):
+    """Return short-lived access cookies for the renderer, acting as ``identity``.
+
+    The token outlives one render only, so a page loaded by the PDF server
+    never carries the requester's own, longer-lived session.
+    """
+    return access_token_cookies(create_access_token(
+        identity=str(identity),
+        additional_claims={"role": role},
+        expires_delta=timedelta(seconds=current_app.config["PDF_RENDER_TIMEOUT"] + 60),
+    ))
+
+
+def access_token_cookies(access_token):
+    """Return the cookies a browser would hold for ``access_token``."""
+    access_name, csrf_name = _jwt_cookie_names()
+    cookies = [{"name": access_name, "value": access_token}]
+    if current_app.config["JWT_COOKIE_CSRF_PROTECT"]:
+        cookies.append({"name": csrf_name, "value": get_csrf_token(access_token)})
+    return cookies
+
+
+def _render(page_url, student_id, cookies):
+    """Render ``page_url`` through the Node PDF server and return the bytes."""
+    # Report pages embed their data (see report_page_url), so they are
+    # complete at the load event.
+    payload = dict(generate_pdf_token(student_id), url=page_url, waitUntil="load")
+    if cookies:
+        payload["cookies"] = cookies
+
+    server_url = current_app.config["PDF_SERVER_URL"].rstrip("/")
+    render_request = Request(
+        f"{server_url}/generate-pdf",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urlopen(render_request, timeout=current_app.config["PDF_RENDER_TIMEOUT"]) as response:
+            content = response.read()
+            content_type = response.headers.get("Content-Type", "")
+    except OSError as exc:
+        raise PdfRenderError(f"PDF server request failed: {exc}") from exc
+    if not content_type.startswith("application/pdf"):
+        raise PdfRenderError(f"PDF server returned {content_type or 'no content type'}")
+    return content
+
+
+def _write_atomically(path, content):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def report_path(student_id, kind, firm_id, etag):
+    """Return where the ``kind`` report with key ``etag`` is (or would be) stored."""
+    return os.path.join(_student_dir(student_id), f"{kind}-{_variant(firm_id)}-{etag}.pdf")
+
+
+def report_key(student, kind, firm=None):
+    """Return ``(path, etag)`` the current ``kind`` report is cached under."""
+    _variant_name, branding = branding_version(firm)
+    etag = _digest(student.id, kind, branding, score_version(student, kind))
+    return report_path(student.id, kind, firm.id if firm else None, etag), etag
+
+
+def get_report_pdf(student, kind, page_url, firm=None, cookies=()):
+    """Return ``(path, etag)`` of the rendered ``kind`` report, rendering on a miss.
+
+    ``page_url`` is the report page the renderer loads with ``cookies``;
+    ``firm`` is the firm whose branding the page shows, if any.
+
+    Raises:
+        PdfRenderError: If the report is not cached and rendering fails.
+    """
+    path, etag = report_key(student, kind, firm)
+
+    if os.path.exists(path):
+        _stats.hit()
+        return path, etag
+
+    with _render_locks[int(etag[:8], 16) % len(_render_locks)]:
+        if os.path.exists(path):
+            _stats.hit()
+            return path, etag
+        _stats.miss()
+        content = _render(page_url, student.id, cookies)
+        # Drop earlier versions of the same report before storing the new one.
+        _remove(glob.glob(report_path(student.id, kind, firm.id if firm else None, "*")))
+        _write_atomically(path, content)
+        _stats.loaded()
+    return path, etag
+
+
+def report_page_url(endpoint, **values):
+    """Return the URL the PDF server should load for a report page.
+
+    The page is requested in render mode, with its report data embedded.
+    ``PDF_RENDER_BASE_URL`` overrides the host when the renderer reaches
+    Flask under a different address than browsers do.
+    """
+    base_url = current_app.config.get("PDF_RENDER_BASE_URL") or request.host_url
+    return base_url.rstrip("/") + url_for(endpoint, **values, **{EMBED_ARG: 1})
+
+
+def send_pdf_file(student, kind, path, etag):
+    """Serve a cached report file with ETag and range support."""
+    name = secure_filename(f"{student.first_name} {student.last_name}") or "MYCAREERCHOICES"
+    response = send_file(
+        path,
+        mimetype="application/pdf",
+        as_attachment=True,
+        download_name=name + _DOWNLOAD_SUFFIXES[kind],
+        conditional=True,
+        etag=etag,
+    )
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _remove(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("Could not remove cached PDF %s", path)
+
+
+def invalidate_student_pdfs(student_id, kind=None):
+    """Delete a student's cached PDFs (of one ``kind``, or all)."""
+    pattern = f"{kind}-*.pdf" if kind else "*.pdf"
+    _remove(glob.glob(os.path.join(_student_dir(student_id), pattern)))
+    _stats.invalidated()
+
+
+def invalidate_branded_pdfs(firm_id):
+    """Delete every cached PDF rendered with a firm's branding."""
+    _remove(glob.glob(os.path.join(cache_dir(), "*", f"*-firm{firm_id}-*.pdf")))
+    _stats.invalidated()
+
@@ -0,0 +1,244 @@
+"""Asynchronous PDF report generation.
+
+Downloading a report used to hold a browser connection open for the whole
+render and failed under bursts.  A download now creates a :class:`PdfJob`
+row; a bounded thread pool in this process renders it through
+:mod:`services.pdf_cache` and the client polls the job until it is done.
+
+The render authenticates to the Node PDF server with the usual
+``generate_pdf_token`` HMAC fields; the report page itself is loaded with
+a short-lived access token minted for the requester, so it shows exactly
+what the requester may see.
+
+Failed renders are retried ``PDF_JOB_MAX_ATTEMPTS`` times with exponential
+backoff.  A job is claimed with a conditional UPDATE, so it runs once even
+if dispatched twice, and a job left queued or running for
+``PDF_JOB_STALE_SECONDS`` (e.g. by a restart) is dispatched again the next
+time it is polled.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from extensions import db
+from models.consultancy import ConsultancyFirm
+from models.report import PdfJob
+from models.student import StudentDetails
+from services.pdf_cache import (
+    PdfRenderError,
+    get_report_pdf,
+    render_cookies,
+    report_key,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobQueueFull(Exception):
+    """Too many PDF jobs are already pending in this process."""
+
+
+_lock = threading.Lock()
+_executor = None
+_pending = 0
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _executor_for(app):
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config["PDF_JOB_WORKERS"],
+                thread_name_prefix="pdf-job",
+            )
+        return _executor
+
+
+def _dispatch(app, job_id, delay=0):
+    """Run a job on the worker pool, after ``delay`` seconds.
+
+    Raises:
+        JobQueueFull: If ``PDF_JOB_MAX_PENDING`` jobs are already pending.
+    """
+    global _pending
+    with _lock:
+        if _pending >= app.config["PDF_JOB_MAX_PENDING"]:
+            raise JobQueueFull()
+        _pending += 1
+
+    def submit():
+        _executor_for(app).submit(_run, app, job_id)
+
+    if delay:
+        timer = threading.Timer(delay, submit)
+        timer.daemon = True
+        timer.start()
+    else:
+        submit()
+
+
+def _run(app, job_id):
+    global _pending
+    try:
+        with app.app_context():
+            _process(app, job_id)
+    except Exception:
+        logger.exception("PDF job %s crashed", job_id)
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def _set_status(job, status, **values):
+    job.status = status
+    job.updated_at = _utcnow()
+    for name, value in values.items():
+        setattr(job, name, value)
+    db.session.commit()
+
+
+def _process(app, job_id):
+    claimed = db.session.execute(
+        db.update(PdfJob)
+        .where(PdfJob.id == job_id, PdfJob.status == "queued")
+        .values(status="running", attempts=PdfJob.attempts + 1, updated_at=_utcnow())
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        return  # Finished, or already running elsewhere.
+
+    job = db.session.get(PdfJob, job_id)
+    student = db.session.get(StudentDetails, job.student_id)
+    firm = db.session.get(ConsultancyFirm, job.firm_id) if job.firm_id else None
+    try:
+        cookies = render_cookies(job.requester_role, job.requester_id)
+        _path, etag = get_report_pdf(student, job.kind, job.page_url, firm, cookies)
+    except PdfRenderError as exc:
+        if job.attempts >= app.config["PDF_JOB_MAX_ATTEMPTS"]:
+            logger.error("PDF job %s failed after %s attempts: %s", job_id, job.attempts, exc)
+            _set_status(job, "failed", error=str(exc)[:500])
+            return
+        _set_status(job, "queued", error=str(exc)[:500])
+        delay = app.config["PDF_JOB_RETRY_DELAY"] * 2 ** (job.attempts - 1)
+        try:
+            _dispatch(app, job_id, delay)
+        except JobQueueFull:
+            pass  # Picked up again once it goes stale.
+        return
+    except Exception:
+        logger.exception("PDF job %s failed", job_id)
+        _set_status(job, "failed", error="Internal error")
+        return
+
+    _set_status(job, "done", etag=etag, error=None)
+
+
+def create_job(student, kind, page_url, firm, requester_role, requester_id):
+    """Queue a render of ``student``'s ``kind`` report and return its job.
+
+    An active job for the same report and requester is returned instead of
+    queueing a duplicate; a report that is already cached gives a job that
+    is done straight away.
+
+    Raises:
+        JobQueueFull: If this process already has too many pending jobs.
+    """
+    firm_id = firm.id if firm else None
+    existing = PdfJob.query.filter(
+        PdfJob.student_id == student.id,
+        PdfJob.kind == kind,
+        PdfJob.firm_id == firm_id,
+        PdfJob.requester_role == requester_role,
+        PdfJob.requester_id == requester_id,
+        PdfJob.status.in_(ACTIVE_STATUSES),
+    ).first()
+    if existing is not None:
+        return refresh_job(existing)
+
+    app = current_app._get_current_object()
+    with _lock:
+        if _pending >= app.config["PDF_JOB_MAX_PENDING"]:
+            raise JobQueueFull()
+
+    job = PdfJob(
+        id=uuid.uuid4().hex,
+        student_id=student.id,
+        kind=kind,
+        firm_id=firm_id,
+        requester_role=requester_role,
+        requester_id=requester_id,
+        page_url=page_url,
+        status="queued",
+        attempts=0,
+        updated_at=_utcnow(),
+    )
+    path, etag = report_key(student, kind, firm)
+    if os.path.exists(path):
+        job.status = "done"
+        job.etag = etag
+    db.session.add(job)
+    db.session.commit()
+
+    if job.status == "queued":
+        try:
+            _dispatch(app, job.id)
+        except JobQueueFull:
+            pass  # Picked up again once it goes stale.
+    return job
+
+
+def refresh_job(job):
+    """Dispatch ``job`` again if it has been queued or running for too long."""
+    if job.status not in ACTIVE_STATUSES:
+        return job
+    app = current_app._get_current_object()
+    stale_before = _utcnow() - timedelta(seconds=app.config["PDF_JOB_STALE_SECONDS"])
+    if job.updated_at > stale_before:
+        return job
+
+    requeued = db.session.execute(
+        db.update(PdfJob)
+        .where(
+            PdfJob.id == job.id,
+            PdfJob.status == job.status,
+            PdfJob.updated_at == job.updated_at,
+        )
+        .values(status="queued", updated_at=_utcnow())
+    ).rowcount
+    db.session.commit()
+    if requeued:
+        logger.warning("Re-dispatching stale PDF job %s", job.id)
+        try:
+            _dispatch(app, job.id)
+        except JobQueueFull:
+            pass
+    db.session.refresh(job)
+    return job
+
+
+def job_payload(job, download_url=None):
+    """Return the JSON description of a job."""
+    payload = {
+        "job_id": job.id,
+        "student_id": job.student_id,
+        "type": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+    }
+    if job.status == "failed":
+        payload["error"] = job.error
+    if job.status == "done" and download_url:
+        payload["download_url"] = download_url
+    return payload
@@ -0,0 +1,345 @@
+"""In-memory views of the aptitude question banks.
+
+Serving a test used to cost one ``SELECT DISTINCT category`` plus one
+``ORDER BY RAND() LIMIT 30`` per category - a full sort of the bank for
+every category on every page load.  Instead, the id lists per category are
+loaded once (:class:`CategoryIndex`) and random draws are made in Python.
+
+Text questions (``/aptitudetextgetquestion``) are drawn per student with a
+seed derived from the student id and bank version, so a reload yields the
+same questions without storing anything, and only the chosen ids are
+fetched with one ``IN`` query.
+
+For the image/text bank behind ``/aptitudegetquestion`` a fixed pool of
+pre-shuffled test forms is generated from the index.  Each student is
+assigned one form, and the serialised JSON of every form is built once
+(image URLs are host-relative) and served with an ETag, so repeat loads
+cost neither a query nor a re-serialisation.
+
+Grading uses the :class:`AnswerKey` (question id -> correct option and
+category, plus the number of questions per category), loaded once per bank
+version instead of being re-read on every submission.
+
+Indexes re-check a version made of ``COUNT``/``MAX(id)`` and content
+checksums over each row's category and correct option at most every
+``QUESTION_BANK_CHECK_SECONDS``, so edits made directly in the database
+(re-categorised questions, corrected answers) are picked up by every
+worker.  Question rows inserted, updated or deleted through the ORM reset
+everything at once when the session commits, and
+:func:`invalidate_question_banks` resets the current process explicitly.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import NamedTuple
+
+from flask import current_app, url_for
+
+from extensions import db
+from models.assessment import AptitudeAllQuestions, AptitudeTextQuestions
+from services.cache import content_checksum, invalidate_on_commit, register_cache
+
+QUESTIONS_PER_CATEGORY = 30
+
+_IMAGE_FIELDS = (
+    ("question_image_url", "question_image"),
+    ("option_a_image_url", "option_a_image"),
+    ("option_b_image_url", "option_b_image"),
+    ("option_c_image_url", "option_c_image"),
+    ("option_d_image_url", "option_d_image"),
+)
+
+
+class CategoryIndex:
+    """Per-category id lists for one question table, refreshed on change."""
+
+    def __init__(self, name, model, category_column):
+        self.name = name
+        self.model = model
+        self.category_column = category_column
+        self._lock = threading.Lock()
+        self._version = None
+        self._ids = None
+        self._checked_at = 0.0
+        self.stats = register_cache(
+            name, extra=lambda: {"version": self._version, "loaded": self._ids is not None}
+        )
+
+    def _fetch_version(self):
+        """Return ``(count, max_id, category checksum, answer checksum)``."""
+        count, max_id, categories, answers = db.session.execute(
+            db.select(
+                db.func.count(self.model.id),
+                db.func.max(self.model.id),
+                content_checksum(self.model.id, self.category_column),
+                content_checksum(self.model.id, self.model.correct_option),
+            )
+        ).one()
+        return int(count), int(max_id or 0), int(categories), int(answers)
+
+    def _load(self):
+        ids = {}
+        rows = db.session.execute(
+            db.select(self.model.id, self.category_column).order_by(self.model.id)
+        )
+        for question_id, category in rows:
+            ids.setdefault(category, []).append(question_id)
+        return {category: tuple(values) for category, values in ids.items()}
+
+    def get(self):
+        """Return ``(version, {category: (id, ...)})``, reloading if stale."""
+        interval = current_app.config.get("QUESTION_BANK_CHECK_SECONDS", 300)
+        if self._ids is not None and time.monotonic() - self._checked_at < interval:
+            self.stats.hit()
+            return self._version, self._ids
+
+        with self._lock:
+            if self._ids is not None and time.monotonic() - self._checked_at < interval:
+                self.stats.hit()
+                return self._version, self._ids
+
+            version = self._fetch_version()
+            self._checked_at = time.monotonic()
+            if self._ids is not None and version == self._version:
+                self.stats.hit()
+                return self._version, self._ids
+
+            self.stats.miss()
+            self._ids = self._load()
+            self._version = version
+            self.stats.loaded()
+            return self._version, self._ids
+
+    def invalidate(self):
+        with self._lock:
+            self._ids = None
+            self._version = None
+            self._checked_at = 0.0
+        self.stats.invalidated()
+
+
+def _draw_version(version):
+    """The part of an index version random draws are seeded with.
+
+    Correcting an answer changes the version (so the answer key reloads)
+    but leaves the id lists alone; students keep the questions they drew.
+    """
+    return version[:3]
+
+
+aptitude_index = CategoryIndex(
+    "aptitude_question_index", AptitudeAllQuestions, AptitudeAllQuestions.category
+)
+text_index = CategoryIndex(
+    "aptitude_text_question_index",
+    AptitudeTextQuestions,
+    AptitudeTextQuestions.aptitudecategory,
+)
+
+
+def sample_text_questions(student_id):
+    """Return ``{category: [question dict, ...]}`` drawn for ``student_id``.
+
+    The draw is seeded by the student and the bank version, so the same
+    student sees the same questions until the bank changes.
+    """
+    version, ids_by_category = text_index.get()
+    rng = random.Random(f"{_draw_version(version)}:student:{student_id}")
+    drawn = {
+        category: rng.sample(ids, min(QUESTIONS_PER_CATEGORY, len(ids)))
+        for category, ids in ids_by_category.items()
+    }
+
+    wanted = [question_id for ids in drawn.values() for question_id in ids]
+    if not wanted:
+        return {}
+    questions = {
+        q.id: q
+        for q in AptitudeTextQuestions.query.filter(AptitudeTextQuestions.id.in_(wanted))
+    }
+    return {
+        category: [questions[question_id].to_dict() for question_id in ids if question_id in questions]
+        for category, ids in drawn.items()
+    }
+
+
+class AnswerKey(NamedTuple):
+    """Grading data for the aptitude bank at one version."""
+
+    version: tuple
+    # {question_id: (correct_option, category)}
+    questions: MappingProxyType
+    # {lower-cased category: number of questions}
+    category_counts: MappingProxyType
+
+    def expected_count(self, category):
+        """Return the number of questions in ``category`` (case-insensitive)."""
+        return self.category_counts.get((category or "").lower(), 0)
+
+
+_answer_key = None
+_answer_key_lock = threading.Lock()
+_answer_key_stats = register_cache(
+    "aptitude_answer_key",
+    extra=lambda: {"size": len(_answer_key.questions) if _answer_key else 0},
+)
+
+
+def _load_answer_key(version):
+    questions = {}
+    category_counts = {}
+    rows = db.session.execute(
+        db.select(
+            AptitudeAllQuestions.id,
+            AptitudeAllQuestions.correct_option,
+            AptitudeAllQuestions.category,
+        )
+    )
+    for question_id, correct_option, category in rows:
+        questions[question_id] = (correct_option, category)
+        key = category.lower()
+        category_counts[key] = category_counts.get(key, 0) + 1
+    return AnswerKey(
+        version, MappingProxyType(questions), MappingProxyType(category_counts)
+    )
+
+
+def get_answer_key():
+    """Return the :class:`AnswerKey` for the current aptitude bank."""
+    global _answer_key
+
+    version, _ids = aptitude_index.get()
+    answer_key = _answer_key
+    if answer_key is not None and answer_key.version == version:
+        _answer_key_stats.hit()
+        return answer_key
+
+    with _answer_key_lock:
+        if _answer_key is None or _answer_key.version != version:
+            _answer_key_stats.miss()
+            _answer_key = _load_answer_key(version)
+            _answer_key_stats.loaded()
+        else:
+            _answer_key_stats.hit()
+        return _answer_key
+
+
+# Serialised forms: {(bank_version, form_id): (body, etag)}, at most
+# form_pool_size() entries
+_forms = OrderedDict()
+_forms_lock = threading.Lock()
+_form_stats = register_cache("aptitude_forms", extra=lambda: {"size": len(_forms)})
+
+
+def form_pool_size():
+    return max(1, current_app.config.get("APTITUDE_FORM_POOL_SIZE", 16))
+
+
+def assign_form(student_id=None):
+    """Return the form id for ``student_id`` (a random one for anonymous users).
+
+    The assignment is stable, so a student reloading the page gets the
+    same form back.
+    """
+    size = form_pool_size()
+    if student_id is None:
+        return random.randrange(size)
+    return student_id % size
+
+
+def _draw_form(version, ids_by_category, form_id):
+    """Pick up to 30 shuffled ids per category, reproducibly for this form."""
+    rng = random.Random(f"{_draw_version(version)}:{form_id}")
+    return {
+        category: rng.sample(ids, min(QUESTIONS_PER_CATEGORY, len(ids)))
+        for category, ids in ids_by_category.items()
+    }
+
+
+def _serialise_question(q):
+    data = {
+        "id": q.id,
+        "question_text": q.question_text,
+        "option_a_text": q.option_a_text,
+        "option_b_text": q.option_b_text,
+        "option_c_text": q.option_c_text,
+        "option_d_text": q.option_d_text,
+        "category": q.category,
+    }
+    for key, column in _IMAGE_FIELDS:
+        filename = getattr(q, column)
+        data[key] = (
+            url_for("static", filename=filename) if filename else None
+        )
+    return data
+
+
+def _build_form(version, ids_by_category, form_id):
+    drawn = _draw_form(version, ids_by_category, form_id)
+    wanted = [question_id for ids in drawn.values() for question_id in ids]
+    questions = {
+        q.id: q
+        for q in AptitudeAllQuestions.query.filter(AptitudeAllQuestions.id.in_(wanted))
+    }
+    payload = {
+        "form_id": form_id,
+        "questions_by_category": {
+            category: [
+                _serialise_question(questions[question_id])
+                for question_id in ids
+                if question_id in questions
+            ]
+            for category, ids in drawn.items()
+        },
+    }
+    body = current_app.json.dumps(payload)
+    etag = hashlib.sha1(body.encode()).hexdigest()
+    return body, etag
+
+
+def get_aptitude_form(form_id):
+    """Return ``(json_body, etag)`` for a form, building it on first use."""
+    version, ids_by_category = aptitude_index.get()
+    key = (version, form_id)
+    cached = _forms.get(key)
+    if cached is not None:
+        _form_stats.hit()
+        return cached
+
+    with _forms_lock:
+        cached = _forms.get(key)
+        if cached is not None:
+            _form_stats.hit()
+            return cached
+        _form_stats.miss()
+        # Forms of an older bank version are never served again.
+        for stale in [k for k in _forms if k[0] != version]:
+            del _forms[stale]
+        _forms[key] = _build_form(version, ids_by_category, form_id)
+        while len(_forms) > form_pool_size():
+            _forms.popitem(last=False)
+        _form_stats.loaded()
+        return _forms[key]
+
+
+def invalidate_question_banks():
+    """Drop every cached index, answer key and form (call after editing question tables)."""
+    global _answer_key
+
+    aptitude_index.invalidate()
+    text_index.invalidate()
+    with _answer_key_lock:
+        _answer_key = None
+    _answer_key_stats.invalidated()
+    with _forms_lock:
+        _forms.clear()
+    _form_stats.invalidated()
+
+
+invalidate_on_commit(
+    [AptitudeAllQuestions, AptitudeTextQuestions], invalidate_question_banks
+)
@@ -0,0 +1,55 @@
+"""Report page data bundles.
+
+Everything a report page shows, built once on the server.  Bundles are
+served by ``/api/v1/reports/<kind>/<id>`` and, in the PDF render mode
+(``?embed=1``), embedded into the report page itself so headless Chromium
+renders it without a single XHR.
+"""
+
+from flask import request
+
+from extensions import db
+from models.student import StudentDetails
+from services.report_cache import cached_result
+from services.scoring import get_aptitude_bundle, get_career_bundle
+
+EMBED_ARG = "embed"
+
+
+def _career_bundle(student_id):
+    return cached_result("career_bundle", student_id, lambda: get_career_bundle(student_id))
+
+
+# kind -> (builder, error when the builder has nothing to show)
+_BUILDERS = {
+    "career": (_career_bundle, "Student not found or no responses recorded"),
+    "aptitude": (get_aptitude_bundle, "No responses found"),
+}
+
+
+def get_report_bundle(student_id, kind):
+    """Return the ``kind`` report bundle for a student.
+
+    The bundle always has ``student_id``; it has ``name`` when the student
+    exists and ``error`` instead of the report data when there is nothing
+    to show.
+    """
+    student = db.session.get(StudentDetails, student_id)
+    if student is None:
+        return {"student_id": student_id, "error": "Student not found"}
+
+    build, missing = _BUILDERS[kind]
+    bundle = {"student_id": student_id, "name": f"{student.first_name} {student.last_name}"}
+    data = build(student_id)
+    if data is None:
+        bundle["error"] = missing
+    else:
+        bundle.update(data)
+    return bundle
+
+
+def embedded_bundle(student_id, kind):
+    """Return the bundle to embed in a report page, or None outside render mode."""
+    if request.args.get(EMBED_ARG) != "1":
+        return None
+    return get_report_bundle(student_id, kind)
@@ -0,0 +1,152 @@
+"""Memoised per-student career results.
+
+``/get_career_scores/<id>`` and ``/career_report/<id>`` used to be
+recomputed from raw responses on every view, including every PDF render,
+although a finished test never changes.  Results are now kept in a
+bounded LRU keyed by ``(kind, student_id)`` and tagged with a version:
+a hash of the student's response set (``COUNT``/``MAX(id)``/``SUM(weight)``
+in one indexed query) plus the career mapping and report content versions.
+A stale entry is simply rebuilt, so the cache stays correct across worker
+processes; :func:`invalidate_student_reports` also frees entries eagerly
+when responses are added or reset.
+
+With ``CAREER_REPORT_PERSIST`` enabled, results are also written to
+``stored_career_reports`` (see ``migrations/008_create_stored_career_reports.sql``)
+and survive restarts.  They are written in a session of their own, so
+serving a report never commits (or rolls back) the request's session.
+``CAREER_REPORT_CACHE_SIZE`` bounds the in-memory entries.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models.assessment import StudentCareerResponse
+from models.report import StoredCareerReport
+from services.cache import register_cache
+from services.career_mappings import career_mappings_version
+from services.report_content import report_content_version
+from services.upserts import insert_or_update
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # (kind, student_id) -> (version, payload)
+
+_stats = register_cache("career_reports", extra=lambda: {"size": len(_entries)})
+
+
+def response_version(student_id):
+    """Return a version string for a student's career results."""
+    count, max_id, weight_sum = db.session.execute(
+        db.select(
+            db.func.count(StudentCareerResponse.id),
+            db.func.max(StudentCareerResponse.id),
+            db.func.sum(StudentCareerResponse.response_weight),
+        ).where(StudentCareerResponse.student_id == student_id)
+    ).one()
+    parts = (
+        (int(count), int(max_id or 0), int(weight_sum or 0)),
+        career_mappings_version(),
+        report_content_version(),
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _persist_enabled():
+    return current_app.config.get("CAREER_REPORT_PERSIST", False)
+
+
+def _remember(key, version, payload):
+    max_size = current_app.config.get("CAREER_REPORT_CACHE_SIZE", 2000)
+    with _lock:
+        _entries[key] = (version, payload)
+        _entries.move_to_end(key)
+        while len(_entries) > max_size:
+            _entries.popitem(last=False)
+
+
+def _load_stored(kind, student_id, version):
+    stored = db.session.get(StoredCareerReport, (student_id, kind))
+    if stored is None or stored.version != version:
+        return None
+    return json.loads(stored.payload)
+
+
+def _store(kind, student_id, version, payload):
+    row = {
+        "student_id": student_id,
+        "kind": kind,
+        "version": version,
+        "payload": json.dumps(payload),
+    }
+    with Session(db.engine) as session:
+        try:
+            if not insert_or_update(
+                StoredCareerReport.__table__,
+                [row],
+                key_columns=("student_id", "kind"),
+                update_columns=("version", "payload"),
+                session=session,
+            ):
+                session.merge(StoredCareerReport(**row))
+            session.commit()
+        except IntegrityError:
+            # Another worker stored the same result first.
+            session.rollback()
+            logger.info("%s for student %s was stored concurrently", kind, student_id)
+        except Exception:
+            # Persisting is an optimisation; the computed result is still served.
+            session.rollback()
+            logger.exception("Could not persist %s for student %s", kind, student_id)
+
+
+def cached_result(kind, student_id, build):
+    """Return ``build()`` for a student, memoised per response-set version.
+
+    ``build`` returns a JSON-serialisable payload, or None when there is
+    nothing to show (None is never cached).
+    """
+    key = (kind, student_id)
+    version = response_version(student_id)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            _entries.move_to_end(key)
+            _stats.hit()
+            return entry[1]
+
+    _stats.miss()
+    persist = _persist_enabled()
+    payload = _load_stored(kind, student_id, version) if persist else None
+    if payload is None:
+        payload = build()
+        if payload is None:
+            return None
+        if persist:
+            _store(kind, student_id, version, payload)
+
+    _remember(key, version, payload)
+    _stats.loaded()
+    return payload
+
+
+def invalidate_student_reports(student_id):
+    """Forget every cached result for a student.
+
+    Stored rows are deleted in the caller's transaction (commit it).
+    """
+    with _lock:
+        for key in [k for k in _entries if k[1] == student_id]:
+            del _entries[key]
+    _stats.invalidated()
+    if _persist_enabled():
+        StoredCareerReport.query.filter_by(student_id=student_id).delete()
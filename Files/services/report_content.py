@@ -0,0 +1,158 @@
+"""Static career report content, indexed once and shared.
+
+The career report combines the top scoring fields with five JSON files
+shipped next to the app (``career_fields.json``,
+``career_field_checklists.json``, ``career_supporting.json``,
+``D_A_level.json`` and ``D_IB_level.json``).  They used to be opened and
+parsed on every request, relative to the working directory, and the
+A-level/IB lists were scanned linearly per field.
+
+:func:`get_report_content` parses them once into a :class:`ReportContent`
+keyed by lower-cased field name, and re-parses when any file's mtime
+changes.  Paths are resolved against the application root.  The loaded
+content is shared between requests and must be treated as read-only.
+"""
+
+import json
+import os
+import threading
+from typing import NamedTuple
+
+from flask import current_app
+
+from services.cache import register_cache
+
+REPORT_FILES = (
+    "career_fields.json",
+    "career_field_checklists.json",
+    "career_supporting.json",
+    "D_A_level.json",
+    "D_IB_level.json",
+)
+
+
+class FieldContent(NamedTuple):
+    """Everything the report shows for one career field."""
+
+    description: str
+    careers: list
+    checklist: list
+    # ((supporting subject name, description), ...) in file order
+    supporting: tuple
+    a_level_subjects: dict
+    ib_level_subjects: dict
+
+
+EMPTY_FIELD = FieldContent("", [], [], (), {}, {})
+
+
+class ReportContent:
+    """Report content for every career field, keyed by lower-cased name."""
+
+    def __init__(self, career_fields, checklists, supporting, a_level, ib_level):
+        def by_name(mapping):
+            index = {}
+            for name, value in mapping.items():
+                index.setdefault(name.lower(), value)
+            return index
+
+        def by_career_area(entries):
+            index = {}
+            for entry in entries:
+                index.setdefault(entry["Career Area"].lower(), entry)
+            return index
+
+        careers = by_name(career_fields)
+        checklists = by_name(checklists)
+        supporting = by_name(supporting)
+        a_level = by_career_area(a_level)
+        ib_level = by_career_area(ib_level)
+
+        self.fields = {}
+        for key in set(careers) | set(checklists) | set(supporting) | set(a_level) | set(ib_level):
+            field_careers = careers.get(key, [])
+            self.fields[key] = FieldContent(
+                description=field_careers[0].get("description", "") if field_careers else "",
+                careers=field_careers,
+                checklist=checklists.get(key, []),
+                supporting=tuple(supporting.get(key, {}).items()),
+                a_level_subjects=a_level.get(key, {}),
+                ib_level_subjects=ib_level.get(key, {}),
+            )
+
+    def field(self, name):
+        """Return the :class:`FieldContent` for ``name`` (case-insensitive)."""
+        return self.fields.get(name.lower(), EMPTY_FIELD)
+
+
+_lock = threading.Lock()
+_content = None
+_mtimes = None
+
+_stats = register_cache(
+    "report_content",
+    extra=lambda: {"fields": len(_content.fields) if _content else 0},
+)
+
+
+def _paths():
+    return [os.path.join(current_app.root_path, name) for name in REPORT_FILES]
+
+
+def _load(paths):
+    data = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data.append(json.load(f))
+    career_fields, checklists, supporting, a_level, ib_level = data
+    return ReportContent(
+        career_fields["career_fields"],
+        checklists["career_field_checklists"],
+        supporting,
+        a_level,
+        ib_level,
+    )
+
+
+def get_report_content():
+    """Return the shared ReportContent, re-reading the files if they changed."""
+    global _content, _mtimes
+
+    paths = _paths()
+    mtimes = tuple(os.stat(path).st_mtime_ns for path in paths)
+    content = _content
+    if content is not None and mtimes == _mtimes:
+        _stats.hit()
+        return content
+
+    with _lock:
+        if _content is None or mtimes != _mtimes:
+            _stats.miss()
+            _content = _load(paths)
+            _mtimes = mtimes
+            _stats.loaded()
+        else:
+            _stats.hit()
+        return _content
+
+
+def report_content_version():
+    """Return the file mtimes the current content was loaded from."""
+    get_report_content()
+    return _mtimes
+
+
+_supporting_index = (None, {})
+
+
+def supporting_ids_by_name(mappings):
+    """Return ``{lower-cased supporting subject name: id}`` for a mapping snapshot."""
+    global _supporting_index
+
+    snapshot, index = _supporting_index
+    if snapshot is not mappings:
+        index = {}
+        for sup_id, name in mappings.supporting_subject_names_dict.items():
+            index.setdefault(name.lower(), sup_id)
+        _supporting_index = (mappings, index)
+    return index
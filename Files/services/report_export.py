@@ -0,0 +1,139 @@
+"""Bulk report export as a streamed ZIP of PDFs.
+
+Reports are taken from :mod:`services.pdf_cache` and only rendered on a
+miss, by a bounded thread pool (``PDF_EXPORT_WORKERS``) running in the
+background while finished files are already being streamed.  The ZIP is
+written with :mod:`zipfile` to a non-seekable sink, which makes zipfile
+use data descriptors, and drained after every chunk, so at most one file
+chunk is held in memory however large the export.
+
+Pages are rendered with a short-lived access token minted for the
+requesting firm admin (:func:`services.pdf_cache.render_cookies`), never
+with the cookies of the request that started the export.
+
+Every finished report is announced on Socket.IO as ``report_export_progress``.
+"""
+
+import json
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from werkzeug.utils import secure_filename
+
+from extensions import db, socketio
+from models.consultancy import ConsultancyFirm
+from models.student import StudentDetails
+from services.pdf_cache import PdfRenderError, get_report_pdf, render_cookies
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ZipSink:
+    """Write-only, non-seekable file object that buffers until drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _render(app, student_id, kind, page_url, firm_id, requester_id):
+    with app.app_context():
+        student = db.session.get(StudentDetails, student_id)
+        firm = db.session.get(ConsultancyFirm, firm_id) if firm_id else None
+        # Minted per render, so the token outlives only this render.
+        cookies = render_cookies("firm_admin", requester_id)
+        path, _etag = get_report_pdf(student, kind, page_url, firm, cookies)
+        return path
+
+
+def stream_report_zip(app, reports, firm_id, requester_id, export_id, room, skipped=()):
+    """Yield a ZIP archive of rendered reports, chunk by chunk.
+
+    ``reports`` is a list of ``(student_id, student_name, kind, page_url)``,
+    rendered as the firm admin ``requester_id``.  Reports that cannot be
+    rendered, and the ``skipped`` entries (``{"student_id", "type",
+    "error"}`` dicts), are listed in ``errors.json`` at the end of the
+    archive.  Progress is emitted to the Socket.IO ``room``; its ``failed``
+    count covers render failures only, ``skipped`` the entries not
+    attempted.
+    """
+    total = len(reports)
+    done = 0
+    failed = 0
+    errors = list(skipped)
+    skipped_count = len(errors)
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+
+    executor = ThreadPoolExecutor(
+        max_workers=app.config["PDF_EXPORT_WORKERS"],
+        thread_name_prefix="pdf-export",
+    )
+    try:
+        futures = {
+            executor.submit(_render, app, student_id, kind, page_url, firm_id, requester_id):
+                (student_id, name, kind)
+            for student_id, name, kind, page_url in reports
+        }
+        for future in as_completed(futures):
+            student_id, name, kind = futures[future]
+            error = src = None
+            try:
+                path = future.result()
+            except PdfRenderError as exc:
+                error = str(exc)
+            except Exception:
+                logger.exception("Export render failed for student %s (%s)", student_id, kind)
+                error = "Internal error"
+            else:
+                try:
+                    src = open(path, "rb")
+                except FileNotFoundError:
+                    # Invalidated (new responses, a reset) since it was rendered.
+                    error = "Report changed during the export; export it again"
+            if src is not None:
+                arcname = f"{secure_filename(name) or 'student'}_{student_id}_{kind}.pdf"
+                with src, archive.open(arcname, "w") as dest:
+                    while chunk := src.read(CHUNK_SIZE):
+                        dest.write(chunk)
+                        yield sink.drain()
+            if error is not None:
+                failed += 1
+                errors.append({"student_id": student_id, "type": kind, "error": error})
+
+            done += 1
+            socketio.emit(
+                "report_export_progress",
+                {
+                    "export_id": export_id,
+                    "done": done,
+                    "total": total,
+                    "failed": failed,
+                    "skipped": skipped_count,
+                    "student_id": student_id,
+                    "type": kind,
+                },
+                room=room,
+            )
+
+        if errors:
+            archive.writestr("errors.json", json.dumps(errors, indent=2))
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Also reached when the client disconnects mid-download.
+        executor.shutdown(wait=False, cancel_futures=True)
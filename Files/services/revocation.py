@@ -0,0 +1,153 @@
+"""JWT revocation (logout) shared by every worker.
+
+Revoked tokens used to live in ``app.BLOCKLIST``, an in-process set that
+grew forever and was not shared: a token revoked in one worker stayed
+valid in the others.  Revoked ``jti`` values are now stored in
+``revoked_tokens`` (see ``migrations/011_create_revoked_tokens.sql``)
+together with the token's expiry.
+
+Each worker keeps the unexpired revoked jtis in memory, so checking a
+token costs no database round trip.  At most every
+``TOKEN_REVOCATION_SYNC_SECONDS`` one indexed query pulls the rows
+revoked since the last sync by any worker; a token revoked elsewhere is
+rejected here within that interval, and at once in the worker that
+revoked it.
+
+The check runs for every authenticated request, so it only reads, on a
+connection of its own: the request's session is never touched.
+
+Entries are pruned once the token's ``exp`` passes (an expired token is
+rejected on its ``exp`` claim before the revocation check): from memory
+on every sync, from the table by :func:`prune_revoked_tokens` - run on
+logout at most every ``TOKEN_REVOCATION_PRUNE_SECONDS``, in its own
+transaction, and available as ``flask prune-revoked-tokens``.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from extensions import db
+from models.auth import RevokedToken
+from services.cache import register_cache
+from services.upserts import insert_ignoring_duplicates
+
+logger = logging.getLogger(__name__)
+
+# Rows are pulled from slightly before the newest revocation seen, so a
+# revocation committed late (or stamped by a worker with a lagging clock)
+# is not missed.
+_SYNC_OVERLAP = timedelta(seconds=60)
+
+_lock = threading.Lock()
+_revoked = {}  # jti -> expires_at (naive UTC)
+_high_water = None  # newest revoked_at seen
+_synced_at = None
+_pruned_at = None
+
+_stats = register_cache("token_revocation", extra=lambda: {"size": len(_revoked)})
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _expires_at(jwt_payload):
+    return datetime.fromtimestamp(jwt_payload["exp"], timezone.utc).replace(tzinfo=None)
+
+
+def _sync():
+    """Pull new revocations and drop expired ones.  Call with ``_lock`` held."""
+    global _high_water
+
+    now = _utcnow()
+    query = db.select(
+        RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at
+    ).where(RevokedToken.expires_at > now)
+    if _high_water is not None:
+        query = query.where(RevokedToken.revoked_at >= _high_water - _SYNC_OVERLAP)
+
+    _stats.miss()
+    with db.engine.connect() as connection:
+        rows = connection.execute(query).all()
+    for jti, expires_at, revoked_at in rows:
+        _revoked[jti] = expires_at
+        if _high_water is None or revoked_at > _high_water:
+            _high_water = revoked_at
+    _stats.loaded()
+
+    expired = [jti for jti, expires_at in _revoked.items() if expires_at <= now]
+    for jti in expired:
+        del _revoked[jti]
+
+
+def prune_revoked_tokens():
+    """Delete rows of tokens that have expired; return how many went.
+
+    Runs in its own transaction, independent of ``db.session``.
+    """
+    global _pruned_at
+
+    _pruned_at = time.monotonic()
+    with db.engine.begin() as connection:
+        deleted = connection.execute(
+            db.delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow())
+        ).rowcount
+    _stats.invalidated()
+    return deleted
+
+
+def _prune_if_due():
+    interval = current_app.config.get("TOKEN_REVOCATION_PRUNE_SECONDS", 3600)
+    if _pruned_at is not None and time.monotonic() - _pruned_at < interval:
+        return
+    try:
+        prune_revoked_tokens()
+    except Exception:
+        # Only costs table space; retried after the interval.
+        logger.exception("Could not prune revoked tokens")
+
+
+def is_token_revoked(jwt_payload):
+    """Return True if the token has been revoked (logged out)."""
+    global _synced_at
+
+    interval = current_app.config.get("TOKEN_REVOCATION_SYNC_SECONDS", 5)
+    if _synced_at is None or time.monotonic() - _synced_at >= interval:
+        with _lock:
+            if _synced_at is None or time.monotonic() - _synced_at >= interval:
+                try:
+                    _sync()
+                except Exception:
+                    # Keep answering from memory; retried after the interval.
+                    logger.exception("Could not sync revoked tokens")
+                _synced_at = time.monotonic()
+    else:
+        _stats.hit()
+    return jwt_payload["jti"] in _revoked
+
+
+def revoke_token(jwt_payload):
+    """Revoke a decoded token (``get_jwt()``) in every worker.
+
+    Commits ``db.session``, then prunes expired rows if that is due.
+    """
+    jti = jwt_payload["jti"]
+    expires_at = _expires_at(jwt_payload)
+    row = {
+        "jti": jti,
+        "token_type": jwt_payload.get("type", "access"),
+        "expires_at": expires_at,
+        "revoked_at": _utcnow(),
+    }
+    if not insert_ignoring_duplicates(RevokedToken.__table__, [row], ["jti"]):
+        if RevokedToken.query.filter_by(jti=jti).first() is None:
+            db.session.add(RevokedToken(**row))
+    db.session.commit()
+
+    with _lock:
+        _revoked[jti] = expires_at
+    _prune_if_due()
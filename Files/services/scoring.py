@@ -5,18 +5,17 @@ live here — never in frontend JavaScript.
 """
 
 from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
 
 from extensions import db
-from models.assessment import (
-    AptitudeAllQuestions,
-    AptitudeImgResponse,
-    QuestionSubject,
-    QuestionSupportingSubject,
-    StudentCareerResponse,
-    Subject,
-    SupportingSubject,
-)
+from models.assessment import StudentCareerResponse
 from models.student import StudentDetails
+from services.aptitude_summary import get_summary_totals
+from services.career_mappings import get_career_mappings
+from services.report_content import get_report_content, supporting_ids_by_name
+from services.scoring_engine import CareerScoringEngine, get_scoring_engine
 
 
 CATEGORY_MAPPING = {
@@ -31,49 +30,48 @@ CATEGORY_MAPPING = {
 
 
 def load_mappings():
-    """Load question-subject and supporting-subject mappings from the database."""
-    question_subject_dict = {}
-    subject_question_count = {}
-    subject_question_numbers = {}
-
-    for entry in QuestionSubject.query.all():
-        q_num = entry.question_number
-        sub_id = entry.subject_id
-        question_subject_dict.setdefault(q_num, []).append(sub_id)
-        subject_question_count[sub_id] = subject_question_count.get(sub_id, 0) + 1
-        subject_question_numbers.setdefault(sub_id, []).append(q_num)
-
-    question_supporting_subject_dict = {}
-    supporting_subject_question_count = {}
-    supporting_subject_question_numbers = {}
-
-    for entry in QuestionSupportingSubject.query.all():
-        q_num = entry.question_number
-        sup_id = entry.supporting_id
-        question_supporting_subject_dict.setdefault(q_num, []).append(sup_id)
-        supporting_subject_question_count[sup_id] = (
-            supporting_subject_question_count.get(sup_id, 0) + 1
-        )
-        supporting_subject_question_numbers.setdefault(sup_id, []).append(q_num)
+    """Return the shared question-subject / supporting-subject mapping snapshot.
 
-    subject_names_dict = {
-        sub.subject_id: sub.subject_name for sub in Subject.query.all()
-    }
-    supporting_subject_names_dict = {
-        sup.supporting_id: sup.supporting_subject_name
-        for sup in SupportingSubject.query.all()
-    }
+    The snapshot is loaded once per process and reused across requests; see
+    :mod:`services.career_mappings` for how it is kept fresh.
+    """
+    return get_career_mappings()
 
-    return (
-        question_subject_dict,
-        question_supporting_subject_dict,
-        subject_names_dict,
-        subject_question_count,
-        subject_question_numbers,
-        supporting_subject_question_count,
-        supporting_subject_question_numbers,
-        supporting_subject_names_dict,
-    )
+
+def _aptitude_scores_from_totals(totals):
+    """Build the sorted ``{display category: correct}`` dict from category totals."""
+    scores = {category: 0 for category in CATEGORY_MAPPING.values()}
+    for category, _total, correct in totals:
+        mapped_category = CATEGORY_MAPPING.get(category, category)
+        if mapped_category in scores:
+            scores[mapped_category] += correct
+    return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+
+
+def _aptitude_results_from_totals(totals):
+    """Build the per-category results list from category totals."""
+    data = [
+        {
+            "category": CATEGORY_MAPPING.get(category, category),
+            "total": total,
+            "correct": correct,
+        }
+        for category, total, correct in totals
+    ]
+    data.sort(key=lambda x: x['correct'], reverse=True)
+    return data
+
+
+def get_aptitude_totals(student_ids):
+    """Return ``{student_id: [(category, total, correct), ...]}`` for a cohort.
+
+    Served from ``student_aptitude_summary`` (see
+    :mod:`services.aptitude_summary`) with one primary-key lookup.
+    """
+    totals = defaultdict(list)
+    for student_id, category, total, correct in get_summary_totals(student_ids):
+        totals[student_id].append((category, total, correct))
+    return totals
 
 
 def get_aptitude_scores(student_id):
@@ -83,164 +81,306 @@ def get_aptitude_scores(student_id):
         return None
 
     full_name = f"{student.first_name} {student.last_name}"
-    scores = {category: 0 for category in CATEGORY_MAPPING.values()}
-
-    responses = (
-        db.session.query(AptitudeImgResponse.is_correct, AptitudeAllQuestions.category)
-        .join(
-            AptitudeAllQuestions,
-            AptitudeImgResponse.question_id == AptitudeAllQuestions.id,
-        )
-        .filter(AptitudeImgResponse.student_id == student_id)
-        .all()
-    )
-
-    if not responses:
+    totals = get_aptitude_totals([student_id]).get(student_id)
+    if not totals:
         return {"student_id": student_id, "name": full_name, "scores": None}
 
-    for is_correct, category in responses:
-        mapped_category = CATEGORY_MAPPING.get(category, category)
-        if mapped_category in scores:
-            scores[mapped_category] += is_correct
-
-    sorted_scores = dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
-    return {"student_id": student_id, "name": full_name, "scores": sorted_scores}
+    return {
+        "student_id": student_id,
+        "name": full_name,
+        "scores": _aptitude_scores_from_totals(totals),
+    }
 
 
 def get_aptitude_results(student_id):
     """Compute per-category aptitude results (total, correct, accuracy)."""
-    results = (
-        db.session.query(
-            AptitudeAllQuestions.category,
-            db.func.count(AptitudeImgResponse.question_id).label("total_questions"),
-            db.func.sum(
-                db.case((AptitudeImgResponse.is_correct == 1, 1), else_=0)
-            ).label("correct_answers"),
-        )
-        .join(
-            AptitudeImgResponse,
-            AptitudeAllQuestions.id == AptitudeImgResponse.question_id,
-        )
-        .filter(AptitudeImgResponse.student_id == student_id)
-        .group_by(AptitudeAllQuestions.category)
-        .all()
-    )
+    return _aptitude_results_from_totals(get_aptitude_totals([student_id]).get(student_id, []))
 
-    data = [
-        {
-            "category": CATEGORY_MAPPING.get(r[0], r[0]),
-            "total": r[1],
-            "correct": r[2] if r[2] is not None else 0,
-        }
-        for r in results
-    ]
-    data.sort(key=lambda x: x['correct'], reverse=True)
-    return data
 
+def get_aptitude_bundle(student_id):
+    """Compute the aptitude report page's scores and results, or None.
 
-def get_career_scores(student_id):
-    """Compute career interest scores for a student."""
-    (
-        question_subject_dict,
-        question_supporting_subject_dict,
-        subject_names_dict,
-        subject_question_count,
-        subject_question_numbers,
-        supporting_subject_question_count,
-        supporting_subject_question_numbers,
-        supporting_subject_names_dict,
-    ) = load_mappings()
-
-    # Build main subject -> supporting subject mapping
-    main_supporting_subject_map = defaultdict(set)
-    for qid, main_sub_ids in question_subject_dict.items():
-        supporting_ids = question_supporting_subject_dict.get(qid, [])
-        for main_sub in main_sub_ids:
-            main_supporting_subject_map[main_sub].update(supporting_ids)
-    main_supporting_subject_map = {k: list(v) for k, v in main_supporting_subject_map.items()}
-
-    # Fetch student responses
-    student_responses = StudentCareerResponse.query.filter_by(student_id=student_id).all()
-    if not student_responses:
+    Returns ``{"scores": ..., "results": ...}`` (the ``get_aptitude_scores``
+    scores and ``get_aptitude_results`` list) from one totals lookup.
+    """
+    totals = get_aptitude_totals([student_id]).get(student_id)
+    if not totals:
         return None
+    return {
+        "scores": _aptitude_scores_from_totals(totals),
+        "results": _aptitude_results_from_totals(totals),
+    }
 
-    # Score dictionaries
-    subject_scores = {}
-    supporting_subject_scores = {}
 
-    for response in student_responses:
-        question_id = response.question_id
-        weight = response.response_weight
+def fetch_career_responses(student_id):
+    """Return the student's career responses as ``(question_id, weight)`` pairs."""
+    return [
+        tuple(row)
+        for row in db.session.query(
+            StudentCareerResponse.question_id,
+            StudentCareerResponse.response_weight,
+        )
+        .filter(StudentCareerResponse.student_id == student_id)
+        .order_by(StudentCareerResponse.id)
+        .all()
+    ]
 
-        if question_id in question_subject_dict:
-            for subject_id in question_subject_dict[question_id]:
-                subject_scores[subject_id] = subject_scores.get(subject_id, 0) + weight
 
-        if question_id in question_supporting_subject_dict:
-            for supporting_id in question_supporting_subject_dict[question_id]:
-                supporting_subject_scores[supporting_id] = (
-                    supporting_subject_scores.get(supporting_id, 0) + weight
-                )
+TOP_FIELDS = 9
 
-    # Normalize main subjects
-    subject_scores = {
-        sub_id: min((score / (subject_question_count[sub_id] * 2)) * 100, 100)
-        if subject_question_count.get(sub_id, 0) > 0
-        else 0
-        for sub_id, score in subject_scores.items()
-    }
 
-    # Normalize supporting subjects
-    supporting_subject_scores = {
-        sup_id: min(
-            (score / (supporting_subject_question_count[sup_id] * 2)) * 100, 100
-        )
-        if supporting_subject_question_count.get(sup_id, 0) > 0
-        else 0
-        for sup_id, score in supporting_subject_scores.items()
-    }
+class CareerResult(NamedTuple):
+    """One scoring pass over a student's career responses.
 
-    # Build subjects list with overall match score
-    subjects_list = []
-    for sub in subject_scores:
-        if sub in subject_names_dict:
-            main_score = min(round(subject_scores[sub]), 100)
-            related_supporting_ids = main_supporting_subject_map.get(sub, [])
-            related_scores = [
-                supporting_subject_scores.get(sid, 0) for sid in related_supporting_ids
-            ]
-
-            if related_scores:
-                overall_score = round(
-                    (main_score + sum(related_scores)) / (1 + len(related_scores))
-                )
-            else:
-                overall_score = main_score
+    Every career output (the ``get_career_scores`` payload, the report's
+    top fields and supporting scores) is derived from this, so a student's
+    responses are scored exactly once per result.
+    """
+
+    engine: CareerScoringEngine
+    subject_scores: dict              # {subject_id: 0-100}, engine order
+    supporting_subject_scores: dict   # {supporting_id: 0-100}, engine order
+
+    @property
+    def mappings(self):
+        return self.engine.mappings
 
-            subjects_list.append(
+    @property
+    def main_supporting_subject_map(self):
+        return self.engine.main_supporting_subject_map
+
+    def top_fields(self, n=TOP_FIELDS):
+        """Return the ``n`` best scoring subjects as report field dicts."""
+        subject_names_dict = self.mappings.subject_names_dict
+        return sorted(
+            [
                 {
-                    "name": subject_names_dict[sub],
-                    "score": main_score,
-                    "overall_match_score": overall_score,
-                    "total_questions": subject_question_count.get(sub, 0),
-                    "questions": subject_question_numbers.get(sub, []),
+                    "subject_id": sub_id,
+                    "field": subject_names_dict.get(sub_id, "Unknown"),
+                    "score": round(score),
                 }
-            )
-
-    subjects_list.sort(key=lambda x: x["score"], reverse=True)
+                for sub_id, score in self.subject_scores.items()
+                if sub_id in subject_names_dict
+            ],
+            key=lambda x: x["score"],
+            reverse=True,
+        )[:n]
+
+    def scores_payload(self):
+        """Build the ``get_career_scores`` payload."""
+        (
+            _question_subject_dict,
+            _question_supporting_subject_dict,
+            subject_names_dict,
+            subject_question_count,
+            subject_question_numbers,
+            supporting_subject_question_count,
+            supporting_subject_question_numbers,
+            supporting_subject_names_dict,
+        ) = self.mappings
+        subject_scores = self.subject_scores
+        supporting_subject_scores = self.supporting_subject_scores
+        main_supporting_subject_map = self.main_supporting_subject_map
+
+        # Build subjects list with overall match score
+        subjects_list = []
+        for sub in subject_scores:
+            if sub in subject_names_dict:
+                main_score = min(round(subject_scores[sub]), 100)
+                related_supporting_ids = main_supporting_subject_map.get(sub, [])
+                related_scores = [
+                    supporting_subject_scores.get(sid, 0) for sid in related_supporting_ids
+                ]
+
+                if related_scores:
+                    overall_score = round(
+                        (main_score + sum(related_scores)) / (1 + len(related_scores))
+                    )
+                else:
+                    overall_score = main_score
+
+                subjects_list.append(
+                    {
+                        "name": subject_names_dict[sub],
+                        "score": main_score,
+                        "overall_match_score": overall_score,
+                        "total_questions": subject_question_count.get(sub, 0),
+                        "questions": subject_question_numbers.get(sub, []),
+                    }
+                )
 
-    supporting_subjects_list = [
-        {
-            "name": supporting_subject_names_dict[sup],
-            "score": min(round(supporting_subject_scores[sup]), 100),
-            "total_questions": supporting_subject_question_count.get(sup, 0),
-            "questions": supporting_subject_question_numbers.get(sup, []),
+        subjects_list.sort(key=lambda x: x["score"], reverse=True)
+
+        supporting_subjects_list = [
+            {
+                "name": supporting_subject_names_dict[sup],
+                "score": min(round(supporting_subject_scores[sup]), 100),
+                "total_questions": supporting_subject_question_count.get(sup, 0),
+                "questions": supporting_subject_question_numbers.get(sup, []),
+            }
+            for sup in supporting_subject_scores
+            if sup in supporting_subject_names_dict
+        ]
+
+        return {
+            "subjects": subjects_list,
+            "supporting_subjects": supporting_subjects_list,
         }
-        for sup in supporting_subject_scores
-        if sup in supporting_subject_names_dict
-    ]
 
+
+def score_career_responses(responses):
+    """Score ``(question_id, weight)`` pairs with the vectorised engine."""
+    engine = get_scoring_engine()
+    return CareerResult(engine, *engine.score(responses))
+
+
+def compute_career_result(student_id):
+    """Fetch and score a student's career responses (None without responses)."""
+    student_responses = fetch_career_responses(student_id)
+    if not student_responses:
+        return None
+    return score_career_responses(student_responses)
+
+
+def get_career_scores(student_id):
+    """Compute career interest scores for a student."""
+    result = compute_career_result(student_id)
+    return result.scores_payload() if result is not None else None
+
+
+def get_career_report(student_id):
+    """Compute the career report (top fields with report content), or None."""
+    result = compute_career_result(student_id)
+    if result is None:
+        return None
+    return _career_report_from_result(student_id, result)
+
+
+def get_career_bundle(student_id):
+    """Compute everything the career report page shows, or None.
+
+    Returns ``{"scores": <get_career_scores payload>, "report": <get_career_report
+    payload>}`` from a single scoring pass.
+    """
+    result = compute_career_result(student_id)
+    if result is None:
+        return None
     return {
-        "subjects": subjects_list,
-        "supporting_subjects": supporting_subjects_list,
+        "scores": result.scores_payload(),
+        "report": _career_report_from_result(student_id, result),
     }
+
+
+def _career_report_from_result(student_id, result):
+    supporting_scores = result.supporting_subject_scores
+    content = get_report_content()
+    supporting_ids = supporting_ids_by_name(result.mappings)
+
+    # Build final data per top field
+    top_subjects = result.top_fields()
+    for subject in top_subjects:
+        field = content.field(subject["field"])
+        subject["description"] = field.description
+        subject["careers"] = field.careers
+        subject["checklist"] = field.checklist
+        subject["supporting_subjects"] = []
+        subject["a_level_subjects"] = field.a_level_subjects
+        subject["ib_level_subjects"] = field.ib_level_subjects
+
+        for sub_name, description in field.supporting:
+            sup_id = supporting_ids.get(sub_name.lower())
+            score = round(supporting_scores.get(sup_id, 0)) if sup_id else 0
+            subject["supporting_subjects"].append({
+                "subject_id": sup_id,
+                "name": sub_name,
+                "score": score,
+                "description": description,
+            })
+
+    return {"student_id": student_id, "top_fields": top_subjects}
+
+
+def _career_weight_matrix(engine, student_ids):
+    """Load summed career weights for a cohort with one GROUP BY query.
+
+    Returns ``(weights, first_pos, responded)``: weight and first-response
+    arrays (``MIN(id)`` per question, ``inf`` if unanswered) with one row
+    per ``student_ids`` entry in the engine's question order, and a per-row
+    flag for students with any response at all.
+    """
+    row_of = {student_id: i for i, student_id in enumerate(student_ids)}
+    weights = np.zeros((len(student_ids), engine.n_questions), dtype=np.int64)
+    first_pos = np.full(weights.shape, np.inf)
+    responded = np.zeros(len(student_ids), dtype=bool)
+
+    rows = (
+        db.session.query(
+            StudentCareerResponse.student_id,
+            StudentCareerResponse.question_id,
+            db.func.sum(StudentCareerResponse.response_weight),
+            db.func.min(StudentCareerResponse.id),
+        )
+        .filter(StudentCareerResponse.student_id.in_(student_ids))
+        .group_by(StudentCareerResponse.student_id, StudentCareerResponse.question_id)
+        .all()
+    )
+    for student_id, question_id, weight, first_id in rows:
+        row = row_of[student_id]
+        responded[row] = True
+        column = engine.question_index.get(question_id)
+        if column is None:
+            continue
+        weights[row, column] = int(weight or 0)
+        first_pos[row, column] = first_id
+    return weights, first_pos, responded
+
+
+def iter_cohort_scores(student_ids, include=("career", "aptitude"), chunk_size=500):
+    """Yield one result dict per student for a whole cohort.
+
+    Students are processed ``chunk_size`` at a time; each chunk costs one
+    ``IN`` query for names plus one ``IN``/``GROUP BY`` query per response
+    table, and career scores for the chunk come from a single
+    matrix-matrix product.  Each yielded dict has ``student_id`` and
+    ``name`` plus a ``career`` (``get_career_scores`` payload or None) and/or
+    ``aptitude`` (``scores`` and ``results``) entry.  Unknown ids are
+    skipped.
+    """
+    engine = get_scoring_engine() if "career" in include else None
+
+    for start in range(0, len(student_ids), chunk_size):
+        chunk = list(student_ids[start:start + chunk_size])
+        names = {
+            student_id: f"{first_name} {last_name}"
+            for student_id, first_name, last_name in db.session.query(
+                StudentDetails.id, StudentDetails.first_name, StudentDetails.last_name
+            ).filter(StudentDetails.id.in_(chunk))
+        }
+        chunk = [student_id for student_id in chunk if student_id in names]
+        if not chunk:
+            continue
+
+        career = {}
+        if engine is not None:
+            weights, first_pos, responded = _career_weight_matrix(engine, chunk)
+            for i, (subject_scores, supporting_scores) in enumerate(
+                engine.score_batch(weights, first_pos)
+            ):
+                if responded[i]:
+                    career[chunk[i]] = CareerResult(
+                        engine, subject_scores, supporting_scores
+                    ).scores_payload()
+
+        aptitude = get_aptitude_totals(chunk) if "aptitude" in include else {}
+
+        for student_id in chunk:
+            result = {"student_id": student_id, "name": names[student_id]}
+            if engine is not None:
+                result["career"] = career.get(student_id)
+            if "aptitude" in include:
+                totals = aptitude.get(student_id)
+                result["aptitude"] = {
+                    "scores": _aptitude_scores_from_totals(totals) if totals else None,
+                    "results": _aptitude_results_from_totals(totals or []),
+                }
+            yield result
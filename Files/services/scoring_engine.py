@@ -0,0 +1,188 @@
+"""Vectorised career scoring over a precomputed question x subject matrix.
+
+The question -> subject and question -> supporting-subject mappings are
+compiled once per mapping snapshot into dense 0/1 matrices (the bank is a
+few hundred questions by a few dozen subjects, so dense beats sparse here).
+A student's responses become one weight vector and every subject score is
+a single matrix-vector product; :meth:`CareerScoringEngine.score_batch`
+scores many students with one matrix-matrix product.
+
+Results match the original per-response loop exactly: raw sums are integer
+products, normalisation is ``min(score / (count * 2) * 100, 100)``, and the
+returned dicts keep the loop's insertion order (subjects in the order the
+student's responses first touched them, ties broken by subject id).
+"""
+
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from services.career_mappings import get_career_mappings
+
+_lock = threading.Lock()
+_engine = None
+
+
+class _MappingMatrix:
+    """One compiled mapping: question rows x subject columns."""
+
+    def __init__(self, question_index, question_map, question_count):
+        self.ids = np.array(sorted(question_count), dtype=np.int64)
+        column = {sub_id: j for j, sub_id in enumerate(self.ids.tolist())}
+
+        self.matrix = np.zeros((len(question_index), len(self.ids)), dtype=np.int64)
+        for q_num, sub_ids in question_map.items():
+            for sub_id in sub_ids:
+                self.matrix[question_index[q_num], column[sub_id]] += 1
+
+        counts = np.array([question_count[s] for s in self.ids.tolist()], dtype=np.int64)
+        self.denominator = counts * 2
+        # Row indices of the questions mapped to each column, used to find
+        # the first response that touched a subject.
+        self.column_rows = [np.flatnonzero(self.matrix[:, j]) for j in range(len(self.ids))]
+
+    def normalise(self, raw):
+        """Apply ``min(score / (count * 2) * 100, 100)`` column-wise."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(self.denominator > 0, raw / self.denominator * 100, 0.0)
+        return np.minimum(scores, 100)
+
+    def first_touch(self, first_pos):
+        """Return the first response position touching each column.
+
+        ``first_pos`` has shape (..., n_questions); the result has shape
+        (..., n_columns) with ``inf`` for columns the student never touched.
+        """
+        out = np.full(first_pos.shape[:-1] + (len(self.ids),), np.inf)
+        for j, rows in enumerate(self.column_rows):
+            if len(rows):
+                out[..., j] = first_pos[..., rows].min(axis=-1)
+        return out
+
+    def ordered_scores(self, scores, touched_at):
+        """Build ``{id: score}`` in the loop's insertion order for one student."""
+        touched = np.flatnonzero(np.isfinite(touched_at))
+        order = touched[np.lexsort((self.ids[touched], touched_at[touched]))]
+        ids = self.ids[order].tolist()
+        return dict(zip(ids, scores[order].tolist()))
+
+
+class CareerScoringEngine:
+    """Scores career responses against one CareerMappings snapshot."""
+
+    def __init__(self, mappings):
+        self.mappings = mappings
+        question_numbers = sorted(
+            set(mappings.question_subject_dict) | set(mappings.question_supporting_subject_dict)
+        )
+        self.question_numbers = np.array(question_numbers, dtype=np.int64)
+        self.question_index = {q: i for i, q in enumerate(question_numbers)}
+
+        self.subjects = _MappingMatrix(
+            self.question_index,
+            mappings.question_subject_dict,
+            mappings.subject_question_count,
+        )
+        self.supporting = _MappingMatrix(
+            self.question_index,
+            mappings.question_supporting_subject_dict,
+            mappings.supporting_subject_question_count,
+        )
+
+        # Main subject -> supporting subjects that share at least one question
+        main_supporting_subject_map = defaultdict(set)
+        for q_num, main_sub_ids in mappings.question_subject_dict.items():
+            supporting_ids = mappings.question_supporting_subject_dict.get(q_num, ())
+            for main_sub in main_sub_ids:
+                main_supporting_subject_map[main_sub].update(supporting_ids)
+        self.main_supporting_subject_map = {
+            k: list(v) for k, v in main_supporting_subject_map.items()
+        }
+
+    @property
+    def n_questions(self):
+        return len(self.question_numbers)
+
+    def response_vectors(self, responses):
+        """Turn ``(question_id, weight)`` pairs into weight/first-position vectors.
+
+        Duplicate answers for one question are summed, as the loop did.
+        Questions without any mapping are ignored.
+        """
+        weights = np.zeros(self.n_questions, dtype=np.int64)
+        first_pos = np.full(self.n_questions, np.inf)
+        if not responses or not self.n_questions:
+            return weights, first_pos
+
+        pairs = np.asarray(responses, dtype=np.int64).reshape(-1, 2)
+        rows = np.minimum(
+            np.searchsorted(self.question_numbers, pairs[:, 0]), self.n_questions - 1
+        )
+        known = self.question_numbers[rows] == pairs[:, 0]
+
+        np.add.at(weights, rows[known], pairs[known, 1])
+        np.minimum.at(first_pos, rows[known], np.flatnonzero(known).astype(float))
+        return weights, first_pos
+
+    def score(self, responses):
+        """Score one student's ``(question_id, weight)`` responses.
+
+        Returns ``(subject_scores, supporting_scores)`` dicts keyed by id,
+        identical to the normalised dicts the per-response loop produced.
+        """
+        weights, first_pos = self.response_vectors(responses)
+        return self._score_one(weights, first_pos)
+
+    def _score_one(self, weights, first_pos):
+        results = []
+        for mapping in (self.subjects, self.supporting):
+            scores = mapping.normalise(weights @ mapping.matrix)
+            results.append(mapping.ordered_scores(scores, mapping.first_touch(first_pos)))
+        return tuple(results)
+
+    def score_batch(self, weight_matrix, first_pos):
+        """Score many students with one matrix-matrix product per mapping.
+
+        Args:
+            weight_matrix: int array (n_students, n_questions) of summed
+                response weights, columns in ``question_numbers`` order.
+            first_pos: float array of the same shape holding the position
+                of each question's first response (any increasing value,
+                e.g. the response row id), ``inf`` for unanswered questions
+                (a weight of 0 still counts as answered).
+
+        Returns:
+            A list with one ``(subject_scores, supporting_scores)`` tuple per
+            row, ordered as :meth:`score` orders them for the same responses.
+        """
+        weight_matrix = np.asarray(weight_matrix, dtype=np.int64)
+        first_pos = np.asarray(first_pos, dtype=float)
+
+        per_mapping = []
+        for mapping in (self.subjects, self.supporting):
+            scores = mapping.normalise(weight_matrix @ mapping.matrix)
+            per_mapping.append((mapping, scores, mapping.first_touch(first_pos)))
+
+        return [
+            tuple(
+                mapping.ordered_scores(scores[row], touched_at[row])
+                for mapping, scores, touched_at in per_mapping
+            )
+            for row in range(weight_matrix.shape[0])
+        ]
+
+
+def get_scoring_engine():
+    """Return the engine for the current mapping snapshot, compiling if needed."""
+    global _engine
+
+    mappings = get_career_mappings()
+    engine = _engine
+    if engine is not None and engine.mappings is mappings:
+        return engine
+
+    with _lock:
+        if _engine is None or _engine.mappings is not mappings:
+            _engine = CareerScoringEngine(mappings)
+        return _engine
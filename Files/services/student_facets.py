@@ -0,0 +1,64 @@
+"""Short-lived cache of the admin dashboard's student filter facets.
+
+The dashboard's country/curriculum/referral/school/firm dropdowns used to
+be built in the browser from a download of every student.  They are now
+answered by ``GROUP BY`` queries (see ``/api/v1/admin/students/facets``)
+whose results are kept here for ``STUDENT_FACETS_TTL_SECONDS``, keyed by
+the applied filters, in a bounded LRU (``STUDENT_FACETS_CACHE_SIZE``).
+
+Students inserted or deleted through the ORM (registration) and updates
+to a faceted column drop every entry once the session commits.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from models.student import StudentDetails
+from services.cache import invalidate_on_commit, register_cache
+
+# StudentDetails attributes the facets group by
+FACET_ATTRIBUTES = ("country", "curriculum", "referral_source", "school_name", "firm_id")
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # filters -> (loaded_at, facets)
+
+_stats = register_cache("student_facets", extra=lambda: {"size": len(_entries)})
+
+
+def cached_facets(filters, build):
+    """Return ``build()`` for ``filters`` (a dict), memoised for a short TTL."""
+    key = tuple(sorted(filters.items()))
+    ttl = current_app.config.get("STUDENT_FACETS_TTL_SECONDS", 60)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            _entries.move_to_end(key)
+            _stats.hit()
+            return entry[1]
+
+    _stats.miss()
+    loaded_at = time.monotonic()
+    facets = build()
+    with _lock:
+        _entries[key] = (loaded_at, facets)
+        _entries.move_to_end(key)
+        while len(_entries) > current_app.config.get("STUDENT_FACETS_CACHE_SIZE", 256):
+            _entries.popitem(last=False)
+    _stats.loaded()
+    return facets
+
+
+def invalidate_student_facets():
+    """Drop every cached facet result."""
+    with _lock:
+        _entries.clear()
+    _stats.invalidated()
+
+
+invalidate_on_commit(
+    [StudentDetails], invalidate_student_facets, watched_attributes=FACET_ATTRIBUTES
+)
@@ -0,0 +1,153 @@
+"""Student list queries that carry each student's test progress.
+
+The admin and firm dashboards list students together with their career and
+aptitude progress.  Rather than looking up ``TestStatus``, ``ExamProcess``
+and ``Trackaptitude`` once per student on the page, the helpers here
+outer-join all three onto the student query so a page and its progress
+state come back from a single statement.  All three tables hold at most
+one row per student, so the joins never multiply rows.
+
+Two paging modes are offered: classic page/offset pagination and keyset
+(cursor) pagination on ``StudentDetails.id``, whose cost per page does not
+grow with depth and which only counts the total when asked to.
+"""
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+
+from models.student import ExamProcess, StudentDetails, TestStatus, Trackaptitude
+from services.career_catalog import get_career_catalog
+
+
+def with_progress(query):
+    """Outer-join the progress tables onto a ``StudentDetails`` query.
+
+    Rows of the returned query are ``(StudentDetails, TestStatus | None,
+    ExamProcess | None, Trackaptitude | None)`` tuples.
+    """
+    return (
+        query
+        .outerjoin(TestStatus, TestStatus.user_id == StudentDetails.id)
+        .outerjoin(ExamProcess, ExamProcess.student_id == StudentDetails.id)
+        .outerjoin(Trackaptitude, Trackaptitude.student_id == StudentDetails.id)
+        .add_entity(TestStatus)
+        .add_entity(ExamProcess)
+        .add_entity(Trackaptitude)
+    )
+
+
+def total_career_questions():
+    """Return the number of questions in the career test."""
+    return get_career_catalog().total
+
+
+def progress_fields(test_status, exam_progress, track_apt, total_questions):
+    """Return the progress keys shared by the admin and firm student lists."""
+    career_test_completed = False
+    aptitude_test_completed = False
+
+    if exam_progress and exam_progress.last_attempted_question_id >= total_questions:
+        career_test_completed = True
+    elif test_status and test_status.career_test_completed:
+        career_test_completed = True
+
+    if test_status and test_status.aptitude_test_completed:
+        aptitude_test_completed = True
+
+    return {
+        "career_test_completed": career_test_completed,
+        "aptitude_test_completed": aptitude_test_completed,
+        # Last attempted aptitude category
+        "last_aptitude_category": track_apt.last_category if track_apt else None,
+        # Last attempted career question number
+        "last_career_question": (
+            exam_progress.last_attempted_question_id if exam_progress else None
+        ),
+    }
+
+
+def paginate_with_progress(query, page, per_page):
+    """Paginate a ``StudentDetails`` query with progress joined in.
+
+    Returns ``(pagination, rows)`` where ``rows`` is a list of
+    ``(student, progress_dict)`` pairs for the page.  The cost is fixed at
+    two statements (page and total count) whatever the page size.
+    """
+    pagination = with_progress(query).order_by(StudentDetails.id).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    total_questions = total_career_questions()
+
+    rows = [
+        (student, progress_fields(test_status, exam_progress, track_apt, total_questions))
+        for student, test_status, exam_progress, track_apt in pagination.items
+    ]
+    return pagination, rows
+
+
+class InvalidCursor(ValueError):
+    """Raised when a keyset cursor token cannot be decoded."""
+
+
+def _cursor_serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='student-list-cursor')
+
+
+def encode_cursor(student_id):
+    """Return an opaque cursor token pointing just after ``student_id``."""
+    return _cursor_serializer().dumps({"after": student_id})
+
+
+def decode_cursor(token):
+    """Return the student id encoded in ``token`` (None for an empty token).
+
+    Raises:
+        InvalidCursor: If the token is malformed or was not issued by us.
+    """
+    if not token:
+        return None
+    try:
+        after = _cursor_serializer().loads(token).get("after")
+    except (BadSignature, AttributeError):
+        raise InvalidCursor("Invalid cursor") from None
+    if not isinstance(after, int):
+        raise InvalidCursor("Invalid cursor")
+    return after
+
+
+def keyset_page_with_progress(query, cursor, per_page, include_total=False):
+    """Return one keyset page of a ``StudentDetails`` query with progress.
+
+    Args:
+        query: A filtered ``StudentDetails`` query.
+        cursor: Token from a previous page's ``next_cursor`` (empty for the
+            first page).
+        per_page: Page size.
+        include_total: Also run ``COUNT(*)`` over the filtered query.
+
+    Returns:
+        ``(rows, next_cursor, total)``; ``next_cursor`` is None on the last
+        page and ``total`` is None unless requested.
+
+    Raises:
+        InvalidCursor: If ``cursor`` cannot be decoded.
+    """
+    after = decode_cursor(cursor)
+    total = query.order_by(None).count() if include_total else None
+
+    # Keyset paging needs a pure id ordering, so drop e.g. search relevance.
+    page_query = with_progress(query.order_by(None))
+    if after is not None:
+        page_query = page_query.filter(StudentDetails.id > after)
+    # Fetch one extra row to learn whether another page follows.
+    items = page_query.order_by(StudentDetails.id).limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    total_questions = total_career_questions()
+    rows = [
+        (student, progress_fields(test_status, exam_progress, track_apt, total_questions))
+        for student, test_status, exam_progress, track_apt in items
+    ]
+    next_cursor = encode_cursor(items[-1][0].id) if has_more else None
+    return rows, next_cursor, total
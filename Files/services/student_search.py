@@ -0,0 +1,96 @@
+"""Student search for the admin and firm dashboards.
+
+On MySQL the ``search`` term is answered from the ``ft_student_search``
+FULLTEXT index (see ``migrations/005_add_fulltext_index_to_student_details.sql``) with a
+boolean-mode prefix query, so results are ranked by relevance and no longer
+need a full scan of ``student_details``.  InnoDB keeps the index in sync on
+every insert/update, so registration and profile edits need no extra work.
+
+Words the index cannot serve are matched with ``ILIKE '%word%'`` instead,
+ANDed with the MATCH: words shorter than the InnoDB minimum token size
+(so "Wu Chen" does not match every Chen), digit-only words (so part of a
+mobile number matches anywhere in it) and InnoDB stopwords (which match
+nothing as required boolean-mode terms).  On non-MySQL databases every
+word is matched with ``ILIKE``.
+"""
+
+import re
+
+from sqlalchemy.dialects.mysql import match
+
+from extensions import db
+from models.student import StudentDetails
+
+# Columns covered by the FULLTEXT index, in index order.
+SEARCH_COLUMNS = (
+    StudentDetails.first_name,
+    StudentDetails.last_name,
+    StudentDetails.email,
+    StudentDetails.mobile_number,
+)
+
+# innodb_ft_min_token_size default; shorter words are not indexed.
+MIN_TOKEN_SIZE = 3
+
+# InnoDB's default stopword list (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD).
+STOPWORDS = frozenset((
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for",
+    "from", "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "where", "who", "will", "with", "und", "www",
+))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _is_indexed(token):
+    return (
+        len(token) >= MIN_TOKEN_SIZE
+        and not token.isdigit()
+        and token.lower() not in STOPWORDS
+    )
+
+
+def _boolean_query(term):
+    """Return a boolean-mode AGAINST string, or None if no word is indexable."""
+    tokens = [t for t in _TOKEN_RE.findall(term) if _is_indexed(t)]
+    if not tokens:
+        return None
+    # Every word must match, as a prefix so typing "jon" finds "jonathan".
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def _contains(text):
+    """Match students with ``text`` anywhere in one of the search columns."""
+    like_term = f"%{text}%"
+    return db.or_(*(column.ilike(like_term) for column in SEARCH_COLUMNS))
+
+
+def _uses_fulltext():
+    return db.engine.dialect.name == "mysql"
+
+
+def apply_search(query, term):
+    """Filter a ``StudentDetails`` query by ``term`` and rank the matches.
+
+    Every word of ``term`` must match.  With the FULLTEXT index the query is
+    also ordered by relevance; callers add ``StudentDetails.id`` as a
+    tie-breaker (keyset pagination discards this ordering and pages by id).
+    """
+    term = term.strip()
+    if not term:
+        return query
+
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        return query.filter(_contains(term))
+
+    fulltext = _uses_fulltext()
+    for token in tokens:
+        if not (fulltext and _is_indexed(token)):
+            query = query.filter(_contains(token))
+
+    against = _boolean_query(term) if fulltext else None
+    if against is not None:
+        relevance = match(*SEARCH_COLUMNS, against=against).in_boolean_mode()
+        query = query.filter(relevance).order_by(relevance.desc())
+    return query
@@ -0,0 +1,64 @@
+"""Multi-row INSERT statements that resolve unique-key conflicts in SQL.
+
+MySQL spells these ``INSERT ... ON DUPLICATE KEY UPDATE``; SQLite and
+PostgreSQL use ``INSERT ... ON CONFLICT``.  Both helpers return False
+without executing anything on other databases, so callers can fall back
+to row-by-row ORM writes.  Neither commits.  Statements run on
+``db.session`` unless another ``session`` is given.
+"""
+
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from extensions import db
+
+_INSERTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _insert_for(table, session):
+    dialect = session.get_bind().dialect.name
+    insert = _INSERTS.get(dialect)
+    return dialect, insert(table) if insert is not None else None
+
+
+def insert_or_update(table, rows, key_columns, update_columns, session=None):
+    """Insert ``rows``; on a key conflict overwrite ``update_columns``."""
+    session = session or db.session
+    dialect, stmt = _insert_for(table, session)
+    if stmt is None:
+        return False
+    stmt = stmt.values(rows)
+    if dialect == "mysql":
+        stmt = stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in update_columns}
+        )
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[column] for column in key_columns],
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+    session.execute(stmt)
+    return True
+
+
+def insert_ignoring_duplicates(table, rows, key_columns, session=None):
+    """Insert ``rows``, leaving rows that already hold the key untouched."""
+    session = session or db.session
+    dialect, stmt = _insert_for(table, session)
+    if stmt is None:
+        return False
+    stmt = stmt.values(rows)
+    if dialect == "mysql":
+        # A no-op update rather than INSERT IGNORE, which would also
+        # swallow unrelated errors such as NOT NULL violations.
+        key = key_columns[0]
+        stmt = stmt.on_duplicate_key_update({key: table.c[key]})
+    else:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[table.c[column] for column in key_columns]
+        )
+    session.execute(stmt)
+    return True
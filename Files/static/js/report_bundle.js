@@ -0,0 +1,71 @@
+/**
+ * Report page data, fetched once per page.
+ *
+ * GET /api/v1/reports/<type>/<student_id> returns everything a report page
+ * shows; every section of the page reads its part from the same request.
+ * Requires jwt_helpers.js (authFetch).
+ *
+ * In render mode (?embed=1, used for PDFs) the bundle is embedded in the
+ * page as #report-bundle, so no request is made at all. Chart animations
+ * are then disabled and window.reportReady tells the PDF server when the
+ * page has settled.
+ */
+
+var REPORT_SETTLE_MS = 500;
+
+var _reportBundles = {};
+
+(function () {
+    var embedded = document.getElementById('report-bundle');
+    if (!embedded) {
+        return;
+    }
+    var bundle = JSON.parse(embedded.textContent);
+    _reportBundles[embedded.dataset.reportType + ':' + bundle.student_id] = Promise.resolve(bundle);
+
+    window.reportReady = false;
+    document.addEventListener('DOMContentLoaded', function () {
+        if (window.Chart) {
+            Chart.defaults.animation = false;
+        }
+    });
+    window.addEventListener('load', function () {
+        // Outlasts the short delays the report pages draw some charts after
+        setTimeout(function () { window.reportReady = true; }, REPORT_SETTLE_MS);
+    });
+})();
+
+/**
+ * Resolve with a student's report bundle; failures resolve with { error }.
+ * @param {string} reportType - "aptitude" or "career"
+ * @param {number|string} studentId
+ */
+function fetchReportBundle(reportType, studentId) {
+    var key = reportType + ':' + studentId;
+    if (!_reportBundles[key]) {
+        _reportBundles[key] = authFetch('/api/v1/reports/' + reportType + '/' + studentId)
+            .then(function (response) {
+                return response.json().catch(function () { return {}; }).then(function (body) {
+                    if (!response.ok && !body.error) {
+                        body.error = body.message || ('Request failed: ' + response.status);
+                    }
+                    return body;
+                });
+            })
+            .catch(function (error) {
+                delete _reportBundles[key];
+                throw error;
+            });
+    }
+    return _reportBundles[key];
+}
+
+/**
+ * Resolve with one part of the bundle ("scores", "report", ...), or the
+ * bundle itself ({ error, ... }) if it could not be loaded.
+ */
+function fetchReportPart(reportType, studentId, part) {
+    return fetchReportBundle(reportType, studentId).then(function (bundle) {
+        return bundle.error ? bundle : bundle[part];
+    });
+}
@@ -0,0 +1,49 @@
+/**
+ * Report PDF downloads through the asynchronous job API.
+ *
+ * POST /api/v1/reports/<student_id>/<type>/jobs queues a render; the job is
+ * polled until it is done and its PDF is then fetched. Requires
+ * jwt_helpers.js (authFetch).
+ */
+
+var REPORT_JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
+async function _reportJobJson(response) {
+    var body = await response.json().catch(function () { return {}; });
+    if (!response.ok) {
+        throw new Error(body.message || ('PDF request failed: ' + response.status));
+    }
+    return body;
+}
+
+/**
+ * Generate a student's report PDF and resolve with it as a Blob.
+ * @param {number|string} studentId
+ * @param {string} reportType - "aptitude" or "career"
+ */
+async function fetchReportPdf(studentId, reportType) {
+    var job = await _reportJobJson(await authFetch(
+        '/api/v1/reports/' + studentId + '/' + reportType + '/jobs',
+        { method: 'POST' }
+    ));
+
+    var deadline = Date.now() + REPORT_JOB_TIMEOUT_MS;
+    var delay = 1000;
+    while (job.status === 'queued' || job.status === 'running') {
+        if (Date.now() > deadline) {
+            throw new Error('PDF generation timed out');
+        }
+        await new Promise(function (resolve) { setTimeout(resolve, delay); });
+        delay = Math.min(delay * 1.5, 5000);
+        job = await _reportJobJson(await authFetch(job.status_url));
+    }
+    if (job.status !== 'done') {
+        throw new Error(job.error || 'PDF generation failed');
+    }
+
+    var response = await authFetch(job.download_url);
+    if (!response.ok) {
+        throw new Error('PDF download failed: ' + response.status);
+    }
+    return response.blob();
+}
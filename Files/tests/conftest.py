@@ -0,0 +1,150 @@
+"""Shared fixtures: the app on a scratch in-memory SQLite database.
+
+Built the same way as ``benchmarks/submit_category_responses.py``.  Every
+test gets a fresh database and empty in-process caches.  Run from
+``Files/``:
+
+    python -m pytest -q
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import db  # noqa: E402
+from models.assessment import (  # noqa: E402
+    CareerQuestion,
+    QuestionSubject,
+    QuestionSupportingSubject,
+    StudentCareerResponse,
+    Subject,
+    SupportingSubject,
+)
+from models.consultancy import ConsultancyFirm, FirmAdmin  # noqa: E402
+from models.student import StudentDetails  # noqa: E402
+
+SUBJECTS = (
+    "Manufacturing & Production", "Computing/IT", "Physics", "Psychology",
+    "Performing Arts Related", "Creative Arts and Crafts", "Public Protection & Security",
+)
+SUPPORTING_SUBJECTS = ("Mathematics", "physics", "Biology", "Chemistry", "Economics")
+
+
+class TestConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    JWT_COOKIE_CSRF_PROTECT = False
+    RATELIMIT_ENABLED = False
+    WARM_CACHES_ON_STARTUP = False
+    TESTING = True
+
+
+def _reset_caches():
+    from services import report_cache
+    from services.career_catalog import invalidate_career_catalog
+    from services.career_mappings import invalidate_career_mappings
+    from services.question_bank import invalidate_question_banks
+    from services.student_facets import invalidate_student_facets
+
+    invalidate_career_catalog()
+    invalidate_career_mappings()
+    invalidate_question_banks()
+    invalidate_student_facets()
+    with report_cache._lock:
+        report_cache._entries.clear()
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        _reset_caches()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client_for(app):
+    """Return ``client_for(role, identity, **claims)``, a logged-in test client."""
+
+    def make(role, identity, **claims):
+        client = app.test_client()
+        with app.app_context():
+            token = create_access_token(
+                identity=str(identity), additional_claims={"role": role, **claims}
+            )
+        client.set_cookie("access_token_cookie", token)
+        return client
+
+    return make
+
+
+def add_student(index, firm_id=None, **fields):
+    """Add (and flush) a student; ``fields`` override the defaults."""
+    values = {
+        "first_name": f"Student{index}",
+        "last_name": "Test",
+        "email": f"student{index}@example.com",
+        "mobile_number": f"07700{index:06d}",
+        "country": "UK",
+        "curriculum": "IB",
+        "school_name": "Test School",
+        "grade": "10",
+        "referral_source": "web",
+        "password": "x",
+        "firm_id": firm_id,
+    }
+    values.update(fields)
+    student = StudentDetails(**values)
+    db.session.add(student)
+    db.session.flush()
+    return student
+
+
+def seed_firm():
+    """Add a firm with one admin (``admin@firm.example.com``); return both."""
+    firm = ConsultancyFirm(firm_name="Test Firm", contact_email="firm@example.com", credit_balance=100)
+    db.session.add(firm)
+    db.session.flush()
+    admin = FirmAdmin(firm_id=firm.id, username="firmadmin", email="admin@firm.example.com", password="x")
+    db.session.add(admin)
+    db.session.flush()
+    return firm, admin
+
+
+def seed_career_bank(question_count=40, seed=1):
+    """Add career questions with random subject / supporting-subject mappings."""
+    rnd = random.Random(seed)
+    for number in range(1, question_count + 1):
+        db.session.add(CareerQuestion(question_number=number, question=f"Question {number}"))
+    for subject_id, name in enumerate(SUBJECTS, start=1):
+        db.session.add(Subject(subject_id=subject_id, subject_name=name))
+    for supporting_id, name in enumerate(SUPPORTING_SUBJECTS, start=1):
+        db.session.add(SupportingSubject(supporting_id=supporting_id, supporting_subject_name=name))
+    for number in range(1, question_count + 1):
+        for subject_id in rnd.sample(range(1, len(SUBJECTS) + 1), rnd.randint(1, 2)):
+            db.session.add(QuestionSubject(question_number=number, subject_id=subject_id))
+        for supporting_id in rnd.sample(range(1, len(SUPPORTING_SUBJECTS) + 1), rnd.randint(0, 2)):
+            db.session.add(QuestionSupportingSubject(question_number=number, supporting_id=supporting_id))
+    db.session.flush()
+
+
+def add_career_responses(student, question_numbers, seed):
+    """Answer ``question_numbers`` for ``student`` with random weights 0-2."""
+    rnd = random.Random(seed)
+    for number in question_numbers:
+        db.session.add(StudentCareerResponse(
+            student_id=student.id, first_name=student.first_name, email=student.email,
+            question_id=number, response_weight=rnd.randint(0, 2),
+        ))
+    db.session.flush()
@@ -0,0 +1,49 @@
+"""Caches are dropped when their rows change through the ORM."""
+
+from conftest import add_student, seed_career_bank
+from extensions import db
+from models.assessment import CareerQuestion
+from services import career_catalog, student_facets
+
+
+def _catalog_loaded():
+    return career_catalog._catalog is not None
+
+
+def test_orm_edits_drop_the_cache_on_commit_only(app):
+    app.config["CAREER_CATALOG_CHECK_SECONDS"] = 300
+    with app.app_context():
+        seed_career_bank()
+        db.session.commit()
+        career_catalog.get_career_catalog()
+
+        db.session.get(CareerQuestion, 1).question = "Changed"
+        db.session.flush()
+        assert _catalog_loaded()
+        db.session.rollback()
+        assert _catalog_loaded()
+
+        db.session.get(CareerQuestion, 1).question = "Changed"
+        db.session.commit()
+        assert not _catalog_loaded()
+        assert career_catalog.get_career_catalog().get(1).question == "Changed"
+
+
+def test_facets_ignore_updates_to_other_columns(app):
+    builds = []
+
+    def facets():
+        return student_facets.cached_facets({}, lambda: builds.append(1) or len(builds))
+
+    with app.app_context():
+        student = add_student(1)
+        db.session.commit()
+        assert facets() == 1
+
+        student.first_name = "Renamed"
+        db.session.commit()
+        assert facets() == 1
+
+        student.country = "Elsewhere"
+        db.session.commit()
+        assert facets() == 2
@@ -0,0 +1,32 @@
+"""The career catalog notices question text edited directly in the database."""
+
+from conftest import seed_career_bank
+from extensions import db
+from models.assessment import CareerQuestion
+from services.career_catalog import get_career_catalog
+
+
+def _set_question(question_number, text):
+    # Core UPDATE: no ORM events, like an edit made in a SQL console.
+    db.session.execute(
+        db.update(CareerQuestion)
+        .where(CareerQuestion.question_number == question_number)
+        .values(question=text)
+    )
+    db.session.commit()
+
+
+def test_same_length_edits_reload(app):
+    app.config["CAREER_CATALOG_CHECK_SECONDS"] = 0
+    with app.app_context():
+        seed_career_bank()
+        first, second = (q.question for q in get_career_catalog().questions[:2])
+
+        # Same total length: a typo fix, then two questions swapping text.
+        _set_question(1, first[:-1] + ("x" if first[-1] != "x" else "y"))
+        assert get_career_catalog().get(1).question != first
+
+        _set_question(1, second)
+        _set_question(2, first)
+        catalog = get_career_catalog()
+        assert (catalog.get(1).question, catalog.get(2).question) == (second, first)
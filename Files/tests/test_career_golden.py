@@ -0,0 +1,128 @@
+"""Career scoring output pinned against golden values.
+
+``golden/career_results.json`` holds the ``/get_career_scores`` and
+``/career_report`` responses for the students seeded below, captured from
+the implementation that predates ``CareerResult`` (the per-route scoring
+loops).  Every path that now shares ``compute_career_result`` /
+``iter_cohort_scores`` must keep producing exactly these values.
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+from conftest import add_career_responses, add_student, seed_career_bank, seed_firm
+from extensions import db
+from services import report_cache
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden", "career_results.json")
+STUDENT_IDS = (1, 2, 3, 4, 5)
+FIRM_STUDENT_IDS = (2, 3, 4, 5)
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def firm_admin_id(app):
+    # Keep in step with golden/career_results.json.
+    with app.app_context():
+        seed_career_bank()
+        firm, admin = seed_firm()
+        independent = add_student(1)
+        partial = add_student(2, firm_id=firm.id)
+        complete = add_student(3, firm_id=firm.id)
+        add_student(4, firm_id=firm.id)  # no responses
+        shuffled = add_student(5, firm_id=firm.id)
+        add_career_responses(independent, range(1, 41), seed=11)
+        add_career_responses(partial, range(1, 26), seed=12)
+        add_career_responses(complete, range(1, 41), seed=13)
+        # Answers stored out of question order (ids do not follow numbers).
+        order = list(range(1, 41))
+        random.Random(5).shuffle(order)
+        add_career_responses(shuffled, order, seed=15)
+        db.session.commit()
+        return admin.id
+
+
+@pytest.fixture
+def admin_client(client_for, firm_admin_id):
+    return client_for("admin", 1)
+
+
+def _ndjson(response):
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.data.splitlines()]
+
+
+def _expected_scores(golden, student_id):
+    status, body = golden[f"scores/{student_id}"]
+    return body if status == 200 else None
+
+
+@pytest.mark.parametrize("student_id", STUDENT_IDS)
+def test_career_scores(admin_client, golden, student_id):
+    response = admin_client.get(f"/get_career_scores/{student_id}")
+    assert [response.status_code, response.get_json()] == golden[f"scores/{student_id}"]
+
+
+@pytest.mark.parametrize("student_id", STUDENT_IDS)
+def test_career_report(admin_client, golden, student_id):
+    response = admin_client.get(f"/career_report/{student_id}")
+    assert [response.status_code, response.get_json()] == golden[f"report/{student_id}"]
+
+
+@pytest.mark.parametrize("student_id", STUDENT_IDS)
+def test_career_results_survive_the_cache_and_store(app, admin_client, golden, student_id):
+    app.config["CAREER_REPORT_PERSIST"] = True
+    # Computed, then served from memory, then from stored_career_reports.
+    for attempt in range(3):
+        if attempt == 2:
+            with report_cache._lock:
+                report_cache._entries.clear()
+        response = admin_client.get(f"/get_career_scores/{student_id}")
+        assert [response.status_code, response.get_json()] == golden[f"scores/{student_id}"]
+        response = admin_client.get(f"/career_report/{student_id}")
+        assert [response.status_code, response.get_json()] == golden[f"report/{student_id}"]
+
+
+@pytest.mark.parametrize("student_id", STUDENT_IDS)
+def test_career_bundle(admin_client, golden, student_id):
+    response = admin_client.get(f"/api/v1/reports/career/{student_id}")
+    bundle = response.get_json()
+
+    scores_status, scores = golden[f"scores/{student_id}"]
+    report_status, report = golden[f"report/{student_id}"]
+    if scores_status != 200:
+        assert response.status_code == 404
+        assert "error" in bundle
+        return
+    assert response.status_code == report_status == 200
+    assert bundle["scores"] == scores
+    assert bundle["report"] == report
+
+
+def test_admin_cohort_scores(admin_client, golden):
+    lines = _ndjson(admin_client.post(
+        "/api/v1/admin/students/scores",
+        json={"student_ids": list(STUDENT_IDS), "include": ["career"]},
+    ))
+
+    assert [line["student_id"] for line in lines] == list(STUDENT_IDS)
+    for line in lines:
+        assert line["name"] == f"Student{line['student_id']} Test"
+        assert line["career"] == _expected_scores(golden, line["student_id"])
+
+
+def test_firm_cohort_scores(client_for, firm_admin_id, golden):
+    client = client_for("firm_admin", firm_admin_id)
+    lines = _ndjson(client.post("/api/v1/firm/students/scores", json={"include": ["career"]}))
+
+    assert [line["student_id"] for line in lines] == list(FIRM_STUDENT_IDS)
+    for line in lines:
+        assert line["career"] == _expected_scores(golden, line["student_id"])
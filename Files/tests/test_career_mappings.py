@@ -0,0 +1,86 @@
+"""The mapping snapshot notices edits made directly in the database."""
+
+import pytest
+
+from conftest import add_career_responses, add_student, seed_career_bank
+from extensions import db
+from models.assessment import QuestionSubject, Subject
+from services.career_mappings import (
+    career_mappings_version,
+    get_career_mappings,
+    invalidate_career_mappings,
+)
+
+
+@pytest.fixture
+def bank(app):
+    app.config["CAREER_MAPPINGS_CHECK_SECONDS"] = 0
+    with app.app_context():
+        seed_career_bank()
+        student = add_student(1)
+        add_career_responses(student, range(1, 41), seed=11)
+        db.session.commit()
+
+
+def _set_subject(question_number, old_subject_id, new_subject_id):
+    # Core UPDATE: no ORM events, like an edit made in a SQL console.
+    db.session.execute(
+        db.update(QuestionSubject)
+        .where(QuestionSubject.question_number == question_number)
+        .where(QuestionSubject.subject_id == old_subject_id)
+        .values(subject_id=new_subject_id)
+    )
+
+
+def _subjects_of(question_number):
+    return {row.subject_id for row in QuestionSubject.query.filter_by(question_number=question_number)}
+
+
+def _swappable_pair():
+    """Return (q1, s1, q2, s2): q1 maps to s1 only, q2 to s2 only, s1 != s2."""
+    singles = {}
+    for row in QuestionSubject.query.order_by(QuestionSubject.question_number):
+        singles.setdefault(row.question_number, []).append(row.subject_id)
+    singles = [(q, subjects[0]) for q, subjects in singles.items() if len(subjects) == 1]
+    q1, s1 = singles[0]
+    q2, s2 = next((q, s) for q, s in singles if s != s1)
+    return q1, s1, q2, s2
+
+
+@pytest.mark.usefixtures("bank")
+def test_swapping_subjects_between_questions_reloads(app, client_for):
+    client = client_for("admin", 1)
+    with app.app_context():
+        before = career_mappings_version()
+        q1, s1, q2, s2 = _swappable_pair()
+    scores_before = client.get("/get_career_scores/1").get_json()
+
+    with app.app_context():
+        _set_subject(q1, s1, s2)
+        _set_subject(q2, s2, s1)
+        db.session.commit()
+        assert _subjects_of(q1) == {s2} and _subjects_of(q2) == {s1}
+
+        assert career_mappings_version() != before
+        assert s2 in get_career_mappings().question_subject_dict[q1]
+        assert s1 in get_career_mappings().question_subject_dict[q2]
+
+    # The cached scores are keyed by the mapping version, so they refresh too.
+    scores_after = client.get("/get_career_scores/1").get_json()
+    with app.app_context():
+        invalidate_career_mappings()
+    assert scores_after == client.get("/get_career_scores/1").get_json()
+    assert scores_after != scores_before
+
+
+@pytest.mark.usefixtures("bank")
+def test_same_length_rename_reloads(app):
+    with app.app_context():
+        before = career_mappings_version()
+        db.session.execute(
+            db.update(Subject).where(Subject.subject_id == 3).values(subject_name="Physica")
+        )
+        db.session.commit()
+
+        assert career_mappings_version() != before
+        assert get_career_mappings().subject_names_dict[3] == "Physica"
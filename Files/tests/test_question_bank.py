@@ -0,0 +1,90 @@
+"""Aptitude test forms are shared by every host and bounded in number."""
+
+import pytest
+
+from extensions import db
+from models.assessment import AptitudeAllQuestions
+from services import question_bank
+
+CATEGORIES = ("ABSTRACT", "NUMEBERS", "Verbal", "SPATIAL")
+
+
+@pytest.fixture
+def aptitude_bank(app):
+    app.config["APTITUDE_FORM_POOL_SIZE"] = 4
+    with app.app_context():
+        for category in CATEGORIES:
+            for i in range(40):
+                db.session.add(AptitudeAllQuestions(
+                    category=category,
+                    question_text=f"{category} {i}",
+                    question_image=f"aptitude/{category}_{i}.png",
+                    correct_option="A",
+                ))
+        db.session.commit()
+
+
+@pytest.mark.usefixtures("aptitude_bank")
+def test_form_image_urls_are_host_relative(app):
+    client = app.test_client()
+    response = client.get("/aptitudegetquestion", base_url="http://evil.example")
+
+    assert response.status_code == 200
+    questions = response.get_json()["questions_by_category"]["Verbal"]
+    assert len(questions) == question_bank.QUESTIONS_PER_CATEGORY
+    assert all(q["question_image_url"].startswith("/static/aptitude/Verbal_") for q in questions)
+    assert b"evil.example" not in response.data
+
+
+@pytest.mark.usefixtures("aptitude_bank")
+def test_forms_are_shared_across_hosts(app):
+    client = app.test_client()
+    first = client.get("/aptitudegetquestion", base_url="http://a.example")
+    form_id = first.get_json()["form_id"]
+
+    # Anonymous users get a random form; ask until the same one comes back.
+    for _ in range(100):
+        other = client.get("/aptitudegetquestion", base_url="http://b.example")
+        if other.get_json()["form_id"] == form_id:
+            break
+    assert other.data == first.data
+    assert other.headers["ETag"] == first.headers["ETag"]
+
+
+@pytest.mark.usefixtures("aptitude_bank")
+def test_form_cache_is_bounded_by_pool_size(app):
+    with app.test_request_context():
+        for form_id in range(10):
+            question_bank.get_aptitude_form(form_id)
+        assert len(question_bank._forms) == 4
+        assert [key[1] for key in question_bank._forms] == [6, 7, 8, 9]
+
+
+def _edit_question(question_id, **values):
+    # Core UPDATE: no ORM events, like an edit made in a SQL console.
+    db.session.execute(
+        db.update(AptitudeAllQuestions)
+        .where(AptitudeAllQuestions.id == question_id)
+        .values(**values)
+    )
+    db.session.commit()
+
+
+@pytest.mark.usefixtures("aptitude_bank")
+def test_answer_key_notices_direct_corrections(app):
+    app.config["QUESTION_BANK_CHECK_SECONDS"] = 0
+    with app.test_request_context():
+        assert question_bank.get_answer_key().questions[1] == ("A", "ABSTRACT")
+        form = question_bank.get_aptitude_form(0)
+
+        _edit_question(1, correct_option="C")
+        assert question_bank.get_answer_key().questions[1] == ("C", "ABSTRACT")
+        # A corrected answer does not reshuffle the forms students were given.
+        assert question_bank.get_aptitude_form(0) == form
+
+        _edit_question(1, category="Verbal")
+        answer_key = question_bank.get_answer_key()
+        assert answer_key.questions[1] == ("C", "Verbal")
+        assert answer_key.expected_count("verbal") == 41
+        _version, ids_by_category = question_bank.aptitude_index.get()
+        assert 1 in ids_by_category["Verbal"]
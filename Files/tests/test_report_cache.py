@@ -0,0 +1,69 @@
+"""Persisted career results are written outside the request's session."""
+
+import logging
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import create_app
+from conftest import TestConfig, add_student
+from extensions import db
+from models.report import StoredCareerReport
+from services import report_cache
+
+
+@pytest.fixture
+def app(tmp_path):
+    # A file database: separate sessions must not share one connection.
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'reports.db'}"
+        CAREER_REPORT_PERSIST = True
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        with report_cache._lock:
+            report_cache._entries.clear()
+        add_student(1)
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _stored(student_id, kind):
+    with Session(db.engine) as session:
+        return session.get(StoredCareerReport, (student_id, kind))
+
+
+def test_store_does_not_commit_the_request_session(app, monkeypatch):
+    with app.test_request_context():
+        def forbidden():
+            raise AssertionError("request session committed")
+
+        monkeypatch.setattr(db.session, "commit", forbidden)
+        payload = report_cache.cached_result("career_scores", 1, lambda: {"score": 1})
+
+        assert payload == {"score": 1}
+        stored = _stored(1, "career_scores")
+        assert stored is not None and stored.payload == '{"score": 1}'
+
+
+def test_store_swallows_duplicate_key_races(app, monkeypatch, caplog):
+    def duplicate(*_args, **_kwargs):
+        raise IntegrityError("INSERT INTO stored_career_reports", {}, Exception("Duplicate entry"))
+
+    monkeypatch.setattr(report_cache, "insert_or_update", duplicate)
+    with app.test_request_context():
+        student = add_student(2)
+        with caplog.at_level(logging.INFO, logger=report_cache.logger.name):
+            payload = report_cache.cached_result("career_scores", 1, lambda: {"score": 1})
+
+        assert payload == {"score": 1}
+        assert "stored concurrently" in caplog.text
+        assert not any(record.levelno >= logging.ERROR for record in caplog.records)
+        # The request's own pending work survives.
+        assert student in db.session
+        db.session.commit()
+        assert _stored(1, "career_scores") is None
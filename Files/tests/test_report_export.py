@@ -0,0 +1,102 @@
+"""Bulk firm report export: request validation and archive contents."""
+
+import io
+import json
+import re
+import zipfile
+
+import pytest
+from flask_jwt_extended import decode_token
+
+from conftest import add_student, seed_firm
+from extensions import db
+from services import report_export
+from services.pdf_cache import PdfRenderError
+
+EXPORT_URL = "/api/v1/firm/students/reports/export"
+
+
+@pytest.fixture
+def firm_client(app, client_for):
+    with app.app_context():
+        firm, admin = seed_firm()
+        add_student(1, firm_id=firm.id)  # no completed tests: nothing to render
+        db.session.commit()
+        return client_for("firm_admin", admin.id, firm_id=firm.id)
+
+
+def test_well_formed_export_id_is_kept(firm_client):
+    export_id = "0123456789abcdef0123456789abcdef"
+    response = firm_client.post(EXPORT_URL, json={"export_id": export_id})
+
+    assert response.status_code == 200
+    assert response.headers["X-Export-Id"] == export_id
+    assert response.headers["Content-Disposition"] == f'attachment; filename="reports_{export_id}.zip"'
+
+
+@pytest.mark.parametrize("export_id", [
+    'x"; filename="evil.exe',
+    "abc\r\nSet-Cookie: a=b",
+    "0123456789ABCDEF0123456789ABCDEF",
+    "0123456789abcdef0123456789abcdef0",
+    12345,
+])
+def test_malformed_export_id_is_replaced(firm_client, export_id):
+    response = firm_client.post(EXPORT_URL, json={"export_id": export_id})
+
+    assert response.status_code == 200
+    generated = response.headers["X-Export-Id"]
+    assert re.fullmatch(r"[0-9a-f]{32}", generated)
+    assert response.headers["Content-Disposition"] == f'attachment; filename="reports_{generated}.zip"'
+
+
+def test_archive_lists_failures_and_counts_them_apart_from_skips(app, tmp_path, monkeypatch):
+    with app.app_context():
+        firm, admin = seed_firm()
+        students = [add_student(i, firm_id=firm.id).id for i in (1, 2, 3)]
+        db.session.commit()
+        firm_id, admin_id = firm.id, admin.id
+
+    rendered = tmp_path / "rendered.pdf"
+    rendered.write_bytes(b"%PDF-1.4 report")
+    outcomes = {
+        students[0]: str(rendered),
+        students[1]: str(tmp_path / "invalidated.pdf"),  # removed since rendering
+        students[2]: PdfRenderError("PDF server returned 500"),
+    }
+    tokens = []
+
+    def fake_get_report_pdf(student, _kind, _page_url, _firm, cookies):
+        tokens.append(decode_token(cookies[0]["value"]))
+        outcome = outcomes[student.id]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome, "etag"
+
+    progress = []
+    monkeypatch.setattr(report_export, "get_report_pdf", fake_get_report_pdf)
+    monkeypatch.setattr(
+        report_export.socketio, "emit", lambda _event, data, room: progress.append(data)
+    )
+    skipped = [{"student_id": 99, "type": "aptitude", "error": "Test not completed"}]
+    reports = [(sid, f"Student {sid}", "career", "http://render/page") for sid in students]
+
+    with app.app_context():
+        body = b"".join(report_export.stream_report_zip(
+            app, reports, firm_id, admin_id, "e" * 32, f"firm_{firm_id}", skipped=skipped,
+        ))
+
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.namelist() == [f"Student_1_{students[0]}_career.pdf", "errors.json"]
+        assert archive.read(archive.namelist()[0]) == b"%PDF-1.4 report"
+        errors = {e["student_id"]: e["error"] for e in json.loads(archive.read("errors.json"))}
+    assert set(errors) == {99, students[1], students[2]}
+    assert "changed during the export" in errors[students[1]]
+
+    assert len(progress) == 3
+    assert (progress[-1]["done"], progress[-1]["failed"], progress[-1]["skipped"]) == (3, 2, 1)
+
+    # Rendered as the firm admin with a short-lived token, not the request's cookies.
+    for claims in tokens:
+        assert (claims["sub"], claims["role"]) == (str(admin_id), "firm_admin")
+        assert claims["exp"] - claims["iat"] <= app.config["PDF_RENDER_TIMEOUT"] + 60
@@ -0,0 +1,105 @@
+"""Revoked tokens: read-only checks, shared rows and pruning."""
+
+import time
+import uuid
+
+import pytest
+
+from extensions import db
+from models.auth import RevokedToken
+from services import revocation
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(app):
+    app.config["TOKEN_REVOCATION_SYNC_SECONDS"] = 0
+    with revocation._lock:
+        revocation._revoked.clear()
+    revocation._high_water = None
+    revocation._synced_at = None
+    revocation._pruned_at = None
+
+
+def _payload(expires_in=3600):
+    return {"jti": str(uuid.uuid4()), "type": "access", "exp": int(time.time()) + expires_in}
+
+
+def _row(payload):
+    return RevokedToken(
+        jti=payload["jti"], token_type="access",
+        expires_at=revocation._expires_at(payload), revoked_at=revocation._utcnow(),
+    )
+
+
+def _forbid_session_writes(monkeypatch):
+    def forbidden(*_args, **_kwargs):
+        raise AssertionError("request session used")
+
+    for name in ("execute", "commit", "rollback", "flush"):
+        monkeypatch.setattr(db.session, name, forbidden)
+
+
+def test_check_is_read_only_and_sees_other_workers(app, monkeypatch):
+    revoked_elsewhere = _payload()
+    expired = _payload(expires_in=-60)
+    with app.app_context():
+        db.session.add_all([_row(revoked_elsewhere), _row(expired)])
+        db.session.commit()
+
+    with app.test_request_context():
+        _forbid_session_writes(monkeypatch)
+        assert revocation.is_token_revoked(revoked_elsewhere)
+        assert not revocation.is_token_revoked(_payload())
+        assert not revocation.is_token_revoked(expired)
+    with app.app_context():
+        # Nothing was pruned by the checks.
+        assert RevokedToken.query.count() == 2
+
+
+def test_revoke_token_is_seen_at_once(app):
+    payload = _payload()
+    with app.test_request_context():
+        revocation.revoke_token(payload)
+        revocation.revoke_token(payload)
+        assert revocation.is_token_revoked(payload)
+        assert RevokedToken.query.filter_by(jti=payload["jti"]).count() == 1
+
+
+def test_logout_prunes_expired_rows_when_due(app):
+    expired, live = _payload(expires_in=-60), _payload()
+    with app.app_context():
+        db.session.add_all([_row(expired), _row(live)])
+        db.session.commit()
+
+    with app.test_request_context():
+        revocation.revoke_token(_payload())
+        remaining = {row.jti for row in RevokedToken.query}
+    assert expired["jti"] not in remaining
+    assert live["jti"] in remaining
+
+    # Not due again within TOKEN_REVOCATION_PRUNE_SECONDS.
+    with app.app_context():
+        db.session.add(_row(_payload(expires_in=-60)))
+        db.session.commit()
+    with app.test_request_context():
+        revocation.revoke_token(_payload())
+        assert RevokedToken.query.count() == 4
+
+
+def test_prune_command(app):
+    with app.app_context():
+        db.session.add_all([_row(_payload(expires_in=-60)), _row(_payload())])
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["prune-revoked-tokens"])
+
+    assert result.exit_code == 0
+    assert "Deleted 1 expired revoked tokens." in result.output
+    with app.app_context():
+        assert RevokedToken.query.count() == 1
+
+
+def test_prune_leaves_the_request_session_alone(app, monkeypatch):
+    with app.test_request_context():
+        _forbid_session_writes(monkeypatch)
+        assert revocation.prune_revoked_tokens() == 0
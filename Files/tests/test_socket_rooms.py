@@ -0,0 +1,75 @@
+"""Socket.IO rooms may only be joined by the people their events are for."""
+
+import pytest
+
+from conftest import add_student, seed_firm
+from extensions import db, socketio
+from models.consultancy import ConsultancyFirm, FirmAdmin
+
+
+@pytest.fixture
+def accounts(app):
+    with app.app_context():
+        firm, admin = seed_firm()
+        other_firm = ConsultancyFirm(firm_name="Other", contact_email="other@example.com", credit_balance=0)
+        db.session.add(other_firm)
+        db.session.flush()
+        other_admin = FirmAdmin(firm_id=other_firm.id, username="other", email="o@example.com", password="x")
+        db.session.add(other_admin)
+        own = add_student(1, firm_id=firm.id)
+        independent = add_student(2)
+        db.session.commit()
+        return {
+            "firm": firm.id, "admin": admin.id, "other_admin": other_admin.id,
+            "own": own.id, "independent": independent.id,
+        }
+
+
+def _joins(app, client, room):
+    socket = socketio.test_client(app, flask_test_client=client)
+    try:
+        joined = socket.emit("join", {"room": room}, callback=True)
+        if room is None:
+            return joined  # emitting to room=None would broadcast
+        socketio.emit("ping_room", {"room": room}, room=room)
+        received = [event["name"] for event in socket.get_received()]
+        assert joined == ("ping_room" in received)
+        return joined
+    finally:
+        socket.disconnect()
+
+
+def test_anonymous_clients_cannot_join(app, accounts):
+    client = app.test_client()
+    assert not _joins(app, client, f"firm_{accounts['firm']}")
+    assert not _joins(app, client, f"student_{accounts['own']}")
+
+
+def test_student_joins_only_their_own_room(app, accounts, client_for):
+    client = client_for("student", accounts["own"])
+    assert _joins(app, client, f"student_{accounts['own']}")
+    assert not _joins(app, client, f"student_{accounts['independent']}")
+    assert not _joins(app, client, f"firm_{accounts['firm']}")
+
+
+def test_firm_admin_joins_only_their_firm(app, accounts, client_for):
+    client = client_for("firm_admin", accounts["admin"], firm_id=accounts["firm"])
+    assert _joins(app, client, f"firm_{accounts['firm']}")
+    assert _joins(app, client, f"student_{accounts['own']}")
+    assert not _joins(app, client, f"student_{accounts['independent']}")
+
+    other = client_for("firm_admin", accounts["other_admin"])
+    assert not _joins(app, other, f"firm_{accounts['firm']}")
+    assert not _joins(app, other, f"student_{accounts['own']}")
+
+
+def test_admin_joins_student_rooms_only(app, accounts, client_for):
+    client = client_for("admin", 1)
+    assert _joins(app, client, f"student_{accounts['independent']}")
+    assert not _joins(app, client, f"firm_{accounts['firm']}")
+
+
+def test_unknown_rooms_are_refused(app, accounts, client_for):
+    client = client_for("admin", 1)
+    for room in ("lobby", "student_", "student_1 ", None, f"firm_{accounts['firm']}x"):
+        assert not _joins(app, client, room)
@@ -0,0 +1,113 @@
+"""Student list pages cost a fixed number of statements whatever their size."""
+
+import pytest
+from sqlalchemy import event
+
+from conftest import add_student, seed_career_bank
+from extensions import db
+from models.student import ExamProcess, StudentDetails, Trackaptitude
+from models.student import TestStatus as StudentTestStatus  # not a test class
+from services.student_progress import keyset_page_with_progress, paginate_with_progress
+
+STUDENT_COUNT = 60
+
+
+@pytest.fixture
+def students(app):
+    with app.app_context():
+        seed_career_bank(question_count=10)
+        for index in range(1, STUDENT_COUNT + 1):
+            student = add_student(index)
+            # Give students every combination of progress rows.
+            if index % 2:
+                db.session.add(StudentTestStatus(
+                    user_id=student.id, career_test_completed=index % 4 == 1,
+                    aptitude_test_completed=index % 3 == 0,
+                ))
+            if index % 3:
+                db.session.add(ExamProcess(
+                    student_id=student.id, email=student.email, firstname=student.first_name,
+                    last_attempted_question_id=index % 12,
+                ))
+            if index % 5:
+                db.session.add(Trackaptitude(student_id=student.id, last_category="Verbal"))
+        db.session.commit()
+
+
+@pytest.fixture
+def count_statements(app):
+    """Return ``count(fn)``: the number of statements ``fn()`` executes."""
+    statements = []
+
+    def listener(*_args):
+        statements.append(1)
+
+    def count(fn):
+        statements.clear()
+        fn()
+        return len(statements)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", listener)
+        yield count
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def _materialise(rows):
+    # Touch every progress field so lazy loads, if any, are counted.
+    return [(student.id, sorted(progress.items())) for student, progress in rows]
+
+
+@pytest.mark.usefixtures("students")
+def test_paginate_statement_count_does_not_grow_with_page_size(count_statements):
+    # Load the career catalog outside the measurement.
+    paginate_with_progress(StudentDetails.query, 1, 1)
+
+    def page(per_page):
+        pagination, rows = paginate_with_progress(StudentDetails.query, 1, per_page)
+        assert len(_materialise(rows)) == per_page
+        assert pagination.total == STUDENT_COUNT
+
+    small = count_statements(lambda: page(5))
+    large = count_statements(lambda: page(50))
+    assert small == large == 2
+
+
+@pytest.mark.usefixtures("students")
+def test_keyset_statement_count_does_not_grow_with_page_size(count_statements):
+    keyset_page_with_progress(StudentDetails.query, "", 1)
+
+    def pages(per_page, include_total):
+        rows, cursor, total = keyset_page_with_progress(
+            StudentDetails.query, "", per_page, include_total
+        )
+        assert len(_materialise(rows)) == per_page
+        rows, _cursor, _total = keyset_page_with_progress(
+            StudentDetails.query, cursor, per_page, include_total
+        )
+        assert len(_materialise(rows)) == per_page
+        assert total == (STUDENT_COUNT if include_total else None)
+
+    # Two pages each: one statement per page, plus COUNT(*) when asked.
+    assert count_statements(lambda: pages(5, False)) == count_statements(lambda: pages(25, False)) == 2
+    assert count_statements(lambda: pages(5, True)) == count_statements(lambda: pages(25, True)) == 4
+
+
+@pytest.mark.usefixtures("students")
+def test_progress_fields_match_per_student_lookups(app):
+    total_questions = 10
+    with app.app_context():
+        _pagination, rows = paginate_with_progress(StudentDetails.query, 1, STUDENT_COUNT)
+        for student, progress in rows:
+            status = StudentTestStatus.query.filter_by(user_id=student.id).first()
+            exam = db.session.get(ExamProcess, student.id)
+            track = db.session.get(Trackaptitude, student.id)
+            assert progress == {
+                "career_test_completed": bool(
+                    (exam and exam.last_attempted_question_id >= total_questions)
+                    or (status and status.career_test_completed)
+                ),
+                "aptitude_test_completed": bool(status and status.aptitude_test_completed),
+                "last_aptitude_category": track.last_category if track else None,
+                "last_career_question": exam.last_attempted_question_id if exam else None,
+            }
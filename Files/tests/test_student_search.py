@@ -0,0 +1,85 @@
+"""Student search: FULLTEXT words plus ILIKE for words the index cannot serve."""
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from conftest import add_student
+from extensions import db
+from models.student import StudentDetails
+from services import student_search
+from services.student_search import _boolean_query, apply_search
+
+
+@pytest.fixture
+def students(app):
+    with app.app_context():
+        add_student(1, first_name="Wu", last_name="Chen", mobile_number="07700900123")
+        add_student(2, first_name="Li", last_name="Chen", mobile_number="07700900456")
+        add_student(3, first_name="Chenoa", last_name="Smith", mobile_number="07911123456")
+        add_student(4, first_name="Theo", last_name="Wuest", email="theo@example.org")
+        db.session.commit()
+
+
+def _search(term):
+    query = apply_search(StudentDetails.query, term).order_by(StudentDetails.id)
+    return [f"{s.first_name} {s.last_name}" for s in query]
+
+
+def _mysql_sql(term):
+    query = apply_search(StudentDetails.query, term)
+    return str(query.statement.compile(
+        dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+
+def test_boolean_query_skips_words_the_index_cannot_serve():
+    assert _boolean_query("Wu Chen") == "+Chen*"
+    assert _boolean_query("the chen 0770") == "+chen*"
+    assert _boolean_query("Wu Li") is None
+    assert _boolean_query("07700 900") is None
+
+
+@pytest.mark.usefixtures("students")
+def test_short_words_must_match(app):
+    with app.app_context():
+        assert _search("Wu Chen") == ["Wu Chen"]
+        assert _search("li chen") == ["Li Chen"]
+        assert _search("Chen") == ["Wu Chen", "Li Chen", "Chenoa Smith"]
+
+
+@pytest.mark.usefixtures("students")
+def test_partial_mobile_number_matches_anywhere(app):
+    with app.app_context():
+        assert _search("900123") == ["Wu Chen"]
+        assert _search("0900") == ["Wu Chen", "Li Chen"]
+        assert _search("123") == ["Wu Chen", "Chenoa Smith"]
+
+
+@pytest.mark.usefixtures("students")
+def test_stopwords_and_mid_word_short_terms_match(app):
+    with app.app_context():
+        assert _search("the") == ["Theo Wuest"]
+        assert _search("org") == ["Theo Wuest"]
+        assert _search("wu") == ["Wu Chen", "Theo Wuest"]
+
+
+def test_mysql_ands_ilike_for_short_and_digit_words_with_match(app, monkeypatch):
+    monkeypatch.setattr(student_search, "_uses_fulltext", lambda: True)
+    with app.app_context():
+        sql = _mysql_sql("Wu Chen 0770")
+
+    assert "AGAINST ('+Chen*' IN BOOLEAN MODE)" in sql
+    assert "lower(student_details.first_name) LIKE lower('%%Wu%%')" in sql
+    assert "lower(student_details.mobile_number) LIKE lower('%%0770%%')" in sql
+    assert "'%%Chen%%'" not in sql
+    assert "ORDER BY MATCH" in sql
+
+
+def test_mysql_stopwords_and_short_terms_skip_match(app, monkeypatch):
+    monkeypatch.setattr(student_search, "_uses_fulltext", lambda: True)
+    with app.app_context():
+        sql = _mysql_sql("the wu")
+
+    assert "MATCH" not in sql
+    assert "LIKE lower('%%the%%')" in sql
+    assert "LIKE lower('%%wu%%')" in sql
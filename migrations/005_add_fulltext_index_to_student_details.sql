@@ -0,0 +1,19 @@
+-- Migration 005: Add FULLTEXT index for the admin/firm student search
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/005_add_fulltext_index_to_student_details.sql
+
+-- Add the index only if it does not already exist
+SET @idx_exists = (
+  SELECT COUNT(*)
+  FROM INFORMATION_SCHEMA.STATISTICS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'student_details'
+    AND INDEX_NAME = 'ft_student_search'
+);
+
+SET @sql = IF(@idx_exists = 0,
+  'ALTER TABLE `student_details` ADD FULLTEXT INDEX `ft_student_search` (`first_name`, `last_name`, `email`, `mobile_number`)',
+  'SELECT "Index ft_student_search already exists on student_details"'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,30 @@
+-- Migration 006: One stored answer per student and aptitude question
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/006_add_unique_answer_to_aptitudeimgresponse.sql
+--
+-- The aptitude submit endpoint writes a whole category with a single
+-- INSERT ... ON DUPLICATE KEY UPDATE, which relies on this key.
+
+-- Remove duplicate answers first, keeping the most recent row
+DELETE older
+FROM `aptitudeimgresponse` AS older
+JOIN `aptitudeimgresponse` AS newer
+  ON newer.student_id = older.student_id
+  AND newer.question_id = older.question_id
+  AND newer.response_id > older.response_id;
+
+-- Add the unique key only if it does not already exist
+SET @idx_exists = (
+  SELECT COUNT(*)
+  FROM INFORMATION_SCHEMA.STATISTICS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'aptitudeimgresponse'
+    AND INDEX_NAME = 'uq_aptitudeimgresponse_student_question'
+);
+
+SET @sql = IF(@idx_exists = 0,
+  'ALTER TABLE `aptitudeimgresponse` ADD UNIQUE KEY `uq_aptitudeimgresponse_student_question` (`student_id`, `question_id`)',
+  'SELECT "Key uq_aptitudeimgresponse_student_question already exists"'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,32 @@
+-- Migration 007: One stored answer per student and career question
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/007_add_unique_answer_to_student_career_response.sql
+--
+-- The batched career submit endpoint (/submit_responses) relies on this key
+-- to stay idempotent when a chunk is retried. It also serves the
+-- per-student lookups made when scoring.
+
+-- Remove duplicate answers first, keeping the first one recorded
+-- (the one /submit_response has always treated as authoritative)
+DELETE later
+FROM `student_career_response` AS later
+JOIN `student_career_response` AS earlier
+  ON earlier.student_id = later.student_id
+  AND earlier.question_id = later.question_id
+  AND earlier.id < later.id;
+
+-- Add the unique key only if it does not already exist
+SET @idx_exists = (
+  SELECT COUNT(*)
+  FROM INFORMATION_SCHEMA.STATISTICS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'student_career_response'
+    AND INDEX_NAME = 'uq_student_career_response_student_question'
+);
+
+SET @sql = IF(@idx_exists = 0,
+  'ALTER TABLE `student_career_response` ADD UNIQUE KEY `uq_student_career_response_student_question` (`student_id`, `question_id`)',
+  'SELECT "Key uq_student_career_response_student_question already exists"'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,17 @@
+-- Migration 008: Create stored_career_reports table
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/008_create_stored_career_reports.sql
+--
+-- Persisted career results, only written when CAREER_REPORT_PERSIST=true
+-- (see Files/services/report_cache.py).
+
+CREATE TABLE IF NOT EXISTS `stored_career_reports` (
+  `student_id` INT NOT NULL,
+  `kind` VARCHAR(32) NOT NULL,
+  `version` VARCHAR(40) NOT NULL,
+  `payload` MEDIUMTEXT NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`student_id`, `kind`),
+  CONSTRAINT `fk_stored_career_reports_student`
+    FOREIGN KEY (`student_id`) REFERENCES `student_details` (`id`)
+    ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
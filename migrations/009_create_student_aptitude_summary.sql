@@ -0,0 +1,20 @@
+-- Migration 009: Create student_aptitude_summary table
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/009_create_student_aptitude_summary.sql
+--
+-- Per-student, per-category aptitude totals read by /get_student_data and
+-- /get_results. Fill it from the stored responses before deploying the code
+-- that reads it (from the Files directory):
+--
+--     flask --app app backfill-aptitude-summary
+
+CREATE TABLE IF NOT EXISTS `student_aptitude_summary` (
+  `student_id` INT NOT NULL,
+  `category` VARCHAR(50) NOT NULL,
+  `total` INT NOT NULL DEFAULT 0,
+  `correct` INT NOT NULL DEFAULT 0,
+  `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`student_id`, `category`),
+  CONSTRAINT `fk_student_aptitude_summary_student`
+    FOREIGN KEY (`student_id`) REFERENCES `student_details` (`id`)
+    ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
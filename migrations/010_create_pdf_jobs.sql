@@ -0,0 +1,30 @@
+-- Migration 010: Create pdf_jobs table
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/010_create_pdf_jobs.sql
+--
+-- Asynchronous PDF report renders and their status
+-- (see Files/services/pdf_jobs.py).
+
+CREATE TABLE IF NOT EXISTS `pdf_jobs` (
+  `id` VARCHAR(32) NOT NULL,
+  `student_id` INT NOT NULL,
+  `kind` VARCHAR(16) NOT NULL,
+  `firm_id` INT NULL,
+  `requester_role` VARCHAR(20) NOT NULL,
+  `requester_id` INT NOT NULL,
+  `page_url` VARCHAR(500) NOT NULL,
+  `status` VARCHAR(16) NOT NULL DEFAULT 'queued',
+  `attempts` INT NOT NULL DEFAULT 0,
+  `etag` VARCHAR(40) NULL,
+  `error` VARCHAR(500) NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` DATETIME NOT NULL,
+  PRIMARY KEY (`id`),
+  INDEX `ix_pdf_jobs_student_id` (`student_id`),
+  INDEX `ix_pdf_jobs_student_kind_status` (`student_id`, `kind`, `status`),
+  CONSTRAINT `fk_pdf_jobs_student`
+    FOREIGN KEY (`student_id`) REFERENCES `student_details` (`id`)
+    ON DELETE CASCADE,
+  CONSTRAINT `fk_pdf_jobs_firm`
+    FOREIGN KEY (`firm_id`) REFERENCES `consultancy_firms` (`id`)
+    ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
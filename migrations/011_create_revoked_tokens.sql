@@ -0,0 +1,17 @@
+-- Migration 011: Create revoked_tokens table
+-- Run this against your local MySQL database: mysql -u root -p exam < migrations/011_create_revoked_tokens.sql
+--
+-- Revoked (logged out) JWTs, shared by every worker
+-- (see Files/services/revocation.py). Rows are pruned once expires_at passes.
+
+CREATE TABLE IF NOT EXISTS `revoked_tokens` (
+  `id` INT NOT NULL AUTO_INCREMENT,
+  `jti` VARCHAR(36) NOT NULL,
+  `token_type` VARCHAR(10) NOT NULL,
+  `expires_at` DATETIME NOT NULL,
+  `revoked_at` DATETIME NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_revoked_tokens_jti` (`jti`),
+  INDEX `ix_revoked_tokens_expires_at` (`expires_at`),
+  INDEX `ix_revoked_tokens_revoked_at` (`revoked_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
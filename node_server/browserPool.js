@@ -0,0 +1,266 @@
+const puppeteer = require('puppeteer');
+
+/**
+ * Thrown when a render cannot be scheduled: the queue is full or the
+ * request waited too long for a free page. `status` is the HTTP status
+ * to answer with.
+ */
+class PoolBusyError extends Error {
+    constructor(message, status) {
+        super(message);
+        this.name = 'PoolBusyError';
+        this.status = status;
+    }
+}
+
+/**
+ * A fixed set of warm Chromium instances, each with a fixed number of
+ * pages ("slots"). At most browsers * pagesPerBrowser renders run at once;
+ * further requests wait in a bounded FIFO queue and are rejected once it
+ * is full or after queueTimeoutMs.
+ *
+ * Every slot renders in its own incognito browser context, so cookies and
+ * storage never leak between students. Cookies are cleared after each
+ * render and the whole context is replaced after maxRendersPerPage renders
+ * or after any failure. A browser that disconnects or fails a health check
+ * is relaunched.
+ */
+class BrowserPool {
+    constructor(options) {
+        this.browserCount = options.browsers;
+        this.pagesPerBrowser = options.pagesPerBrowser;
+        this.maxQueue = options.maxQueue;
+        this.queueTimeoutMs = options.queueTimeoutMs;
+        this.maxRendersPerPage = options.maxRendersPerPage;
+        this.healthCheckTimeoutMs = options.healthCheckTimeoutMs;
+        this.launchOptions = options.launchOptions;
+
+        this.entries = [];   // one per browser: { index, browser, slots, restarting }
+        this.idle = [];      // slots ready to render
+        this.waiters = [];   // queued acquire() calls: { resolve, reject, timer }
+        this.closing = false;
+        this.stats = {
+            rendered: 0,
+            failed: 0,
+            rejected: 0,
+            timedOut: 0,
+            pagesRecycled: 0,
+            browserRestarts: 0,
+        };
+    }
+
+    get capacity() {
+        return this.browserCount * this.pagesPerBrowser;
+    }
+
+    async start() {
+        for (let i = 0; i < this.browserCount; i++) {
+            this.entries.push(await this._launch(i));
+        }
+    }
+
+    async _launch(index) {
+        const browser = await puppeteer.launch(this.launchOptions);
+        const entry = { index, browser, slots: [], restarting: false };
+        browser.on('disconnected', () => {
+            if (!this.closing) {
+                this._restart(entry, 'browser disconnected');
+            }
+        });
+        for (let i = 0; i < this.pagesPerBrowser; i++) {
+            const slot = await this._openSlot(entry);
+            entry.slots.push(slot);
+            this._makeAvailable(slot);
+        }
+        return entry;
+    }
+
+    async _openSlot(entry) {
+        const context = await entry.browser.createBrowserContext();
+        const page = await context.newPage();
+        return { entry, context, page, renders: 0, busy: false };
+    }
+
+    async _restart(entry, reason) {
+        if (entry.restarting) {
+            return;
+        }
+        entry.restarting = true;
+        console.error(`Restarting PDF browser ${entry.index}: ${reason}`);
+        this.stats.browserRestarts++;
+
+        // Its slots are dead: take them out of circulation.
+        this.idle = this.idle.filter((slot) => slot.entry !== entry);
+        entry.slots = [];
+        try {
+            await entry.browser.close();
+        } catch {
+            // Already gone.
+        }
+
+        while (!this.closing) {
+            try {
+                const replacement = await this._launch(entry.index);
+                this.entries[entry.index] = replacement;
+                return;
+            } catch (err) {
+                console.error(`Could not relaunch PDF browser ${entry.index}:`, err);
+                await new Promise((resolve) => setTimeout(resolve, 5000));
+            }
+        }
+    }
+
+    _makeAvailable(slot) {
+        slot.busy = false;
+        const waiter = this.waiters.shift();
+        if (waiter) {
+            clearTimeout(waiter.timer);
+            slot.busy = true;
+            waiter.resolve(slot);
+        } else {
+            this.idle.push(slot);
+        }
+    }
+
+    _acquire() {
+        const slot = this.idle.shift();
+        if (slot) {
+            slot.busy = true;
+            return Promise.resolve(slot);
+        }
+        if (this.waiters.length >= this.maxQueue) {
+            this.stats.rejected++;
+            return Promise.reject(new PoolBusyError('PDF renderer is busy, try again shortly', 503));
+        }
+        return new Promise((resolve, reject) => {
+            const waiter = { resolve, reject };
+            waiter.timer = setTimeout(() => {
+                this.waiters.splice(this.waiters.indexOf(waiter), 1);
+                this.stats.timedOut++;
+                reject(new PoolBusyError('Timed out waiting for the PDF renderer', 503));
+            }, this.queueTimeoutMs);
+            this.waiters.push(waiter);
+        });
+    }
+
+    async _release(slot, failed) {
+        const entry = slot.entry;
+        if (this.entries[entry.index] !== entry || entry.restarting) {
+            return;  // The browser was replaced while this render ran.
+        }
+
+        slot.renders++;
+        let reusable = !failed && slot.renders < this.maxRendersPerPage;
+        if (reusable) {
+            try {
+                await slot.context.deleteCookie(...(await slot.context.cookies()));
+                await slot.page.goto('about:blank');
+            } catch {
+                reusable = false;
+            }
+        }
+        if (reusable) {
+            this._makeAvailable(slot);
+            return;
+        }
+
+        this.stats.pagesRecycled++;
+        try {
+            await slot.context.close();
+        } catch {
+            // The context is dropped either way.
+        }
+        try {
+            const fresh = await this._openSlot(entry);
+            entry.slots[entry.slots.indexOf(slot)] = fresh;
+            this._makeAvailable(fresh);
+        } catch (err) {
+            this._restart(entry, `could not open a page: ${err.message}`);
+        }
+    }
+
+    /**
+     * Run `render(page)` on a pooled page and return its result.
+     * Rejects with PoolBusyError when no page becomes available in time.
+     */
+    async run(render) {
+        if (this.closing) {
+            throw new PoolBusyError('PDF renderer is shutting down', 503);
+        }
+        const slot = await this._acquire();
+        let failed = false;
+        try {
+            const result = await render(slot.page);
+            this.stats.rendered++;
+            return result;
+        } catch (err) {
+            failed = true;
+            this.stats.failed++;
+            throw err;
+        } finally {
+            this._release(slot, failed);
+        }
+    }
+
+    /**
+     * Probe every idle page with a trivial evaluation and relaunch browsers
+     * that are disconnected or unresponsive.
+     */
+    async checkHealth() {
+        const probes = this.entries.map(async (entry) => {
+            if (entry.restarting) {
+                return;
+            }
+            if (!entry.browser.connected) {
+                this._restart(entry, 'health check: not connected');
+                return;
+            }
+            const idle = entry.slots.filter((slot) => !slot.busy);
+            try {
+                await Promise.all(idle.map((slot) => withTimeout(
+                    slot.page.evaluate(() => 1), this.healthCheckTimeoutMs,
+                )));
+            } catch (err) {
+                this._restart(entry, `health check: ${err.message}`);
+            }
+        });
+        await Promise.all(probes);
+    }
+
+    status() {
+        const browsers = this.entries.map((entry) => ({
+            connected: !entry.restarting && entry.browser.connected,
+            pages: entry.slots.length,
+            busy: entry.slots.filter((slot) => slot.busy).length,
+        }));
+        const healthy = browsers.length > 0 && browsers.every((b) => b.connected);
+        return {
+            status: healthy ? 'ok' : 'degraded',
+            capacity: this.capacity,
+            idle: this.idle.length,
+            queued: this.waiters.length,
+            maxQueue: this.maxQueue,
+            browsers,
+            ...this.stats,
+        };
+    }
+
+    async close() {
+        this.closing = true;
+        for (const waiter of this.waiters.splice(0)) {
+            clearTimeout(waiter.timer);
+            waiter.reject(new PoolBusyError('PDF renderer is shutting down', 503));
+        }
+        await Promise.all(this.entries.map((entry) => entry.browser.close().catch(() => {})));
+    }
+}
+
+function withTimeout(promise, ms) {
+    let timer;
+    const timeout = new Promise((_, reject) => {
+        timer = setTimeout(() => reject(new Error(`no response in ${ms} ms`)), ms);
+    });
+    return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+}
+
+module.exports = { BrowserPool, PoolBusyError };
@@ -1,8 +1,8 @@
 const express = require('express');
 const bodyParser = require('body-parser');
-const puppeteer = require('puppeteer');
 const cors = require('cors');
 const crypto = require('crypto');
+const { BrowserPool, PoolBusyError } = require('./browserPool');
 
 const app = express();
 
@@ -14,6 +14,34 @@ app.use(bodyParser.json());
 // PDF token secret — must match Flask's PDF_TOKEN_SECRET
 const PDF_TOKEN_SECRET = process.env.PDF_TOKEN_SECRET || '';
 
+function envInt(name, fallback) {
+    const value = parseInt(process.env[name], 10);
+    return Number.isNaN(value) ? fallback : value;
+}
+
+const PORT = envInt('PORT', 3000);
+const PDF_RENDER_TIMEOUT_MS = envInt('PDF_RENDER_TIMEOUT_MS', 60000);
+const PDF_HEALTH_INTERVAL_MS = envInt('PDF_HEALTH_INTERVAL_MS', 30000);
+
+// Warm Chromium instances shared by every request, instead of one launch per PDF
+const pool = new BrowserPool({
+    browsers: envInt('PDF_POOL_BROWSERS', 2),
+    pagesPerBrowser: envInt('PDF_POOL_PAGES_PER_BROWSER', 2),
+    maxQueue: envInt('PDF_POOL_MAX_QUEUE', 20),
+    queueTimeoutMs: envInt('PDF_POOL_QUEUE_TIMEOUT_MS', 30000),
+    maxRendersPerPage: envInt('PDF_POOL_MAX_RENDERS_PER_PAGE', 50),
+    healthCheckTimeoutMs: envInt('PDF_HEALTH_TIMEOUT_MS', 5000),
+    launchOptions: {
+        headless: 'new',
+        args: ['--no-sandbox', '--disable-setuid-sandbox'],
+    },
+});
+
+// Navigation wait conditions a caller may ask for. Pages that embed their
+// data (Flask's render mode) are complete at 'load' and do not need to wait
+// for the network to go idle.
+const WAIT_UNTIL = ['load', 'domcontentloaded', 'networkidle0', 'networkidle2'];
+
 /**
  * Verify signed PDF token from Flask.
  * Token format: { token, student_id, expiry, signature }
@@ -44,12 +72,23 @@ function verifyPdfToken(token, studentId, expiry, signature) {
 }
 
 app.post('/generate-pdf', async (req, res) => {
-    const { url, token, student_id, expiry, signature } = req.body;
+    const { url, token, student_id, expiry, signature, cookies, waitUntil = 'networkidle0' } = req.body;
 
     if (!url) {
         return res.status(400).json({ error: 'Missing URL' });
     }
 
+    if (!WAIT_UNTIL.includes(waitUntil)) {
+        return res.status(400).json({ error: 'Invalid waitUntil' });
+    }
+
+    // Optional [{ name, value }] cookies (e.g. Flask's JWT cookie) so the
+    // report page renders as the requesting user
+    if (cookies !== undefined && !(Array.isArray(cookies)
+        && cookies.every((c) => c && typeof c.name === 'string' && typeof c.value === 'string'))) {
+        return res.status(400).json({ error: 'Invalid cookies' });
+    }
+
     // Validate PDF token if PDF_TOKEN_SECRET is configured
     if (PDF_TOKEN_SECRET) {
         if (!token || !student_id || !expiry || !signature) {
@@ -62,37 +101,45 @@ app.post('/generate-pdf', async (req, res) => {
     }
 
     try {
-        const browser = await puppeteer.launch({
-            headless: 'new',
-            args: ['--no-sandbox', '--disable-setuid-sandbox'],
+        const pdfBuffer = await pool.run(async (page) => {
+            if (cookies && cookies.length) {
+                // The pool clears the context's cookies after every render
+                const domain = new URL(url).hostname;
+                await page.browserContext().setCookie(
+                    ...cookies.map(({ name, value }) => ({ name, value, domain, path: '/' })),
+                );
+            }
+            await page.emulateMediaType(null);
+            await page.goto(url, { waitUntil, timeout: PDF_RENDER_TIMEOUT_MS });
+
+            // Report pages that set window.reportReady = false flip it once
+            // their charts are drawn; other pages pass straight through.
+            await page.waitForFunction('window.reportReady !== false', { timeout: PDF_RENDER_TIMEOUT_MS });
+            await page.evaluate(() => document.fonts.ready.then(() => undefined));
+
+            // Activate print styles
+            await page.emulateMediaType('print');
+
+            // Remove the download button container before PDF generation
+            await page.evaluate(() => {
+                const btn = document.querySelector('.button-container');
+                if (btn) btn.remove();
+            });
+
+            return page.pdf({
+                format: 'A4',
+                printBackground: true,
+                margin: {
+                    top: '0cm',
+                    bottom: '0cm',
+                    left: '0cm',
+                    right: '0cm'
+                },
+                preferCSSPageSize: false,
+                timeout: PDF_RENDER_TIMEOUT_MS,
+            });
         });
 
-        const page = await browser.newPage();
-        await page.goto(url, { waitUntil: 'networkidle0' });
-
-        // Activate print styles
-        await page.emulateMediaType('print');
-
-        // Remove the download button container before PDF generation
-        await page.evaluate(() => {
-            const btn = document.querySelector('.button-container');
-            if (btn) btn.remove();
-        });
-
-        const pdfBuffer = await page.pdf({
-            format: 'A4',
-            printBackground: true,
-            margin: {
-                top: '0cm',
-                bottom: '0cm',
-                left: '0cm',
-                right: '0cm'
-            },
-            preferCSSPageSize: false,
-        });
-
-        await browser.close();
-
         res.set({
             'Content-Type': 'application/pdf',
             'Content-Disposition': 'attachment; filename="MYCAREERCHOICES.pdf"',
@@ -100,11 +147,21 @@ app.post('/generate-pdf', async (req, res) => {
 
         res.send(pdfBuffer);
     } catch (err) {
+        if (err instanceof PoolBusyError) {
+            res.set('Retry-After', '5');
+            return res.status(err.status).json({ error: err.message });
+        }
         console.error('Puppeteer error:', err);
         res.status(500).send('Failed to generate PDF');
     }
 });
 
+// Pool status for load balancers and monitoring; 503 while a browser is down
+app.get('/health', (req, res) => {
+    const status = pool.status();
+    res.status(status.status === 'ok' ? 200 : 503).json(status);
+});
+
 // Token verification endpoint for Flask to check token validity
 app.post('/verify-token', (req, res) => {
     const { token, student_id, expiry, signature } = req.body;
@@ -121,6 +178,29 @@ app.post('/verify-token', (req, res) => {
     return res.json({ valid });
 });
 
-app.listen(3000, () => {
-    console.log('Puppeteer PDF server running at http://localhost:3000');
+async function main() {
+    await pool.start();
+
+    const healthTimer = setInterval(() => {
+        pool.checkHealth().catch((err) => console.error('PDF pool health check failed:', err));
+    }, PDF_HEALTH_INTERVAL_MS);
+    healthTimer.unref();
+
+    const server = app.listen(PORT, () => {
+        console.log(`Puppeteer PDF server running at http://localhost:${PORT} `
+            + `(${pool.capacity} pooled pages)`);
+    });
+
+    const shutdown = async () => {
+        server.close();
+        await pool.close();
+        process.exit(0);
+    };
+    process.on('SIGINT', shutdown);
+    process.on('SIGTERM', shutdown);
+}
+
+main().catch((err) => {
+    console.error('Could not start the PDF browser pool:', err);
+    process.exit(1);
 });